@@ -5,15 +5,22 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession as SQLAlchemyAsyncSession,
 )
 
-from app.api.dependencies.session import get_async_session
+from app.api.dependencies.session import get_async_session, get_cached_async_session
 from app.repository.crud.base import BaseCRUDRepository
 
 
 def get_repository(
     repo_type: typing.Type[BaseCRUDRepository],
+    cached: bool = False,
 ) -> typing.Callable[[SQLAlchemyAsyncSession], BaseCRUDRepository]:
+    """
+    `cached=True` for reads served through a cache the database listener invalidates: they
+    only leave the replicas while the listener is disconnected.
+    """
+    session_dependency = get_cached_async_session if cached else get_async_session
+
     def _get_repo(
-        async_session: SQLAlchemyAsyncSession = fastapi.Depends(get_async_session),
+        async_session: SQLAlchemyAsyncSession = fastapi.Depends(session_dependency),
     ) -> BaseCRUDRepository:
         return repo_type(async_session=async_session)
 
@@ -1,14 +1,78 @@
+import contextlib
+import math
+import time
 import typing
 
+import fastapi
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine as SQLAlchemyAsyncEngine,
     AsyncSession as SQLAlchemyAsyncSession,
 )
 
+from app.config.manager import settings
 from app.repository.database import async_db
+from app.repository.listener import db_listener
 
+READ_ONLY_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+PRIMARY_PIN_COOKIE: str = "db_primary_until"
 
-async def get_async_session() -> typing.AsyncGenerator[SQLAlchemyAsyncSession, None]:
-    session = SQLAlchemyAsyncSession(bind=async_db.async_engine)
+
+def _is_pinned_to_primary(request: fastapi.Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _pin_to_primary(response: fastapi.Response) -> None:
+    """
+    Keep this client's reads on the primary for `DB_READ_YOUR_WRITES_SECONDS`, so it does
+    not read its own write back from a replica that has not replayed it yet.
+    """
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        key=PRIMARY_PIN_COOKIE,
+        value=f"{time.time() + window:.3f}",
+        max_age=math.ceil(window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def route_async_engine(
+    request: fastapi.Request, response: fastapi.Response
+) -> SQLAlchemyAsyncEngine:
+    """
+    Send reads to a healthy replica and everything else to the primary.
+    """
+    if not async_db.replica_engines:
+        return async_db.async_engine
+    if request.method not in READ_ONLY_METHODS:
+        if settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+            _pin_to_primary(response=response)
+        return async_db.async_engine
+    if _is_pinned_to_primary(request=request):
+        return async_db.async_engine
+    return async_db.read_engine
+
+
+def route_cached_async_engine(
+    bind: SQLAlchemyAsyncEngine = fastapi.Depends(route_async_engine),
+) -> SQLAlchemyAsyncEngine:
+    """
+    `route_async_engine` for reads behind a cache that `db_listener` invalidates: while it is
+    disconnected the cache is bypassed to read fresh rows, which only the primary has.
+    """
+    return bind if db_listener.is_connected else async_db.async_engine
+
+
+@contextlib.asynccontextmanager
+async def _open_async_session(
+    bind: SQLAlchemyAsyncEngine,
+) -> typing.AsyncIterator[SQLAlchemyAsyncSession]:
+    session = SQLAlchemyAsyncSession(
+        bind=bind, expire_on_commit=settings.IS_DB_EXPIRE_ON_COMMIT
+    )
     try:
         yield session
     except Exception as e:
@@ -16,3 +80,17 @@ async def get_async_session() -> typing.AsyncGenerator[SQLAlchemyAsyncSession, N
         raise e
     finally:
         await session.close()
+
+
+async def get_async_session(
+    bind: SQLAlchemyAsyncEngine = fastapi.Depends(route_async_engine),
+) -> typing.AsyncGenerator[SQLAlchemyAsyncSession, None]:
+    async with _open_async_session(bind=bind) as session:
+        yield session
+
+
+async def get_cached_async_session(
+    bind: SQLAlchemyAsyncEngine = fastapi.Depends(route_cached_async_engine),
+) -> typing.AsyncGenerator[SQLAlchemyAsyncSession, None]:
+    async with _open_async_session(bind=bind) as session:
+        yield session
@@ -0,0 +1,128 @@
+import bisect
+import time
+import typing
+
+from prometheus_client import REGISTRY
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    HistogramMetricFamily,
+)
+from prometheus_client.registry import Collector
+from prometheus_client.utils import floatToGoString
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE: str = "unmatched"
+KNOWN_METHODS: frozenset[str] = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+)
+
+
+class RequestMetrics(Collector):
+    """
+    Request latency histograms, status-code counters and in-flight gauges, aggregated in
+    plain dicts and lists and turned into metric families only when scraped.
+
+    Everything is updated and read from the event-loop thread, so unlike the
+    `prometheus_client` metric classes no lock is taken per update; that is what keeps its
+    overhead at about 2.5-3 µs per request (`benchmarks/middleware.py`).
+    """
+
+    def __init__(self, buckets: typing.Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        # (route, method) -> per-bucket counts, the `+Inf` count, then the sum
+        self.durations: dict[tuple[str, str], list[float]] = {}
+        # (route, method, status) -> [count, the (route, method) `durations` list]
+        self.requests: dict[tuple[str, str, int], list] = {}
+        self.in_flight: dict[str, int] = dict.fromkeys(KNOWN_METHODS | {"OTHER"}, 0)
+
+    def observe(self, route: str, method: str, status_code: int, duration: float):
+        entry = self.requests.get((route, method, status_code))
+        if entry is None:
+            histogram = self.durations.setdefault(
+                (route, method), [0] * (len(self.buckets) + 2)
+            )
+            entry = self.requests[(route, method, status_code)] = [0, histogram]
+        entry[0] += 1
+        histogram = entry[1]
+        histogram[bisect.bisect_left(self.buckets, duration)] += 1
+        histogram[-1] += duration
+
+    def collect(self) -> typing.Iterator[typing.Any]:
+        durations = HistogramMetricFamily(
+            "http_request_duration_seconds",
+            "Time from receiving a request to finishing its response body.",
+            labels=("route", "method"),
+        )
+        for (route, method), histogram in self.durations.items():
+            cumulative, buckets = 0, []
+            for bound, count in zip((*self.buckets, float("inf")), histogram):
+                cumulative += count
+                buckets.append((floatToGoString(bound), cumulative))
+            durations.add_metric(
+                [route, method], buckets=buckets, sum_value=histogram[-1]
+            )
+        yield durations
+
+        requests = CounterMetricFamily(
+            "http_requests",
+            "Finished requests by route and response status code.",
+            labels=("route", "method", "status"),
+        )
+        for (route, method, status_code), (count, _) in self.requests.items():
+            requests.add_metric([route, method, str(status_code)], count)
+        yield requests
+
+        in_flight = GaugeMetricFamily(
+            "http_requests_in_flight",
+            "Requests currently being served; the route is not resolved on the way in.",
+            labels=("method",),
+        )
+        for method, count in self.in_flight.items():
+            in_flight.add_metric([method], count)
+        yield in_flight
+
+
+request_metrics: RequestMetrics = RequestMetrics(
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+REGISTRY.register(request_metrics)
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware feeding `RequestMetrics`.
+
+    Requests are labelled with the route `name` (e.g. `tasks:read-task-by-uuid`) that
+    FastAPI leaves in `scope["route"]`, never with the raw path, so the label set stays as
+    small as the route table.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = self.metrics.in_flight
+        in_flight[method] += 1
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started_at
+            in_flight[method] -= 1
+            route = getattr(scope.get("route"), "name", None) or UNMATCHED_ROUTE
+            self.metrics.observe(route, method, status_code, duration)
@@ -0,0 +1,17 @@
+import fastapi
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+router = fastapi.APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    name="metrics:read-metrics",
+    response_class=fastapi.Response,
+    include_in_schema=False,
+)
+async def read_metrics() -> fastapi.Response:
+    """Метрики процесса в текстовом формате Prometheus"""
+    return fastapi.Response(
+        content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST
+    )
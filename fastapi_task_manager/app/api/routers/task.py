@@ -1,12 +1,124 @@
+import datetime
+import typing
 import uuid
 import fastapi
-from app.repository.crud.task import TaskCRUDRepository
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine as SQLAlchemyAsyncEngine,
+    AsyncSession as SQLAlchemyAsyncSession,
+)
+from app.config.manager import settings
+from app.models.db.task import TaskStatus
+from app.repository.changes import task_change_feed
+from app.repository.crud.task import (
+    ANY_TASK_VERSION,
+    TaskCRUDRepository,
+    TaskVersions,
+)
+from app.repository.database import async_db
 from app.api.dependencies.repository import get_repository
-from app.models.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.api.dependencies.session import route_async_engine
+from app.models.schemas.task import (
+    TaskAnalyticsBucket,
+    TaskAnalyticsResponse,
+    TaskBulkReturning,
+    TaskCreate,
+    TaskExportFormat,
+    TaskFilter,
+    TaskHeartbeatResponse,
+    TaskLeaseResponse,
+    TaskListOrder,
+    TaskStatsResponse,
+    TaskThroughputResponse,
+    TaskUpdate,
+    TaskResponse,
+    TaskListResponse,
+    TaskSearchResponse,
+)
+from app.utils.formatters.cursor_formatter import (
+    format_cursor_from_queue_key,
+    format_cursor_from_search_key,
+    format_cursor_from_task_key,
+    format_queue_key_from_cursor,
+    format_search_key_from_cursor,
+    format_task_key_from_cursor,
+)
+from app.utils.formatters.etag_formatter import (
+    format_collection_etag,
+    format_etags_from_header,
+    format_task_etag,
+    format_task_versions_from_etags,
+)
+from app.utils.formatters.export_formatter import (
+    format_tasks_into_csv,
+    format_tasks_into_ndjson,
+)
 
 router = fastapi.APIRouter(prefix="/tasks", tags=["tasks"])
 
 
+def _not_modified(etag: str) -> fastapi.Response:
+    return fastapi.Response(
+        status_code=fastapi.status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
+
+
+def _expected_versions(
+    task_uuid: uuid.UUID, if_match: str | None
+) -> TaskVersions | None:
+    if not if_match:
+        return None
+    etags = format_etags_from_header(if_match, strong=True)
+    if "*" in etags:
+        return ANY_TASK_VERSION
+    # only weak or foreign tags: no version matches and the write fails with a 412
+    return format_task_versions_from_etags(task_uuid, etags)
+
+
+BUCKET_STEPS: dict[TaskAnalyticsBucket, datetime.timedelta] = {
+    TaskAnalyticsBucket.HOUR: datetime.timedelta(hours=1),
+    TaskAnalyticsBucket.DAY: datetime.timedelta(days=1),
+}
+BUCKET_DEFAULT_COUNTS: dict[TaskAnalyticsBucket, int] = {
+    TaskAnalyticsBucket.HOUR: 24,
+    TaskAnalyticsBucket.DAY: 30,
+}
+
+
+def _bucket_floor(
+    moment: datetime.datetime, bucket: TaskAnalyticsBucket
+) -> datetime.datetime:
+    moment = moment.astimezone(datetime.timezone.utc)
+    if bucket == TaskAnalyticsBucket.DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _task_filter(
+    *,
+    status: list[TaskStatus] | None = fastapi.Query(None),
+    created_after: datetime.datetime | None = fastapi.Query(None, alias="createdAfter"),
+    created_before: datetime.datetime | None = fastapi.Query(
+        None, alias="createdBefore"
+    ),
+    updated_after: datetime.datetime | None = fastapi.Query(None, alias="updatedAfter"),
+    updated_before: datetime.datetime | None = fastapi.Query(
+        None, alias="updatedBefore"
+    ),
+    name_prefix: str | None = fastapi.Query(
+        None, alias="namePrefix", min_length=1, max_length=255
+    ),
+) -> TaskFilter:
+    return TaskFilter(
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        name_prefix=name_prefix,
+    )
+
+
 @router.post(
     "/",
     name="tasks:create-task",
@@ -15,29 +127,374 @@ router = fastapi.APIRouter(prefix="/tasks", tags=["tasks"])
 )
 async def create_task(
     task_create: TaskCreate,
+    response: fastapi.Response,
     task_repo: TaskCRUDRepository = fastapi.Depends(
         get_repository(repo_type=TaskCRUDRepository)
     ),
 ) -> TaskResponse:
     """Создание новой задачи"""
     task = await task_repo.create_task(task_create=task_create)
+    response.headers["ETag"] = format_task_etag(
+        task.uuid, task.created_at, task.updated_at
+    )
     return task
 
 
+@router.post(
+    "/bulk",
+    name="tasks:create-tasks-bulk",
+    response_model=list[TaskResponse] | list[uuid.UUID],
+    status_code=fastapi.status.HTTP_201_CREATED,
+)
+async def create_tasks_bulk(
+    tasks_create: typing.Annotated[
+        list[TaskCreate],
+        fastapi.Body(min_length=1, max_length=settings.TASK_BULK_MAX_SIZE),
+    ],
+    returning: TaskBulkReturning = TaskBulkReturning.ROWS,
+    task_repo: TaskCRUDRepository = fastapi.Depends(
+        get_repository(repo_type=TaskCRUDRepository)
+    ),
+) -> list[TaskResponse] | list[uuid.UUID]:
+    """Массовое создание задач одной транзакцией (`returning=uuids` вернёт только UUID)"""
+    tasks = await task_repo.create_tasks(tasks_create=tasks_create, returning=returning)
+    return tasks
+
+
+@router.post(
+    "/claim",
+    name="tasks:claim-tasks",
+    response_model=list[TaskLeaseResponse],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def claim_tasks(
+    n: int = fastapi.Query(1, ge=1, le=settings.TASK_CLAIM_MAX_SIZE),
+    owner: str | None = fastapi.Query(None, max_length=255),
+    lease_seconds: float = fastapi.Query(
+        settings.TASK_LEASE_SECONDS,
+        gt=0,
+        le=settings.TASK_LEASE_MAX_SECONDS,
+        alias="leaseSeconds",
+    ),
+    task_repo: TaskCRUDRepository = fastapi.Depends(
+        get_repository(repo_type=TaskCRUDRepository)
+    ),
+) -> list[TaskLeaseResponse]:
+    """Взять в работу до n новых задач по приоритету и сроку, не дожидаясь чужих блокировок"""
+    return await task_repo.claim_tasks(
+        limit=n, owner=owner, lease=datetime.timedelta(seconds=lease_seconds)
+    )
+
+
+@router.post(
+    "/heartbeat",
+    name="tasks:extend-task-leases",
+    response_model=TaskHeartbeatResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def extend_task_leases(
+    uuids: typing.Annotated[
+        list[uuid.UUID],
+        fastapi.Body(min_length=1, max_length=settings.TASK_HEARTBEAT_MAX_SIZE),
+    ],
+    owner: str | None = fastapi.Query(None, max_length=255),
+    lease_seconds: float = fastapi.Query(
+        settings.TASK_LEASE_SECONDS,
+        gt=0,
+        le=settings.TASK_LEASE_MAX_SECONDS,
+        alias="leaseSeconds",
+    ),
+    task_repo: TaskCRUDRepository = fastapi.Depends(
+        get_repository(repo_type=TaskCRUDRepository)
+    ),
+) -> TaskHeartbeatResponse:
+    """Продление аренды взятых задач одним запросом; в ответе только продлённые"""
+    extended = await task_repo.extend_task_leases(
+        uuids=uuids, owner=owner, lease=datetime.timedelta(seconds=lease_seconds)
+    )
+    return TaskHeartbeatResponse(
+        extended=[task_uuid for task_uuid, _ in extended],
+        lease_expires_at=extended[0][1] if extended else None,
+    )
+
+
 @router.get(
     "/",
     name="tasks:read-tasks",
-    response_model=list[TaskResponse],
+    response_model=TaskListResponse,
     status_code=fastapi.status.HTTP_200_OK,
 )
 async def read_tasks(
+    response: fastapi.Response,
+    *,
+    filters: TaskFilter = fastapi.Depends(_task_filter),
+    limit: int = fastapi.Query(
+        settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_SIZE_MAX
+    ),
+    cursor: str | None = None,
+    order: TaskListOrder = TaskListOrder.CREATED,
+    if_none_match: str | None = fastapi.Header(None),
     task_repo: TaskCRUDRepository = fastapi.Depends(
         get_repository(repo_type=TaskCRUDRepository)
     ),
-) -> list[TaskResponse]:
-    """Получение всех задач"""
-    tasks = await task_repo.read_tasks()
-    return tasks
+) -> TaskListResponse:
+    """
+    Получение задач постранично с фильтрами (курсор из `nextCursor` предыдущей страницы);
+    порядок по приоритету только с одним статусом
+    """
+    if order == TaskListOrder.PRIORITY and len(filters.status or ()) != 1:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail="Priority order needs exactly one status filter",
+        )
+    after = after_queue_key = None
+    try:
+        if cursor and order == TaskListOrder.PRIORITY:
+            after_queue_key = format_queue_key_from_cursor(cursor)
+        elif cursor:
+            after = format_task_key_from_cursor(cursor)
+    except ValueError as e:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    tasks = await task_repo.read_tasks(
+        limit=limit + 1,
+        after=after,
+        filters=filters,
+        order=order,
+        after_queue_key=after_queue_key,
+    )
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        if order == TaskListOrder.PRIORITY:
+            next_cursor = format_cursor_from_queue_key(
+                last["priority"], last["due_at"], last["created_at"], last["uuid"]
+            )
+        else:
+            next_cursor = format_cursor_from_task_key(last["created_at"], last["uuid"])
+
+    etag = format_collection_etag(
+        (
+            format_task_etag(task["uuid"], task["created_at"], task["updated_at"])
+            for task in tasks
+        ),
+        next_cursor,
+    )
+    etags = format_etags_from_header(if_none_match)
+    if etag in etags or "*" in etags:
+        return _not_modified(etag)
+
+    response.headers["ETag"] = etag
+    return TaskListResponse(items=tasks, next_cursor=next_cursor)
+
+
+@router.get(
+    "/search",
+    name="tasks:search-tasks",
+    response_model=TaskSearchResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def search_tasks(
+    q: str = fastapi.Query(min_length=1, max_length=255),
+    limit: int = fastapi.Query(
+        settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_SIZE_MAX
+    ),
+    cursor: str | None = None,
+    fuzzy: bool = False,
+    task_repo: TaskCRUDRepository = fastapi.Depends(
+        get_repository(repo_type=TaskCRUDRepository)
+    ),
+) -> TaskSearchResponse:
+    """
+    Полнотекстовый поиск по названию и описанию, лучшие совпадения первыми. Ранжируются
+    только `TASK_SEARCH_CANDIDATES` самых новых совпадений; если были и более старые,
+    в ответе `truncated: true`
+    """
+    if fuzzy and "pg_trgm" not in async_db.extensions:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Fuzzy search needs the pg_trgm extension",
+        )
+    try:
+        after = format_search_key_from_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    hits = await task_repo.search_tasks(
+        query=q,
+        limit=limit + 1,
+        after=after,
+        fuzzy=fuzzy,
+        candidates=settings.TASK_SEARCH_CANDIDATES,
+    )
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = format_cursor_from_search_key(hits[-1].rank, hits[-1].Task.uuid)
+
+    return TaskSearchResponse(
+        items=[hit.Task for hit in hits],
+        next_cursor=next_cursor,
+        truncated=bool(hits) and hits[0].matches > settings.TASK_SEARCH_CANDIDATES,
+    )
+
+
+async def _stream_task_export(
+    export_format: TaskExportFormat,
+    bind: SQLAlchemyAsyncEngine,
+) -> typing.AsyncIterator[bytes]:
+    # The session is owned by the generator: dependencies with `yield` are torn down
+    # before a `StreamingResponse` body starts, which would close the cursor under us.
+    async with SQLAlchemyAsyncSession(bind=bind) as async_session:
+        task_repo = TaskCRUDRepository(async_session=async_session)
+        header = True
+        async for tasks in task_repo.stream_tasks(
+            batch_size=settings.TASK_EXPORT_BATCH_SIZE
+        ):
+            if export_format == TaskExportFormat.CSV:
+                yield format_tasks_into_csv(tasks, header=header)
+            else:
+                yield format_tasks_into_ndjson(tasks)
+            header = False
+
+        if header and export_format == TaskExportFormat.CSV:
+            yield format_tasks_into_csv((), header=True)
+
+
+@router.get(
+    "/export",
+    name="tasks:export-tasks",
+    response_class=StreamingResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def export_tasks(
+    export_format: TaskExportFormat = fastapi.Query(
+        TaskExportFormat.NDJSON, alias="format"
+    ),
+    bind: SQLAlchemyAsyncEngine = fastapi.Depends(route_async_engine),
+) -> StreamingResponse:
+    """Выгрузка всех задач потоком в NDJSON или CSV"""
+    media_type = (
+        "text/csv" if export_format == TaskExportFormat.CSV else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        content=_stream_task_export(export_format=export_format, bind=bind),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'
+        },
+    )
+
+
+@router.get(
+    "/stats",
+    name="tasks:read-task-stats",
+    response_model=TaskStatsResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def read_task_stats(
+    task_repo: TaskCRUDRepository = fastapi.Depends(
+        get_repository(repo_type=TaskCRUDRepository)
+    ),
+) -> TaskStatsResponse:
+    """Количество задач по статусам (из счётчиков, без подсчёта по таблице)"""
+    counts = await task_repo.read_task_status_counts()
+    return TaskStatsResponse(total=sum(counts.values()), by_status=counts)
+
+
+@router.get(
+    "/analytics",
+    name="tasks:read-task-analytics",
+    response_model=TaskAnalyticsResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def read_task_analytics(
+    bucket: TaskAnalyticsBucket = TaskAnalyticsBucket.HOUR,
+    start: datetime.datetime | None = fastapi.Query(None, alias="from"),
+    end: datetime.datetime | None = fastapi.Query(None, alias="to"),
+    task_repo: TaskCRUDRepository = fastapi.Depends(
+        get_repository(repo_type=TaskCRUDRepository)
+    ),
+) -> TaskAnalyticsResponse:
+    """Созданные и завершённые задачи и время в работе по часам или дням (UTC)"""
+    step = BUCKET_STEPS[bucket]
+    end = end or datetime.datetime.now(datetime.timezone.utc)
+    start = start or _bucket_floor(end, bucket) - step * (
+        BUCKET_DEFAULT_COUNTS[bucket] - 1
+    )
+    if start.tzinfo is None or end.tzinfo is None:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail="'from' and 'to' must include a timezone",
+        )
+    first_bucket = _bucket_floor(start, bucket)
+    if (
+        not start < end
+        or (end - first_bucket) / step > settings.TASK_ANALYTICS_MAX_BUCKETS
+    ):
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"'from' must precede 'to' by at most "
+            f"{settings.TASK_ANALYTICS_MAX_BUCKETS} {bucket.value} buckets",
+        )
+
+    rows = await task_repo.read_task_throughput(
+        bucket=bucket, start=first_bucket, end=end
+    )
+    rows_by_bucket = {row.bucket_start: row for row in rows}
+
+    items = []
+    bucket_start = first_bucket
+    while bucket_start < end:
+        row = rows_by_bucket.get(bucket_start)
+        items.append(
+            TaskThroughputResponse(
+                bucket_start=bucket_start,
+                created=row.created if row else 0,
+                completed=row.completed if row else 0,
+                in_work_exits=row.in_work_exits if row else 0,
+                avg_in_work_seconds=(
+                    row.in_work_seconds / row.in_work_exits
+                    if row and row.in_work_exits
+                    else None
+                ),
+            )
+        )
+        bucket_start += step
+    return TaskAnalyticsResponse(bucket=bucket, items=items)
+
+
+@router.get(
+    "/changes",
+    name="tasks:stream-task-changes",
+    response_class=StreamingResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def stream_task_changes(
+    last_event_id: int | None = fastapi.Header(None, alias="Last-Event-ID"),
+    resume_from: int | None = fastapi.Query(None, alias="lastEventId"),
+) -> StreamingResponse:
+    """Поток изменений задач (Server-Sent Events) с продолжением после id события"""
+    if task_change_feed.is_full:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many change feed subscribers",
+            headers={"Retry-After": "5"},
+        )
+    return StreamingResponse(
+        content=task_change_feed.stream(
+            last_event_id=last_event_id if last_event_id is not None else resume_from
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get(
@@ -48,13 +505,24 @@ async def read_tasks(
 )
 async def read_task(
     task_uuid: uuid.UUID,
+    if_none_match: str | None = fastapi.Header(None),
     task_repo: TaskCRUDRepository = fastapi.Depends(
-        get_repository(repo_type=TaskCRUDRepository)
+        get_repository(repo_type=TaskCRUDRepository, cached=True)
     ),
-) -> TaskResponse:
-    """Получение задачи по UUID"""
-    task = await task_repo.read_task_by_uuid(uuid=task_uuid)
-    return task
+) -> fastapi.Response:
+    """Получение задачи по UUID (`If-None-Match` с актуальным ETag вернёт 304)"""
+    etags = format_etags_from_header(if_none_match)
+    payload = await task_repo.read_task_payload_by_uuid(
+        uuid=task_uuid, if_none_match=etags
+    )
+    if payload.body is None or payload.etag in etags or "*" in etags:
+        return _not_modified(payload.etag)
+
+    return fastapi.Response(
+        content=payload.body,
+        media_type="application/json",
+        headers={"ETag": payload.etag},
+    )
 
 
 @router.put(
@@ -66,12 +534,21 @@ async def read_task(
 async def update_task(
     task_uuid: uuid.UUID,
     task_update: TaskUpdate,
+    response: fastapi.Response,
+    if_match: str | None = fastapi.Header(None),
     task_repo: TaskCRUDRepository = fastapi.Depends(
         get_repository(repo_type=TaskCRUDRepository)
     ),
 ) -> TaskResponse:
-    """Обновить задачу"""
-    task = await task_repo.update_task_by_uuid(uuid=task_uuid, task_update=task_update)
+    """Обновить задачу (с `If-Match` только если она не менялась)"""
+    task = await task_repo.update_task_by_uuid(
+        uuid=task_uuid,
+        task_update=task_update,
+        expected_versions=_expected_versions(task_uuid, if_match),
+    )
+    response.headers["ETag"] = format_task_etag(
+        task.uuid, task.created_at, task.updated_at
+    )
     return task
 
 
@@ -82,10 +559,13 @@ async def update_task(
 )
 async def delete_task(
     task_uuid: uuid.UUID,
+    if_match: str | None = fastapi.Header(None),
     task_repo: TaskCRUDRepository = fastapi.Depends(
         get_repository(repo_type=TaskCRUDRepository)
     ),
 ) -> None:
-    """Удалить задачу"""
-    deletion_res = await task_repo.delete_task_by_uuid(uuid=task_uuid)
+    """Удалить задачу (с `If-Match` только если она не менялась)"""
+    deletion_res = await task_repo.delete_task_by_uuid(
+        uuid=task_uuid, expected_versions=_expected_versions(task_uuid, if_match)
+    )
     return {"notification": deletion_res}
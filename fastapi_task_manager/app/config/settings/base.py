@@ -56,10 +56,56 @@ class BackendBaseSettings(BaseConfig):
     POSTGRES_USERNAME: str
     POSTGRES_SCHEMA: str
     IS_DB_ECHO_LOG: bool
+    IS_DB_EXPIRE_ON_COMMIT: bool = False
     DB_POOL_OVERFLOW: int
     DB_POOL_SIZE: int
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMPILED_CACHE_SIZE: int = 500
+    POSTGRES_REPLICA_URIS: list[str] = []
+    DB_REPLICA_HEALTH_CHECK_INTERVAL: float = 5.0
+    DB_REPLICA_HEALTH_CHECK_TIMEOUT: float = 2.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
     BACKEND_SERVER_WORKERS: int
 
+    TASK_PAGE_SIZE: int = 100
+    TASK_PAGE_SIZE_MAX: int = 1000
+    TASK_EXPORT_BATCH_SIZE: int = 1000
+    TASK_BULK_MAX_SIZE: int = 10000
+    TASK_CLAIM_MAX_SIZE: int = 1000
+    TASK_HEARTBEAT_MAX_SIZE: int = 10000
+    TASK_LEASE_SECONDS: float = 300.0
+    TASK_LEASE_MAX_SECONDS: float = 86400.0
+    TASK_LEASE_REAPER_INTERVAL: float = 5.0
+    TASK_LEASE_REAPER_BATCH_SIZE: int = 1000
+    TASK_DUE_SCHEDULER_HORIZON: float = 3600.0
+    TASK_DUE_SCHEDULER_MAX_SIZE: int = 100000
+    TASK_DUE_SCHEDULER_RELOAD_INTERVAL: float = 60.0
+    TASK_DUE_SCHEDULER_BATCH_SIZE: int = 1000
+    TASK_CACHE_SIZE: int = 10000
+    TASK_CACHE_TTL: float = 60.0
+    TASK_SEARCH_CANDIDATES: int = 1000
+    TASK_ANALYTICS_ROLLUP_INTERVAL: float = 10.0
+    TASK_ANALYTICS_ROLLUP_BATCH_SIZE: int = 10000
+    TASK_ANALYTICS_MAX_BUCKETS: int = 1000
+    TASK_WEBHOOK_URL: str | None = None
+    TASK_WEBHOOK_TIMEOUT: float = 5.0
+    TASK_WEBHOOK_CONCURRENCY: int = 10
+    TASK_OUTBOX_POLL_INTERVAL: float = 5.0
+    TASK_OUTBOX_BATCH_SIZE: int = 100
+    TASK_OUTBOX_LEASE_SECONDS: float = 60.0
+    TASK_OUTBOX_MAX_ATTEMPTS: int = 10
+    TASK_OUTBOX_BACKOFF_SECONDS: float = 1.0
+    TASK_OUTBOX_BACKOFF_MAX_SECONDS: float = 600.0
+    TASK_OUTBOX_RETENTION_SECONDS: float = 86400.0
+    TASK_OUTBOX_PURGE_INTERVAL: float = 60.0
+    TASK_OUTBOX_PURGE_BATCH_SIZE: int = 10000
+    TASK_CHANGES_BUFFER_SIZE: int = 10000
+    TASK_CHANGES_QUEUE_SIZE: int = 100
+    TASK_CHANGES_HEARTBEAT_INTERVAL: float = 15.0
+    TASK_CHANGES_MAX_SUBSCRIBERS: int = 10000
+
     @property
     def set_backend_app_attributes(self) -> dict[str, str | bool | None]:
         """
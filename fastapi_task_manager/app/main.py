@@ -1,11 +1,13 @@
 # pylint:disable=no-member
 import uvicorn
 import fastapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.utils.exceptions.database import EntityDoesNotExist
+from app.utils.exceptions.database import EntityDoesNotExist, EntityVersionMismatch
 
 from app.api.endpoints import router as api_router
+from app.api.middleware.metrics import RequestMetricsMiddleware
+from app.api.routers.metrics import router as metrics_router
 from app.config.events import (
     execute_backend_server_event_handler,
     terminate_backend_server_event_handler,
@@ -14,7 +16,9 @@ from app.config.manager import settings
 
 
 def initialize_backend_application() -> fastapi.FastAPI:
-    app = fastapi.FastAPI(**settings.set_backend_app_attributes)
+    app = fastapi.FastAPI(
+        **settings.set_backend_app_attributes, default_response_class=ORJSONResponse
+    )
 
     @app.exception_handler(EntityDoesNotExist)
     async def entity_not_found_exception_handler(request, exc: EntityDoesNotExist):
@@ -23,6 +27,15 @@ def initialize_backend_application() -> fastapi.FastAPI:
             content={"detail": str(exc)},
         )
 
+    @app.exception_handler(EntityVersionMismatch)
+    async def entity_version_mismatch_exception_handler(
+        request, exc: EntityVersionMismatch
+    ):
+        return JSONResponse(
+            status_code=412,
+            content={"detail": str(exc)},
+        )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.ALLOWED_ORIGINS,
@@ -30,6 +43,7 @@ def initialize_backend_application() -> fastapi.FastAPI:
         allow_methods=settings.ALLOWED_METHODS,
         allow_headers=settings.ALLOWED_HEADERS,
     )
+    app.add_middleware(RequestMetricsMiddleware)
 
     app.add_event_handler(
         "startup",
@@ -41,6 +55,7 @@ def initialize_backend_application() -> fastapi.FastAPI:
     )
 
     app.include_router(router=api_router, prefix=settings.API_PREFIX)
+    app.include_router(router=metrics_router)
 
     return app
 
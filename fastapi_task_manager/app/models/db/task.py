@@ -2,6 +2,7 @@ import datetime
 import enum
 import uuid
 import sqlalchemy
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import (
     Mapped as SQLAlchemyMapped,
     mapped_column as sqlalchemy_mapped_column,
@@ -19,6 +20,38 @@ class TaskStatus(enum.Enum):
 
 class Task(Base):
     __tablename__ = "task"
+    __table_args__ = (
+        sqlalchemy.Index("ix_task_created_at_uuid", "created_at", "uuid"),
+        sqlalchemy.Index(
+            "ix_task_status_created_at_uuid", "status", "created_at", "uuid"
+        ),
+        sqlalchemy.Index(
+            "ix_task_status_priority_due_at",
+            "status",
+            sqlalchemy.text("priority DESC"),
+            "due_at",
+            "created_at",
+            "uuid",
+        ),
+        sqlalchemy.Index(
+            "ix_task_due_at_pending",
+            "due_at",
+            postgresql_where=sqlalchemy.text(
+                "due_at IS NOT NULL AND NOT overdue AND status <> 'DONE'"
+            ),
+        ),
+        sqlalchemy.Index("ix_task_updated_at", "updated_at"),
+        sqlalchemy.Index(
+            "ix_task_lease_expires_at",
+            "lease_expires_at",
+            postgresql_where=sqlalchemy.text("lease_expires_at IS NOT NULL"),
+        ),
+        sqlalchemy.Index(
+            "ix_task_name_pattern",
+            "name",
+            postgresql_ops={"name": "varchar_pattern_ops"},
+        ),
+    )
 
     uuid: SQLAlchemyMapped[uuid] = sqlalchemy_mapped_column(
         sqlalchemy.UUID,
@@ -46,3 +79,153 @@ class Task(Base):
         nullable=True,
         server_onupdate=sqlalchemy.schema.FetchedValue(for_update=True),
     )
+    status_changed_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=True,
+        server_default=sqlalchemy_functions.now(),
+        server_onupdate=sqlalchemy.schema.FetchedValue(for_update=True),
+    )
+    priority: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.Integer, default=0, nullable=False, server_default="0"
+    )
+    due_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True), nullable=True
+    )
+    overdue: SQLAlchemyMapped[bool] = sqlalchemy_mapped_column(
+        sqlalchemy.Boolean, default=False, nullable=False, server_default="false"
+    )
+    owner: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        sqlalchemy.String(length=255), nullable=True
+    )
+    lease_expires_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True), nullable=True
+    )
+    search_vector: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        TSVECTOR,
+        sqlalchemy.Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+
+class TaskStatusCount(Base):
+    """
+    One shard of the per-status task count, kept up to date by triggers on `task`
+    (migration 0004); the count of a status is the sum of its shards.
+    """
+
+    __tablename__ = "task_status_count"
+
+    status: SQLAlchemyMapped[TaskStatus] = sqlalchemy_mapped_column(
+        sqlalchemy.Enum(TaskStatus), primary_key=True
+    )
+    shard: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.SmallInteger, primary_key=True
+    )
+    count: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, nullable=False
+    )
+
+
+class TaskThroughputDelta(Base):
+    """
+    Throughput of one write statement on `task`, appended by triggers (migration 0005) and
+    folded into `TaskThroughputHourly` by the rollup job.
+    """
+
+    __tablename__ = "task_throughput_delta"
+
+    id: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, primary_key=True
+    )
+    bucket_start: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True), nullable=False
+    )
+    created: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, nullable=False
+    )
+    completed: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, nullable=False
+    )
+    in_work_exits: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, nullable=False
+    )
+    in_work_seconds: SQLAlchemyMapped[float] = sqlalchemy_mapped_column(
+        sqlalchemy.Double, nullable=False
+    )
+
+
+class TaskThroughputHourly(Base):
+    """
+    Tasks created, tasks completed, and tasks that left `WORK` with their total time in it,
+    per UTC hour.
+    """
+
+    __tablename__ = "task_throughput_hourly"
+
+    bucket_start: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True), primary_key=True
+    )
+    created: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, nullable=False
+    )
+    completed: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, nullable=False
+    )
+    in_work_exits: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, nullable=False
+    )
+    in_work_seconds: SQLAlchemyMapped[float] = sqlalchemy_mapped_column(
+        sqlalchemy.Double, nullable=False
+    )
+
+
+class TaskOutboxEvent(Base):
+    """
+    A task change to notify the webhook receiver about, appended by triggers on `task`
+    (migration 0006) in the writing transaction and deleted once delivered, or once kept
+    for `TASK_OUTBOX_RETENTION_SECONDS` when it will not be.
+    """
+
+    __tablename__ = "task_outbox"
+    __table_args__ = (
+        sqlalchemy.Index("ix_task_outbox_available_at_id", "available_at", "id"),
+    )
+
+    id: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.BigInteger, primary_key=True
+    )
+    event: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        sqlalchemy.Text, nullable=False
+    )
+    task_uuid: SQLAlchemyMapped[uuid.UUID] = sqlalchemy_mapped_column(
+        sqlalchemy.UUID, nullable=False
+    )
+    name: SQLAlchemyMapped[str] = sqlalchemy_mapped_column(
+        sqlalchemy.String(length=255), nullable=False
+    )
+    status: SQLAlchemyMapped[TaskStatus] = sqlalchemy_mapped_column(
+        sqlalchemy.Enum(TaskStatus), nullable=False
+    )
+    previous_status: SQLAlchemyMapped[TaskStatus | None] = sqlalchemy_mapped_column(
+        sqlalchemy.Enum(TaskStatus), nullable=True
+    )
+    occurred_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy_functions.now(),
+    )
+    available_at: SQLAlchemyMapped[datetime.datetime] = sqlalchemy_mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy_functions.now(),
+    )
+    attempts: SQLAlchemyMapped[int] = sqlalchemy_mapped_column(
+        sqlalchemy.Integer, nullable=False, server_default="0"
+    )
+    last_error: SQLAlchemyMapped[str | None] = sqlalchemy_mapped_column(
+        sqlalchemy.Text, nullable=True
+    )
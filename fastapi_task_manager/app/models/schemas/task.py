@@ -1,15 +1,23 @@
 import datetime
+import enum
 import uuid
 from typing import Optional
-from pydantic import Field, field_validator
+from pydantic import AwareDatetime, Field, field_validator
 from app.models.schemas.base import BaseScheameModel
 from app.models.db.task import TaskStatus
 
 
+# Higher priorities are claimed and listed first.
+TASK_PRIORITY_MIN: int = 0
+TASK_PRIORITY_MAX: int = 1000
+
+
 class TaskCreate(BaseScheameModel):
     name: str = Field(min_length=5, max_length=255)
     description: str | None = Field(None, max_length=1000)
     status: TaskStatus
+    priority: int = Field(0, ge=TASK_PRIORITY_MIN, le=TASK_PRIORITY_MAX)
+    due_at: AwareDatetime | None = None
 
     @field_validator("name")
     @classmethod
@@ -27,6 +35,8 @@ class TaskUpdate(BaseScheameModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = Field(None, max_length=1000)
     status: Optional[TaskStatus] = None
+    priority: Optional[int] = Field(None, ge=TASK_PRIORITY_MIN, le=TASK_PRIORITY_MAX)
+    due_at: Optional[AwareDatetime] = None
 
     @field_validator("name")
     @classmethod
@@ -35,6 +45,13 @@ class TaskUpdate(BaseScheameModel):
             raise ValueError("Name cannot be empty or whitespace only")
         return value.strip() if value else None
 
+    @field_validator("priority")
+    @classmethod
+    def validate_priority(cls, value):
+        if value is None:
+            raise ValueError("Priority cannot be null")
+        return value
+
 
 class TaskDelete(BaseScheameModel):
     uuid: uuid.UUID
@@ -47,3 +64,105 @@ class TaskResponse(BaseScheameModel):
     status: TaskStatus
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
+    priority: int = 0
+    due_at: datetime.datetime | None = None
+    overdue: bool = False
+
+
+class TaskLeaseResponse(TaskResponse):
+    owner: str | None
+    lease_expires_at: datetime.datetime | None
+
+
+class TaskHeartbeatResponse(BaseScheameModel):
+    extended: list[uuid.UUID]
+    lease_expires_at: datetime.datetime | None
+
+
+class TaskListResponse(BaseScheameModel):
+    items: list[TaskResponse]
+    next_cursor: str | None = None
+
+
+class TaskSearchResponse(TaskListResponse):
+    """A search page; `truncated` when older matches beyond the ranked ones were left out."""
+
+    truncated: bool = False
+
+
+class TaskStatsResponse(BaseScheameModel):
+    total: int
+    by_status: dict[TaskStatus, int]
+
+
+class TaskAnalyticsBucket(str, enum.Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class TaskThroughputResponse(BaseScheameModel):
+    bucket_start: datetime.datetime
+    created: int
+    completed: int
+    in_work_exits: int
+    avg_in_work_seconds: float | None
+
+
+class TaskAnalyticsResponse(BaseScheameModel):
+    bucket: TaskAnalyticsBucket
+    items: list[TaskThroughputResponse]
+
+
+class TaskFilter(BaseScheameModel):
+    """
+    List filters; `*_after` bounds are inclusive, `*_before` bounds exclusive.
+    """
+
+    status: list[TaskStatus] | None = None
+    created_after: datetime.datetime | None = None
+    created_before: datetime.datetime | None = None
+    updated_after: datetime.datetime | None = None
+    updated_before: datetime.datetime | None = None
+    name_prefix: str | None = Field(None, min_length=1, max_length=255)
+
+
+class TaskListOrder(str, enum.Enum):
+    CREATED = "created"
+    PRIORITY = "priority"
+
+
+class TaskExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TaskBulkReturning(str, enum.Enum):
+    ROWS = "rows"
+    UUIDS = "uuids"
+
+
+class TaskEventPayload(BaseScheameModel):
+    """
+    Body of a task webhook; `id` is unique per event, so a receiver can drop the duplicates
+    that at-least-once delivery may send.
+    """
+
+    id: int
+    event: str
+    occurred_at: datetime.datetime
+    task_uuid: uuid.UUID
+    name: str
+    status: TaskStatus
+    previous_status: TaskStatus | None
+
+
+class TaskChangeEvent(BaseScheameModel):
+    """
+    Data of a change feed event; a deleted task carries only its `uuid`. `id` is drawn from
+    a sequence when the change is made, not when it commits, so events of concurrent
+    transactions may arrive out of `id` order; it identifies an event to resume after.
+    """
+
+    id: int
+    event: str
+    task: TaskResponse | TaskDelete
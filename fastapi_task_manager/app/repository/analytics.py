@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.config.manager import settings
+from app.repository.crud.task import TaskCRUDRepository
+from app.repository.database import async_db
+from app.utils.periodic import PeriodicTask, run_in_batches
+
+
+async def roll_up_task_throughput() -> int:
+    """Fold every pending throughput delta into the hourly buckets and return how many."""
+    async with SQLAlchemyAsyncSession(bind=async_db.async_engine) as async_session:
+        task_repo = TaskCRUDRepository(async_session=async_session)
+        return await run_in_batches(
+            lambda batch_size: task_repo.roll_up_task_throughput(batch_size=batch_size),
+            batch_size=settings.TASK_ANALYTICS_ROLLUP_BATCH_SIZE,
+        )
+
+
+task_throughput_rollup: PeriodicTask = PeriodicTask(
+    name="task-throughput-rollup",
+    interval=settings.TASK_ANALYTICS_ROLLUP_INTERVAL,
+    callback=roll_up_task_throughput,
+)
@@ -0,0 +1,154 @@
+import collections
+import time
+import typing
+import uuid
+
+import sqlalchemy
+from prometheus_client import REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.config.manager import settings
+
+TASK_CACHE_CHANNEL: str = "task_cache_invalidation"
+
+KeyT = typing.TypeVar("KeyT", bound=typing.Hashable)
+ValueT = typing.TypeVar("ValueT")
+
+
+class LRUTTLCache(typing.Generic[KeyT, ValueT]):
+    """
+    Bounded in-process cache: least recently used entries are evicted once `max_size` is
+    reached and every entry expires `ttl` seconds after it was stored. `max_size=0` disables it.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.epoch = 0
+        self.counters: collections.Counter[str] = collections.Counter(
+            hits=0, misses=0, evictions=0, expirations=0
+        )
+        self._entries: collections.OrderedDict[KeyT, tuple[float, ValueT]] = (
+            collections.OrderedDict()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyT) -> ValueT | None:
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.counters["expirations"] += 1
+            self.counters["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return value
+
+    def set(self, key: KeyT, value: ValueT, epoch: int | None = None) -> None:
+        """
+        Store `value`; when `epoch` is given and something was invalidated since it was read,
+        the value may predate that write and is dropped instead of being cached.
+        """
+        if not self.enabled or (epoch is not None and epoch != self.epoch):
+            return
+
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def invalidate(self, *keys: KeyT) -> None:
+        self.epoch += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "max_size": self.max_size, **self.counters}
+
+
+class TaskCacheStats(Collector):
+    """Lookups, removals and size of the task cache, read from its `stats` on scrape."""
+
+    def __init__(self, cache: LRUTTLCache):
+        self.cache = cache
+
+    def collect(self) -> typing.Iterator[typing.Any]:
+        stats = self.cache.stats
+        lookups = CounterMetricFamily(
+            "task_cache_lookups",
+            "Task cache lookups by whether the task was cached.",
+            labels=("result",),
+        )
+        lookups.add_metric(["hit"], stats["hits"])
+        lookups.add_metric(["miss"], stats["misses"])
+        yield lookups
+
+        removals = CounterMetricFamily(
+            "task_cache_removals",
+            "Task cache entries dropped to make room or because their TTL ran out; "
+            "invalidations are not counted.",
+            labels=("reason",),
+        )
+        removals.add_metric(["eviction"], stats["evictions"])
+        removals.add_metric(["expiration"], stats["expirations"])
+        yield removals
+
+        yield GaugeMetricFamily(
+            "task_cache_entries", "Tasks held in the task cache.", value=stats["size"]
+        )
+        yield GaugeMetricFamily(
+            "task_cache_max_entries",
+            "Capacity of the task cache (`TASK_CACHE_SIZE`).",
+            value=stats["max_size"],
+        )
+
+
+task_cache: LRUTTLCache = LRUTTLCache(
+    max_size=settings.TASK_CACHE_SIZE, ttl=settings.TASK_CACHE_TTL
+)
+REGISTRY.register(TaskCacheStats(cache=task_cache))
+
+
+def notify_task_cache_invalidation(
+    task_uuid: sqlalchemy.ColumnElement,
+) -> sqlalchemy.ColumnElement:
+    """
+    `pg_notify` for the `RETURNING` clause of a task write: every worker's listener evicts the
+    returned uuid, the notification is only delivered if the write commits, and it costs no
+    extra round trip.
+    """
+    return sqlalchemy.func.pg_notify(
+        TASK_CACHE_CHANNEL, sqlalchemy.cast(task_uuid, sqlalchemy.String)
+    )
+
+
+def evict_task_cache_entries(payload: str) -> None:
+    task_cache.invalidate(*(uuid.UUID(task_uuid) for task_uuid in payload.split(",")))
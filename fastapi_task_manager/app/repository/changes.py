@@ -0,0 +1,258 @@
+import asyncio
+import collections
+import itertools
+import json
+import typing
+
+import loguru
+from prometheus_client import REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.config.manager import settings
+from app.models.db.task import TaskStatus
+from app.models.schemas.task import TaskChangeEvent
+from app.utils.periodic import PeriodicTask
+
+TASK_CHANGES_CHANNEL: str = "task_changes"
+
+# Sent instead of a replay when the requested event is no longer buffered, and to every
+# subscriber when the listener lost notifications: the client has to re-read the tasks.
+RESET_FRAME: bytes = b"event: reset\ndata: {}\n\n"
+# Last frame of a subscriber that fell `TASK_CHANGES_QUEUE_SIZE` chunks behind; it can
+# reconnect with the id of the last event it read.
+EVICTED_FRAME: bytes = b"event: evicted\ndata: {}\n\n"
+HEARTBEAT_FRAME: bytes = b": heartbeat\n\n"
+
+
+def format_task_change_frame(payload: str) -> tuple[int, bytes]:
+    """
+    Turn a `task_changes` notification into its event id and Server-Sent Events frame,
+    with the task in the same JSON shape the task routes answer with.
+    """
+    change = json.loads(payload)
+    task = change["task"]
+    if "status" in task:
+        task["status"] = TaskStatus[task["status"]]
+    event = TaskChangeEvent.model_validate(change)
+    return event.id, (
+        f"id: {event.id}\nevent: {event.event}\ndata: ".encode()
+        + event.model_dump_json(by_alias=True).encode()
+        + b"\n\n"
+    )
+
+
+class TaskChangeSubscriber:
+    """The frames not yet written to one open stream."""
+
+    __slots__ = ("frames", "ready", "closed")
+
+    def __init__(self) -> None:
+        self.frames: collections.deque[bytes] = collections.deque()
+        self.ready = asyncio.Event()
+        self.closed = False
+
+
+class TaskChangeBuffer:
+    """The last `size` events, in the order they arrived, to replay after a given one."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._events: collections.deque[tuple[int, bytes]] = collections.deque()
+        # event id -> position in the order events arrived, of the buffered events
+        self._positions: dict[int, int] = {}
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, event_id: int, frame: bytes) -> None:
+        self._position += 1
+        self._events.append((event_id, frame))
+        self._positions[event_id] = self._position
+        if len(self._events) > self.size:
+            dropped_id, _ = self._events.popleft()
+            del self._positions[dropped_id]
+
+    def frames_after(self, event_id: int) -> bytes | None:
+        """The frames that arrived after `event_id` as one, or `None` if it is not buffered."""
+        position = self._positions.get(event_id)
+        if position is None:
+            return None
+        skip = position - (self._position - len(self._events) + 1) + 1
+        return b"".join(
+            frame for _, frame in itertools.islice(self._events, skip, None)
+        )
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._positions.clear()
+
+
+class TaskChangeFeed:
+    """
+    Fan-out of this worker's `task_changes` notifications to its change streams.
+
+    Each event is formatted once and shared by every subscriber's queue, so an idle
+    subscriber costs a queue, an event and its suspended response, and no timer: heartbeats
+    go out to all of them from one periodic task.
+
+    The notifications of one write statement arrive back to back, with no chance for the
+    streams to run in between, so the frames of such a burst are joined and queued as one
+    chunk once it is over. A queue thus grows by one chunk per burst its subscriber did not
+    get to read, however many rows the statement touched, and a subscriber that falls
+    `queue_size` chunks behind is evicted rather than buffered without bound.
+
+    The last `buffer_size` events are kept in `buffer` for resuming. Every worker receives the same
+    notifications in commit order, so the events after a given id are the same on all of
+    them; a reconnecting client may land on any worker.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int, max_subscribers: int):
+        self.buffer = TaskChangeBuffer(size=buffer_size)
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.subscribers: set[TaskChangeSubscriber] = set()
+        self.counters: collections.Counter[str] = collections.Counter(
+            published=0, evicted=0
+        )
+        # frames of the burst in progress, queued together by `_flush_burst`
+        self._burst: list[bytes] = []
+        self.periodic: PeriodicTask = PeriodicTask(
+            name="task-change-heartbeat",
+            interval=settings.TASK_CHANGES_HEARTBEAT_INTERVAL,
+            callback=self.heartbeat,
+        )
+
+    def publish(self, payload: str) -> None:
+        try:
+            event_id, frame = format_task_change_frame(payload)
+        except (ValueError, KeyError) as e:
+            loguru.logger.error(f"Task Change Feed --- Bad Notification: {e!r}")
+            return
+
+        self.buffer.append(event_id, frame)
+        self.counters["published"] += 1
+        self._broadcast(frame)
+
+    async def heartbeat(self) -> None:
+        """Keep idle streams from being timed out by proxies between the client and us."""
+        self._broadcast(HEARTBEAT_FRAME)
+
+    def reset(self) -> None:
+        """Forget the buffered events and tell every subscriber to re-read the tasks."""
+        self.buffer.clear()
+        self._broadcast(RESET_FRAME)
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.subscribers) >= self.max_subscribers
+
+    def subscribe(self, last_event_id: int | None = None) -> TaskChangeSubscriber:
+        """
+        Open a subscription that starts with the buffered events after `last_event_id`, or
+        with a reset if that event is no longer buffered.
+        """
+        subscriber = TaskChangeSubscriber()
+        if last_event_id is not None:
+            replay = self.buffer.frames_after(last_event_id)
+            if replay is None:
+                subscriber.frames.append(RESET_FRAME)
+            elif replay:
+                # one frame however long the replay, so it does not count against the
+                # queue of a subscriber that has not started reading yet
+                subscriber.frames.append(replay)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: TaskChangeSubscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    async def stream(
+        self, last_event_id: int | None = None
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Subscribe and write out the frames as they come until the subscription is closed or
+        evicted. Subscribing only once the response body starts means a request that never
+        gets that far leaves nothing behind.
+        """
+        subscriber = self.subscribe(last_event_id=last_event_id)
+        try:
+            while True:
+                if subscriber.frames:
+                    chunk = b"".join(subscriber.frames)
+                    subscriber.frames.clear()
+                    yield chunk
+                elif subscriber.closed:
+                    return
+                else:
+                    subscriber.ready.clear()
+                    await subscriber.ready.wait()
+        finally:
+            self.unsubscribe(subscriber)
+
+    def close(self) -> None:
+        """End every stream after the frames already queued for it."""
+        self._flush_burst()
+        for subscriber in self.subscribers:
+            subscriber.closed = True
+            subscriber.ready.set()
+
+    def _broadcast(self, frame: bytes) -> None:
+        self._burst.append(frame)
+        if len(self._burst) == 1:
+            try:
+                # runs after the notifications the listener has already scheduled
+                asyncio.get_running_loop().call_soon(self._flush_burst)
+            except RuntimeError:
+                self._flush_burst()
+
+    def _flush_burst(self) -> None:
+        if not self._burst:
+            return
+        chunk = b"".join(self._burst)
+        self._burst.clear()
+        for subscriber in self.subscribers:
+            if subscriber.closed:
+                continue
+            if len(subscriber.frames) >= self.queue_size:
+                subscriber.frames.clear()
+                subscriber.frames.append(EVICTED_FRAME)
+                subscriber.closed = True
+                self.counters["evicted"] += 1
+            else:
+                subscriber.frames.append(chunk)
+            subscriber.ready.set()
+
+
+class TaskChangeFeedStats(Collector):
+    """Events and subscribers of the change feed, read from its `counters` on scrape."""
+
+    def __init__(self, feed: TaskChangeFeed):
+        self.feed = feed
+
+    def collect(self) -> typing.Iterator[typing.Any]:
+        yield CounterMetricFamily(
+            "task_change_events_published",
+            "Task change notifications published to the change feed subscribers.",
+            value=self.feed.counters["published"],
+        )
+        yield CounterMetricFamily(
+            "task_change_subscribers_evicted",
+            "Change feed subscribers evicted for falling `TASK_CHANGES_QUEUE_SIZE` "
+            "chunks behind.",
+            value=self.feed.counters["evicted"],
+        )
+        yield GaugeMetricFamily(
+            "task_change_subscribers",
+            "Open change feed streams.",
+            value=len(self.feed.subscribers),
+        )
+
+
+task_change_feed: TaskChangeFeed = TaskChangeFeed(
+    buffer_size=settings.TASK_CHANGES_BUFFER_SIZE,
+    queue_size=settings.TASK_CHANGES_QUEUE_SIZE,
+    max_subscribers=settings.TASK_CHANGES_MAX_SUBSCRIBERS,
+)
+REGISTRY.register(TaskChangeFeedStats(feed=task_change_feed))
@@ -0,0 +1,111 @@
+import datetime
+
+import sqlalchemy
+
+from app.models.db.task import TaskOutboxEvent
+from app.repository.crud.base import BaseCRUDRepository
+
+OUTBOX_TABLE = TaskOutboxEvent.__table__
+ONE_SECOND = sqlalchemy.literal_column("interval '1 second'")
+
+
+class TaskOutboxCRUDRepository(BaseCRUDRepository):
+    async def claim_events(
+        self, *, batch_size: int, lease_seconds: float, max_attempts: int
+    ) -> list[TaskOutboxEvent]:
+        """
+        Claim up to `batch_size` due events in one `UPDATE`, oldest first, and commit.
+
+        Rows another dispatcher is claiming right now are skipped rather than waited on, and
+        a claimed row is not due again for `lease_seconds`: a dispatcher that dies mid-batch
+        leaves its events to be retried once the lease runs out, while delivery itself holds
+        no transaction open. Events that used up `max_attempts` are not claimed anymore.
+        """
+        due = (
+            sqlalchemy.select(OUTBOX_TABLE.c.id)
+            .where(
+                OUTBOX_TABLE.c.available_at <= sqlalchemy.func.now(),
+                OUTBOX_TABLE.c.attempts < max_attempts,
+            )
+            .order_by(OUTBOX_TABLE.c.available_at, OUTBOX_TABLE.c.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        query = await self.async_session.execute(
+            sqlalchemy.update(OUTBOX_TABLE)
+            .where(OUTBOX_TABLE.c.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=OUTBOX_TABLE.c.attempts + 1,
+                available_at=sqlalchemy.func.now()
+                + datetime.timedelta(seconds=lease_seconds),
+            )
+            .returning(*OUTBOX_TABLE.c)
+        )
+        events = [TaskOutboxEvent(**row) for row in query.mappings()]
+        await self.async_session.commit()
+        return sorted(events, key=lambda event: event.id)
+
+    async def purge_events(
+        self, *, retention_seconds: float, max_attempts: int | None, batch_size: int
+    ) -> int:
+        """
+        Delete up to `batch_size` events that have not been due for `retention_seconds` and
+        commit, returning how many. With `max_attempts` only the events that used up their
+        attempts go, without it every such event does. Rows a dispatcher is claiming right
+        now are skipped.
+        """
+        expired = (
+            sqlalchemy.select(OUTBOX_TABLE.c.id)
+            .where(
+                OUTBOX_TABLE.c.available_at
+                < sqlalchemy.func.now() - retention_seconds * ONE_SECOND
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if max_attempts is not None:
+            expired = expired.where(OUTBOX_TABLE.c.attempts >= max_attempts)
+        query = await self.async_session.execute(
+            sqlalchemy.delete(OUTBOX_TABLE)
+            .where(OUTBOX_TABLE.c.id.in_(expired.scalar_subquery()))
+            .returning(OUTBOX_TABLE.c.id)
+        )
+        purged = len(query.scalars().all())
+        await self.async_session.commit()
+        return purged
+
+    async def settle_events(
+        self,
+        delivered: list[int],
+        failed: dict[int, str],
+        *,
+        backoff_seconds: float,
+        backoff_max_seconds: float,
+    ) -> None:
+        """
+        Delete the delivered events and make the failed ones due again after an exponential
+        backoff on their attempts so far, capped at `backoff_max_seconds` and jittered down
+        by up to half so events that failed together are not all retried together.
+        """
+        if delivered:
+            await self.async_session.execute(
+                sqlalchemy.delete(OUTBOX_TABLE).where(OUTBOX_TABLE.c.id.in_(delivered))
+            )
+        if failed:
+            delay = sqlalchemy.func.least(
+                backoff_seconds * sqlalchemy.func.power(2, OUTBOX_TABLE.c.attempts - 1),
+                backoff_max_seconds,
+            ) * (1 - sqlalchemy.func.random() / 2)
+            await self.async_session.execute(
+                sqlalchemy.update(OUTBOX_TABLE)
+                .where(OUTBOX_TABLE.c.id == sqlalchemy.bindparam("event_id"))
+                .values(
+                    available_at=sqlalchemy.func.now() + delay * ONE_SECOND,
+                    last_error=sqlalchemy.bindparam("error"),
+                ),
+                [
+                    {"event_id": event_id, "error": error}
+                    for event_id, error in failed.items()
+                ],
+            )
+        await self.async_session.commit()
@@ -1,82 +1,802 @@
 # pylint: disable=redefined-outer-name
+import datetime
 import typing
 import uuid
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import functions as sqlalchemy_functions
 
-from app.models.db.task import Task
+from app.models.db.task import (
+    Task,
+    TaskStatus,
+    TaskStatusCount,
+    TaskThroughputDelta,
+    TaskThroughputHourly,
+)
 from app.models.schemas.task import (
+    TaskAnalyticsBucket,
+    TaskBulkReturning,
     TaskCreate,
+    TaskFilter,
+    TaskListOrder,
+    TaskResponse,
     TaskUpdate,
 )
+from app.repository.cache import notify_task_cache_invalidation, task_cache
 from app.repository.crud.base import BaseCRUDRepository
-from app.utils.exceptions.database import EntityDoesNotExist
+from app.repository.listener import db_listener
+from app.utils.exceptions.database import EntityDoesNotExist, EntityVersionMismatch
+from app.utils.formatters.etag_formatter import format_task_etag
+
+
+# The text search configuration `task.search_vector` is generated with (migration 0003).
+TASK_SEARCH_CONFIG = sqlalchemy.literal_column("'simple'::regconfig")
+
+
+TASK_TABLE: sqlalchemy.Table = Task.__table__
+
+# `expected_versions` of an `If-Match: *`: any version will do, but the task has to exist.
+ANY_TASK_VERSION: typing.Final = "*"
+TaskVersions = typing.Sequence[datetime.datetime] | typing.Literal["*"]
+
+# The read endpoints select exactly the `TaskResponse` columns with Core and get plain
+# dicts back: no ORM instances, identity-map entries or attribute-by-attribute validation.
+TaskRow = dict[str, typing.Any]
+TASK_ROW_COLUMNS = tuple(
+    TASK_TABLE.c[name]
+    for name in (
+        "uuid",
+        "name",
+        "description",
+        "status",
+        "created_at",
+        "updated_at",
+        "priority",
+        "due_at",
+        "overdue",
+    )
+)
+
+# Statements of the hot read paths, built once: SQLAlchemy memoizes the cache key of a
+# statement object, so each call finds its compiled SQL without building and hashing a new
+# `select()` first. Per-call values go in as bound parameters.
+READ_TASK_BY_UUID = sqlalchemy.select(*TASK_ROW_COLUMNS).where(
+    TASK_TABLE.c.uuid == sqlalchemy.bindparam("task_uuid")
+)
+READ_TASK_PAGE = (
+    sqlalchemy.select(*TASK_ROW_COLUMNS)
+    .order_by(TASK_TABLE.c.created_at, TASK_TABLE.c.uuid)
+    .limit(sqlalchemy.bindparam("limit"))
+)
+AFTER_CREATED_AT_UUID = sqlalchemy.tuple_(
+    TASK_TABLE.c.created_at, TASK_TABLE.c.uuid
+) > sqlalchemy.tuple_(
+    sqlalchemy.bindparam("after_created_at", type_=TASK_TABLE.c.created_at.type),
+    sqlalchemy.bindparam("after_uuid", type_=TASK_TABLE.c.uuid.type),
+)
+READ_TASK_PAGE_AFTER = READ_TASK_PAGE.where(AFTER_CREATED_AT_UUID)
+# Queue order: highest priority first, then the earliest due (tasks without a due date
+# last), then oldest. It is the order of `ix_task_status_priority_due_at` within a status.
+TASK_QUEUE_ORDER = (
+    TASK_TABLE.c.priority.desc(),
+    TASK_TABLE.c.due_at,
+    TASK_TABLE.c.created_at,
+    TASK_TABLE.c.uuid,
+)
+READ_TASK_PRIORITY_PAGE = (
+    sqlalchemy.select(*TASK_ROW_COLUMNS)
+    .order_by(*TASK_QUEUE_ORDER)
+    .limit(sqlalchemy.bindparam("limit"))
+)
+# The directions are mixed, so there is no single row-value comparison, and a cursor
+# without a due date needs its own statement (those tasks come last). The redundant
+# `priority <= :after_priority` is what the index scan starts from; the rest is checked on
+# the rows it reads.
+AFTER_PRIORITY = sqlalchemy.bindparam(
+    "after_priority", type_=TASK_TABLE.c.priority.type
+)
+AFTER_DUE_AT = sqlalchemy.bindparam("after_due_at", type_=TASK_TABLE.c.due_at.type)
+READ_TASK_PRIORITY_PAGE_AFTER_DUE = READ_TASK_PRIORITY_PAGE.where(
+    TASK_TABLE.c.priority <= AFTER_PRIORITY,
+    sqlalchemy.or_(
+        TASK_TABLE.c.priority < AFTER_PRIORITY,
+        TASK_TABLE.c.due_at.is_(None),
+        TASK_TABLE.c.due_at > AFTER_DUE_AT,
+        sqlalchemy.and_(TASK_TABLE.c.due_at == AFTER_DUE_AT, AFTER_CREATED_AT_UUID),
+    ),
+)
+READ_TASK_PRIORITY_PAGE_AFTER_UNDATED = READ_TASK_PRIORITY_PAGE.where(
+    TASK_TABLE.c.priority <= AFTER_PRIORITY,
+    sqlalchemy.or_(
+        TASK_TABLE.c.priority < AFTER_PRIORITY,
+        sqlalchemy.and_(TASK_TABLE.c.due_at.is_(None), AFTER_CREATED_AT_UUID),
+    ),
+)
+
+
+def _locked_uuids(select: sqlalchemy.Select) -> sqlalchemy.ColumnElement:
+    """
+    `ANY(ARRAY(select))`: the uuids are collected first and the update then finds each one
+    by primary key. With a plain `IN (select)` the planner may hash-join the batch against
+    a full scan of `task` once it expects more than a few hundred rows.
+    """
+    return sqlalchemy.any_(
+        sqlalchemy.func.array(
+            select.scalar_subquery(), type_=postgresql.ARRAY(sqlalchemy.UUID)
+        )
+    )
+
+
+# The first `limit` pending tasks in queue order that no other claim holds right now,
+# flipped to `WORK` and leased to `owner` in the same statement; the scan runs on
+# `ix_task_status_priority_due_at`.
+PENDING_TASKS = (
+    sqlalchemy.select(TASK_TABLE.c.uuid)
+    .where(TASK_TABLE.c.status == TaskStatus.CREATED)
+    .order_by(*TASK_QUEUE_ORDER)
+    .limit(sqlalchemy.bindparam("limit"))
+    .with_for_update(skip_locked=True)
+)
+LEASE_EXPIRES_AT = sqlalchemy_functions.now() + sqlalchemy.bindparam(
+    "lease", type_=sqlalchemy.Interval
+)
+CLAIMED_TASK_COLUMNS = (
+    *TASK_ROW_COLUMNS,
+    TASK_TABLE.c.owner,
+    TASK_TABLE.c.lease_expires_at,
+)
+CLAIMED_TASK_KEYS = tuple(column.name for column in CLAIMED_TASK_COLUMNS)
+CLAIM_PENDING_TASKS = (
+    sqlalchemy.update(TASK_TABLE)
+    .where(TASK_TABLE.c.uuid == _locked_uuids(PENDING_TASKS))
+    .values(
+        status=TaskStatus.WORK,
+        updated_at=sqlalchemy_functions.now(),
+        owner=sqlalchemy.bindparam("lease_owner"),
+        lease_expires_at=LEASE_EXPIRES_AT,
+    )
+    .returning(*CLAIMED_TASK_COLUMNS, notify_task_cache_invalidation(TASK_TABLE.c.uuid))
+)
+# All the uuids go in as one array parameter, so the statement is the same for any count.
+# The leases are locked in uuid order: heartbeats of overlapping tasks then queue behind
+# each other instead of deadlocking, whatever order their plans would visit the rows in.
+LEASED_TASKS = (
+    sqlalchemy.select(TASK_TABLE.c.uuid)
+    .where(
+        TASK_TABLE.c.uuid
+        == sqlalchemy.any_(
+            sqlalchemy.bindparam("uuids", type_=postgresql.ARRAY(sqlalchemy.UUID))
+        ),
+        TASK_TABLE.c.status == TaskStatus.WORK,
+        TASK_TABLE.c.lease_expires_at.is_not(None),
+        TASK_TABLE.c.owner.is_not_distinct_from(sqlalchemy.bindparam("lease_owner")),
+    )
+    .order_by(TASK_TABLE.c.uuid)
+    .with_for_update()
+)
+EXTEND_TASK_LEASES = (
+    sqlalchemy.update(TASK_TABLE)
+    .where(TASK_TABLE.c.uuid == _locked_uuids(LEASED_TASKS))
+    .values(lease_expires_at=LEASE_EXPIRES_AT)
+    .returning(TASK_TABLE.c.uuid, TASK_TABLE.c.lease_expires_at)
+)
+# Expired leases, soonest expired first, read off `ix_task_lease_expires_at`.
+EXPIRED_LEASES = (
+    sqlalchemy.select(TASK_TABLE.c.uuid)
+    .where(TASK_TABLE.c.lease_expires_at < sqlalchemy_functions.now())
+    .order_by(TASK_TABLE.c.lease_expires_at)
+    .limit(sqlalchemy.bindparam("limit"))
+    .with_for_update(skip_locked=True)
+)
+REQUEUE_EXPIRED_TASKS = (
+    sqlalchemy.update(TASK_TABLE)
+    .where(TASK_TABLE.c.uuid == _locked_uuids(EXPIRED_LEASES))
+    .values(
+        status=TaskStatus.CREATED,
+        updated_at=sqlalchemy_functions.now(),
+        owner=None,
+        lease_expires_at=None,
+    )
+    .returning(TASK_TABLE.c.uuid, notify_task_cache_invalidation(TASK_TABLE.c.uuid))
+)
+# Due times the scheduler still has to flag, earliest first, off `ix_task_due_at_pending`.
+PENDING_DUE_TIMES = (
+    sqlalchemy.select(TASK_TABLE.c.uuid, TASK_TABLE.c.due_at)
+    .where(
+        TASK_TABLE.c.due_at.is_not(None),
+        sqlalchemy.not_(TASK_TABLE.c.overdue),
+        TASK_TABLE.c.status != TaskStatus.DONE,
+        TASK_TABLE.c.due_at <= sqlalchemy.bindparam("until"),
+    )
+    .order_by(TASK_TABLE.c.due_at)
+    .limit(sqlalchemy.bindparam("limit"))
+)
+# `updated_at` moves with the flag, so ETags change and the change feed announces it.
+FLAG_OVERDUE_TASKS = (
+    sqlalchemy.update(TASK_TABLE)
+    .where(
+        TASK_TABLE.c.uuid
+        == sqlalchemy.any_(
+            sqlalchemy.bindparam("uuids", type_=postgresql.ARRAY(sqlalchemy.UUID))
+        ),
+        sqlalchemy.not_(TASK_TABLE.c.overdue),
+        TASK_TABLE.c.status != TaskStatus.DONE,
+        TASK_TABLE.c.due_at <= sqlalchemy.bindparam("now"),
+    )
+    .values(overdue=True, updated_at=sqlalchemy_functions.now())
+    .returning(TASK_TABLE.c.uuid, notify_task_cache_invalidation(TASK_TABLE.c.uuid))
+)
+READ_TASK_STATUS_COUNTS = sqlalchemy.select(
+    TaskStatusCount.status, sqlalchemy_functions.sum(TaskStatusCount.count)
+).group_by(TaskStatusCount.status)
+
+
+# `(priority, due_at, created_at, uuid)` position of a task in the queue order
+TaskQueueKey = tuple[int, datetime.datetime | None, datetime.datetime, uuid.UUID]
+
+
+def task_queue_key(task: TaskRow) -> tuple:
+    """Sort key of task rows in the queue order of `TASK_QUEUE_ORDER`."""
+    due_at = task["due_at"]
+    return (
+        -task["priority"],
+        due_at is None,
+        due_at or task["created_at"],
+        task["created_at"],
+        task["uuid"],
+    )
+
+
+class TaskPayload(typing.NamedTuple):
+    etag: str
+    body: bytes | None
 
 
 class TaskCRUDRepository(BaseCRUDRepository):
     async def create_task(self, task_create: TaskCreate) -> Task:
-        new_task = Task(
-            name=task_create.name,
-            description=task_create.description,
-            status=task_create.status,
+        stmt = (
+            sqlalchemy.insert(Task)
+            .values(
+                name=task_create.name,
+                description=task_create.description,
+                status=task_create.status,
+                priority=task_create.priority,
+                due_at=task_create.due_at,
+            )
+            .returning(Task)
         )
-        self.async_session.add(instance=new_task)
+        query = await self.async_session.scalars(statement=stmt)
+        new_task = query.one()
         await self.async_session.commit()
-        await self.async_session.refresh(instance=new_task)
 
         return new_task
 
-    async def read_tasks(self) -> typing.Sequence[Task]:
-        stmt = sqlalchemy.select(Task)
-        query = await self.async_session.execute(statement=stmt)
+    async def create_tasks(
+        self,
+        tasks_create: typing.Sequence[TaskCreate],
+        returning: TaskBulkReturning = TaskBulkReturning.ROWS,
+    ) -> typing.Sequence[Task] | list[uuid.UUID]:
+        """
+        Insert all tasks in a single transaction.
+
+        UUIDs are generated here, so the `UUIDS` mode needs no `RETURNING` at all and goes
+        through the driver's pipelined `executemany`; the `ROWS` mode is sent as multi-row
+        `INSERT ... RETURNING` batches and the rows come back in the order of the input.
+        """
+        new_uuids = [uuid.uuid4() for _ in tasks_create]
+        values = [
+            {
+                "uuid": task_uuid,
+                "name": task_create.name,
+                "description": task_create.description,
+                "status": task_create.status,
+                "priority": task_create.priority,
+                "due_at": task_create.due_at,
+            }
+            for task_uuid, task_create in zip(new_uuids, tasks_create)
+        ]
+
+        if returning == TaskBulkReturning.UUIDS:
+            await self.async_session.execute(sqlalchemy.insert(Task), values)
+            await self.async_session.commit()
+            return new_uuids
+
+        query = await self.async_session.scalars(
+            sqlalchemy.insert(Task).returning(Task), values
+        )
+        new_tasks = {task.uuid: task for task in query.all()}
+        await self.async_session.commit()
+
+        return [new_tasks[task_uuid] for task_uuid in new_uuids]
+
+    async def read_tasks(
+        self,
+        limit: int = 100,
+        after: tuple[datetime.datetime, uuid.UUID] | None = None,
+        filters: TaskFilter | None = None,
+        *,
+        order: TaskListOrder = TaskListOrder.CREATED,
+        after_queue_key: TaskQueueKey | None = None,
+    ) -> list[TaskRow]:
+        """
+        Read one page of task rows in `(created_at, uuid)` order, starting right after the
+        `after` key.
+
+        The row-value comparison is served by `ix_task_created_at_uuid`, so every page costs
+        the same index range scan no matter how deep the client has paged. A `status` filter
+        switches to `ix_task_status_created_at_uuid`, which keeps the same order per status.
+
+        The `PRIORITY` order is the queue order claims take tasks in and resumes after
+        `after_queue_key`. It is read off `ix_task_status_priority_due_at`, so the route only
+        allows it with a single `status` filter; otherwise it would sort the whole table.
+        """
+        params: dict[str, typing.Any] = {"limit": limit}
+        if order == TaskListOrder.PRIORITY:
+            stmt = READ_TASK_PRIORITY_PAGE
+            if after_queue_key is not None:
+                priority, due_at, created_at, task_uuid = after_queue_key
+                params.update(
+                    after_priority=priority,
+                    after_created_at=created_at,
+                    after_uuid=task_uuid,
+                )
+                if due_at is None:
+                    stmt = READ_TASK_PRIORITY_PAGE_AFTER_UNDATED
+                else:
+                    stmt = READ_TASK_PRIORITY_PAGE_AFTER_DUE
+                    params["after_due_at"] = due_at
+        else:
+            stmt = READ_TASK_PAGE
+            if after is not None:
+                stmt = READ_TASK_PAGE_AFTER
+                params["after_created_at"], params["after_uuid"] = after
+        if filters is not None:
+            clauses = self._filter_tasks(filters=filters)
+            if clauses:
+                stmt = stmt.where(*clauses)
+        query = await self.async_session.execute(statement=stmt, params=params)
+
+        return self._task_rows(query)
 
-        return query.scalars().all()
+    async def search_tasks(
+        self,
+        query: str,
+        *,
+        limit: int = 100,
+        after: tuple[float, uuid.UUID] | None = None,
+        fuzzy: bool = False,
+        candidates: int = 1000,
+    ) -> typing.Sequence[sqlalchemy.Row]:
+        """
+        Read one page of `(Task, rank, matches)` rows matching the web-search style `query`,
+        best rank first, resuming right after the `(rank, uuid)` of the previous page.
+
+        Matches come from the GIN index on `search_vector`; `fuzzy` also takes names that
+        are trigram-similar to the query through `ix_task_name_trgm` (a bitmap OR of both
+        indexes) and adds that similarity to the rank.
+
+        Ranking costs a `ts_rank_cd` call per match, so only the `candidates` most recently
+        created matches are ranked: the order is exact for queries matching fewer tasks, and
+        a query as broad as a common word stays in the low milliseconds instead of ranking
+        the whole table, at the price of leaving its older matches out. One more match is
+        read to tell when that happened: `matches` on every row is `candidates + 1` then.
+        """
+        ts_query = sqlalchemy.func.websearch_to_tsquery(TASK_SEARCH_CONFIG, query)
+        match = Task.search_vector.bool_op("@@")(ts_query)
+        if fuzzy:
+            similar = sqlalchemy.literal(query, sqlalchemy.Text).bool_op("<%")(
+                Task.name
+            )
+            match = sqlalchemy.or_(match, similar)
+
+        matched = (
+            sqlalchemy.select(Task)
+            .where(match)
+            .order_by(Task.created_at.desc(), Task.uuid.desc())
+            .limit(candidates + 1)
+            .subquery()
+        )
+        matched_task = aliased(Task, matched, name="Task")
+        rank = sqlalchemy.func.ts_rank_cd(matched_task.search_vector, ts_query)
+        if fuzzy:
+            rank = rank + sqlalchemy.func.word_similarity(query, matched_task.name)
+
+        ranked = sqlalchemy.select(
+            matched_task,
+            sqlalchemy.type_coerce(rank, sqlalchemy.Float).label("rank"),
+            sqlalchemy.func.count().over().label("matches"),
+            sqlalchemy.func.row_number()
+            .over(order_by=(matched_task.created_at.desc(), matched_task.uuid.desc()))
+            .label("recency"),
+        ).subquery()
+        ranked_task = aliased(Task, ranked, name="Task")
+        ranked_rank = ranked.c.rank
+
+        stmt = (
+            sqlalchemy.select(ranked_task, ranked_rank, ranked.c.matches)
+            .where(ranked.c.recency <= candidates)
+            .order_by(ranked_rank.desc(), ranked_task.uuid)
+            .limit(limit)
+        )
+        if after is not None:
+            after_rank, after_uuid = after
+            stmt = stmt.where(
+                sqlalchemy.or_(
+                    ranked_rank < after_rank,
+                    sqlalchemy.and_(
+                        ranked_rank == after_rank, ranked_task.uuid > after_uuid
+                    ),
+                )
+            )
+        query_result = await self.async_session.execute(statement=stmt)
 
-    async def read_task_by_uuid(self, uuid: uuid.UUID) -> Task:
-        stmt = sqlalchemy.select(Task).where(Task.uuid == uuid)
+        return query_result.all()
+
+    async def stream_tasks(
+        self, batch_size: int = 1000
+    ) -> typing.AsyncIterator[typing.Sequence[Task]]:
+        """
+        Yield every task in batches of `batch_size` from a server-side cursor, so memory stays
+        bounded by one batch no matter how large the table is.
+        """
+        stmt = (
+            sqlalchemy.select(Task)
+            .order_by(Task.created_at, Task.uuid)
+            .execution_options(yield_per=batch_size)
+        )
+        query = await self.async_session.stream(statement=stmt)
+
+        async for tasks in query.scalars().partitions():
+            yield tasks
+
+    async def read_task_status_counts(self) -> dict[TaskStatus, int]:
+        """
+        Number of tasks per status, summed over the `task_status_count` shards: a fixed
+        handful of rows no matter how many tasks there are.
+        """
+        query = await self.async_session.execute(statement=READ_TASK_STATUS_COUNTS)
+
+        counts = dict.fromkeys(TaskStatus, 0)
+        counts.update({status: int(count) for status, count in query.all()})
+        return counts
+
+    async def read_task_throughput(
+        self,
+        bucket: TaskAnalyticsBucket,
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> typing.Sequence[sqlalchemy.Row]:
+        """
+        Throughput per UTC `bucket` from the hourly rollup, for the hours in `[start, end)`;
+        buckets without activity have no row.
+        """
+        hourly = TaskThroughputHourly
+        # Inlined rather than bound, so `GROUP BY` sees the same expression as the select list.
+        bucket_start = sqlalchemy.func.date_trunc(
+            sqlalchemy.literal_column(f"'{bucket.value}'"),
+            hourly.bucket_start,
+            sqlalchemy.literal_column("'UTC'"),
+            type_=sqlalchemy.DateTime(timezone=True),
+        ).label("bucket_start")
+        stmt = (
+            sqlalchemy.select(
+                bucket_start,
+                *(
+                    sqlalchemy.cast(
+                        sqlalchemy_functions.sum(getattr(hourly, name)),
+                        getattr(hourly, name).type,
+                    ).label(name)
+                    for name in ("created", "completed", "in_work_exits")
+                ),
+                sqlalchemy_functions.sum(hourly.in_work_seconds).label(
+                    "in_work_seconds"
+                ),
+            )
+            .where(hourly.bucket_start >= start, hourly.bucket_start < end)
+            .group_by(bucket_start)
+            .order_by(bucket_start)
+        )
         query = await self.async_session.execute(statement=stmt)
-        task = query.scalar()
 
-        if not task:
+        return query.all()
+
+    async def roll_up_task_throughput(self, batch_size: int = 10000) -> int:
+        """
+        Fold up to `batch_size` throughput deltas into their hourly buckets in one statement
+        and return how many were folded.
+
+        Deltas already locked by another worker's rollup are skipped instead of waited for,
+        so every worker can run the job without folding anything twice.
+        """
+        delta = TaskThroughputDelta.__table__
+        hourly = TaskThroughputHourly.__table__
+        columns = ("created", "completed", "in_work_exits", "in_work_seconds")
+
+        batch = (
+            sqlalchemy.select(delta.c.id)
+            .order_by(delta.c.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+        )
+        folded = (
+            sqlalchemy.delete(delta)
+            .where(delta.c.id.in_(sqlalchemy.select(batch.c.id)))
+            .returning(delta.c.bucket_start, *(delta.c[name] for name in columns))
+            .cte("folded")
+        )
+        upsert = postgresql.insert(hourly).from_select(
+            ["bucket_start", *columns],
+            sqlalchemy.select(
+                folded.c.bucket_start,
+                *(sqlalchemy_functions.sum(folded.c[name]) for name in columns),
+            )
+            .group_by(folded.c.bucket_start)
+            .order_by(folded.c.bucket_start),
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[hourly.c.bucket_start],
+            set_={name: hourly.c[name] + upsert.excluded[name] for name in columns},
+        )
+        stmt = (
+            sqlalchemy.select(sqlalchemy_functions.count())
+            .select_from(folded)
+            .add_cte(upsert.cte("upserted"))
+        )
+        folded_count = await self.async_session.scalar(statement=stmt)
+        await self.async_session.commit()
+
+        return folded_count
+
+    async def read_task_by_uuid(self, uuid: uuid.UUID) -> TaskRow:
+        query = await self.async_session.execute(
+            statement=READ_TASK_BY_UUID, params={"task_uuid": uuid}
+        )
+        tasks = self._task_rows(query)
+
+        if not tasks:
             raise EntityDoesNotExist(f"Task with uuid - {uuid} does not exists")
 
-        return task
+        return tasks[0]
+
+    async def read_task_payload_by_uuid(
+        self, uuid: uuid.UUID, if_none_match: typing.Collection[str] = ()
+    ) -> TaskPayload:
+        """
+        ETag and serialized `TaskResponse` of the task, read through `task_cache`; the database
+        is only queried on a miss, and the write paths below invalidate the entry.
+
+        On a miss whose ETag is already in `if_none_match` the body is neither serialized nor
+        cached, since the client is only going to get a `304`.
+
+        While `db_listener` is disconnected the writes of other workers cannot evict their
+        entries, so the cache is bypassed until it reconnects and clears it. A miss read from a
+        replica that lags behind an eviction can cache the older row for `TASK_CACHE_TTL`.
+        """
+        use_cache = db_listener.is_connected
+        payload = task_cache.get(uuid) if use_cache else None
+        if payload is not None:
+            return payload
+
+        epoch = task_cache.epoch
+        task = await self.read_task_by_uuid(uuid=uuid)
+        etag = format_task_etag(task["uuid"], task["created_at"], task["updated_at"])
+        if etag in if_none_match:
+            return TaskPayload(etag=etag, body=None)
+
+        body = TaskResponse.model_validate(task).model_dump_json(by_alias=True)
+        payload = TaskPayload(etag=etag, body=body.encode())
+        if use_cache:
+            task_cache.set(uuid, payload, epoch=epoch)
+
+        return payload
 
     async def update_task_by_uuid(
-        self, uuid: uuid.UUID, task_update: TaskUpdate
+        self,
+        uuid: uuid.UUID,
+        task_update: TaskUpdate,
+        expected_versions: TaskVersions | None = None,
     ) -> Task:
-        select_stmt = sqlalchemy.select(Task).where(Task.uuid == uuid)
-        query = await self.async_session.execute(statement=select_stmt)
-        update_task = query.scalar()
-        if not update_task:
-            raise EntityDoesNotExist(f"Task with uuid - {uuid} does not exists")
-
+        """
+        Update the task in one `UPDATE ... RETURNING`; with `expected_versions` the update only
+        applies while the task's last write time is one of them (`If-Match`).
+        """
         update_data = task_update.model_dump(exclude_unset=True)
         update_data["updated_at"] = sqlalchemy_functions.now()
+        if update_data.get("status", TaskStatus.WORK) != TaskStatus.WORK:
+            # the task is no longer in work, so no one holds it anymore
+            update_data.update(owner=None, lease_expires_at=None)
+        if "due_at" in update_data:
+            # a new due date is not overdue until the scheduler sees it pass
+            update_data["overdue"] = False
 
         update_stmt = (
             sqlalchemy.update(Task)
-            .where(Task.uuid == update_task.uuid)
+            .where(self._match_task_version(uuid, expected_versions))
             .values(**update_data)
+            .returning(Task, notify_task_cache_invalidation(Task.uuid))
+            .execution_options(synchronize_session=False)
         )
+        query = await self.async_session.scalars(statement=update_stmt)
+        update_task = query.one_or_none()
+        if not update_task:
+            await self._raise_for_missed_write(uuid, expected_versions)
 
-        await self.async_session.execute(statement=update_stmt)
         await self.async_session.commit()
-        await self.async_session.refresh(instance=update_task)
+        task_cache.invalidate(uuid)
 
         return update_task
 
-    async def delete_task_by_uuid(self, uuid: uuid.UUID):
-        select_stmt = sqlalchemy.select(Task).where(Task.uuid == uuid)
-        query = await self.async_session.execute(statement=select_stmt)
-        deleted_task = query.scalar()
+    async def claim_tasks(
+        self, limit: int, owner: str | None, lease: datetime.timedelta
+    ) -> list[TaskRow]:
+        """
+        Move up to `limit` `CREATED` tasks to `WORK` in queue order, leased to `owner` for
+        `lease`, and return them, in that order, in one `UPDATE`. Pending tasks locked by a
+        concurrent claim are skipped rather than waited on, so consumers never block each
+        other or get the same task.
+        """
+        query = await self.async_session.execute(
+            CLAIM_PENDING_TASKS, {"limit": limit, "lease_owner": owner, "lease": lease}
+        )
+        # `zip` stops at the last task column and leaves out the `pg_notify` one
+        tasks = [dict(zip(CLAIMED_TASK_KEYS, row)) for row in query.all()]
+        await self.async_session.commit()
+        task_cache.invalidate(*(task["uuid"] for task in tasks))
 
-        if not deleted_task:
-            raise EntityDoesNotExist(f"Task with uuid - {uuid} does not exists")
+        return sorted(tasks, key=task_queue_key)
+
+    async def extend_task_leases(
+        self,
+        uuids: typing.Sequence[uuid.UUID],
+        owner: str | None,
+        lease: datetime.timedelta,
+    ) -> list[tuple[uuid.UUID, datetime.datetime]]:
+        """
+        Push the lease of every task in `uuids` still leased to `owner` out to `lease` from
+        now, in one statement, and return the tasks extended with their new expiry. A task
+        missing from the result was requeued, finished or claimed by someone else.
+
+        Nothing the API shows changes, so cached responses and ETags stay valid.
+        """
+        query = await self.async_session.execute(
+            EXTEND_TASK_LEASES,
+            {"uuids": list(uuids), "lease_owner": owner, "lease": lease},
+        )
+        extended = [tuple(row) for row in query.all()]
+        await self.async_session.commit()
 
-        stmt = sqlalchemy.delete(table=Task).where(Task.uuid == deleted_task.uuid)
+        return extended
 
-        await self.async_session.execute(statement=stmt)
+    async def requeue_expired_tasks(self, batch_size: int = 1000) -> int:
+        """
+        Put up to `batch_size` tasks whose lease expired back to `CREATED` in one statement
+        and return how many. Tasks another worker's reaper or a heartbeat holds right now are
+        skipped instead of waited for.
+        """
+        query = await self.async_session.execute(
+            REQUEUE_EXPIRED_TASKS, {"limit": batch_size}
+        )
+        requeued = query.scalars().all()
         await self.async_session.commit()
+        task_cache.invalidate(*requeued)
+
+        return len(requeued)
+
+    async def read_pending_due_times(
+        self, until: datetime.datetime, limit: int
+    ) -> list[tuple[uuid.UUID, datetime.datetime]]:
+        """
+        `(uuid, due_at)` of up to `limit` tasks due by `until` and not flagged overdue yet,
+        earliest first; finished tasks are never flagged.
+        """
+        query = await self.async_session.execute(
+            PENDING_DUE_TIMES, {"until": until, "limit": limit}
+        )
+        return [tuple(row) for row in query.all()]
+
+    async def flag_overdue_tasks(
+        self, uuids: typing.Sequence[uuid.UUID], now: datetime.datetime
+    ) -> list[uuid.UUID]:
+        """
+        Flag the tasks in `uuids` that are due by `now` as overdue in one statement and
+        return them. Tasks already flagged, finished or given a later due date meanwhile
+        are left alone, so every worker may flag the same batch.
+        """
+        query = await self.async_session.execute(
+            FLAG_OVERDUE_TASKS, {"uuids": list(uuids), "now": now}
+        )
+        flagged = query.scalars().all()
+        await self.async_session.commit()
+        task_cache.invalidate(*flagged)
+
+        return flagged
+
+    async def delete_task_by_uuid(
+        self,
+        uuid: uuid.UUID,
+        expected_versions: TaskVersions | None = None,
+    ):
+        stmt = (
+            sqlalchemy.delete(table=Task)
+            .where(self._match_task_version(uuid, expected_versions))
+            .returning(Task.uuid, notify_task_cache_invalidation(Task.uuid))
+            .execution_options(synchronize_session=False)
+        )
+        query = await self.async_session.execute(statement=stmt)
+        deleted_uuid = query.scalar()
+
+        if not deleted_uuid:
+            await self._raise_for_missed_write(uuid, expected_versions)
+
+        await self.async_session.commit()
+        task_cache.invalidate(uuid)
 
         return f"Task with uuid '{uuid}' is successfully deleted"
+
+    @staticmethod
+    def _task_rows(query: sqlalchemy.CursorResult) -> list[TaskRow]:
+        """
+        Rows as plain dicts, which pydantic validates several times faster than `Row` or
+        `RowMapping` objects.
+        """
+        keys = tuple(query.keys())
+        return [dict(zip(keys, row)) for row in query.all()]
+
+    @staticmethod
+    def _filter_tasks(filters: TaskFilter) -> list[sqlalchemy.ColumnElement[bool]]:
+        """
+        Translate `filters` into `WHERE` clauses, each backed by an index: `status` and
+        `created_at` by the keyset indexes, `updated_at` by `ix_task_updated_at` and the
+        name prefix, as a left-anchored `LIKE`, by the `varchar_pattern_ops` index.
+        """
+        clauses = []
+        if filters.status:
+            clauses.append(TASK_TABLE.c.status.in_(filters.status))
+        if filters.created_after is not None:
+            clauses.append(TASK_TABLE.c.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            clauses.append(TASK_TABLE.c.created_at < filters.created_before)
+        if filters.updated_after is not None:
+            clauses.append(TASK_TABLE.c.updated_at >= filters.updated_after)
+        if filters.updated_before is not None:
+            clauses.append(TASK_TABLE.c.updated_at < filters.updated_before)
+        if filters.name_prefix is not None:
+            clauses.append(
+                TASK_TABLE.c.name.startswith(filters.name_prefix, autoescape=True)
+            )
+        return clauses
+
+    @staticmethod
+    def _match_task_version(
+        uuid: uuid.UUID,
+        expected_versions: TaskVersions | None,
+    ) -> sqlalchemy.ColumnElement[bool]:
+        criteria = Task.uuid == uuid
+        if expected_versions is not None and expected_versions != ANY_TASK_VERSION:
+            version = sqlalchemy_functions.coalesce(Task.updated_at, Task.created_at)
+            criteria = sqlalchemy.and_(criteria, version.in_(expected_versions))
+        return criteria
+
+    async def _raise_for_missed_write(
+        self,
+        uuid: uuid.UUID,
+        expected_versions: TaskVersions | None,
+    ) -> typing.NoReturn:
+        """
+        A conditional write that touched no row only needs a second look to tell a stale
+        `If-Match` apart from a missing task; unconditional writes never pay for it. A
+        missing task fails an `If-Match: *` as a precondition, not as a 404.
+        """
+        if expected_versions == ANY_TASK_VERSION:
+            raise EntityVersionMismatch(
+                f"Task with uuid - {uuid} does not exist, but If-Match: * requires it"
+            )
+        if expected_versions is not None:
+            stmt = sqlalchemy.select(Task.uuid).where(Task.uuid == uuid)
+            if await self.async_session.scalar(statement=stmt):
+                raise EntityVersionMismatch(
+                    f"Task with uuid - {uuid} was modified, its version does not match"
+                )
+        raise EntityDoesNotExist(f"Task with uuid - {uuid} does not exists")
@@ -1,12 +1,23 @@
 # pylint: disable=no-member,unexpected-keyword-arg
+import asyncio
+import itertools
+
+import loguru
 import pydantic
+from prometheus_client import REGISTRY
+from sqlalchemy import event, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine as SQLAlchemyAsyncEngine,
     create_async_engine as create_sqlalchemy_async_engine,
 )
-from sqlalchemy.pool import Pool as SQLAlchemyPool, QueuePool as SQLAlchemyQueuePool
+from sqlalchemy.pool import Pool as SQLAlchemyPool
 
 from app.config.manager import settings
+from app.repository.pool import InstrumentedQueuePool, PoolStatsCollector
+from app.repository.statements import statement_cache_stats
+from app.utils.periodic import PeriodicTask
 
 
 class AsyncDatabase:
@@ -17,15 +28,27 @@ class AsyncDatabase:
             f"{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/"
             f"{settings.POSTGRES_DB}",
         )
-        self.async_engine: SQLAlchemyAsyncEngine = create_sqlalchemy_async_engine(
-            url=self.set_async_db_url,
-            echo=settings.IS_DB_ECHO_LOG,
-            pool_size=settings.DB_POOL_SIZE,
-            max_overflow=settings.DB_POOL_OVERFLOW,
-            poolclass=SQLAlchemyQueuePool,
+        self.async_engine: SQLAlchemyAsyncEngine = self.create_engine(
+            url=self.set_async_db_url, name="primary"
         )
 
-        self.pool: SQLAlchemyPool = self.async_engine.pool
+        self.replica_engines: list[SQLAlchemyAsyncEngine] = []
+        self.healthy_replica_engines: list[SQLAlchemyAsyncEngine] = []
+        self._replica_cycle = itertools.count()
+        for replica_uri in settings.POSTGRES_REPLICA_URIS:
+            self.add_replica(uri=replica_uri)
+
+        self.extensions: frozenset[str] = frozenset()
+
+        self.replica_health_check: PeriodicTask = PeriodicTask(
+            name="replica-health-check",
+            interval=settings.DB_REPLICA_HEALTH_CHECK_INTERVAL,
+            callback=self.check_replicas,
+        )
+
+    @property
+    def pool(self) -> SQLAlchemyPool:
+        return self.async_engine.pool
 
     @property
     def set_async_db_url(self) -> str | pydantic.PostgresDsn:
@@ -40,5 +63,139 @@ class AsyncDatabase:
             else self.postgres_uri
         )
 
+    @property
+    def read_engine(self) -> SQLAlchemyAsyncEngine:
+        """
+        The engine to serve a read from: the healthy replicas in round-robin order, or the
+        primary when no replica is configured or none is currently healthy.
+        """
+        healthy_replica_engines = self.healthy_replica_engines
+        if not healthy_replica_engines:
+            return self.async_engine
+        return healthy_replica_engines[
+            next(self._replica_cycle) % len(healthy_replica_engines)
+        ]
+
+    @property
+    def engines(self) -> list[SQLAlchemyAsyncEngine]:
+        return [self.async_engine, *self.replica_engines]
+
+    @staticmethod
+    def create_engine(
+        url: str | pydantic.PostgresDsn, name: str
+    ) -> SQLAlchemyAsyncEngine:
+        """
+        Create an engine over an `InstrumentedQueuePool`; `name` labels its pool and
+        statement-cache metrics.
+
+        Every connection keeps up to `DB_PREPARED_STATEMENT_CACHE_SIZE` statements
+        prepared (0 prepares each one anew, as poolers in transaction mode need), and the
+        engine caches the SQL compiled for up to `DB_COMPILED_CACHE_SIZE` statement shapes.
+        """
+        engine = create_sqlalchemy_async_engine(
+            url=url,
+            echo=settings.IS_DB_ECHO_LOG,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_logging_name=name,
+            poolclass=InstrumentedQueuePool,
+            query_cache_size=settings.DB_COMPILED_CACHE_SIZE,
+            connect_args={
+                "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+            },
+        )
+        statement_cache_stats.instrument(engine=engine, name=name)
+        return engine
+
+    def add_replica(self, uri: str) -> SQLAlchemyAsyncEngine:
+        """
+        Register a read replica with its own connection pool. A replica starts out healthy
+        and is taken out of rotation by the first disconnect or failed health check.
+        """
+        replica_engine = self.create_engine(
+            url=uri.replace("postgresql://", "postgresql+asyncpg://"),
+            name=f"replica-{len(self.replica_engines)}",
+        )
+
+        @event.listens_for(replica_engine.sync_engine, "handle_error")
+        def _on_replica_error(context: ExceptionContext) -> None:
+            if context.is_disconnect:
+                self.mark_replica_unhealthy(replica_engine=replica_engine)
+
+        self.replica_engines.append(replica_engine)
+        self.healthy_replica_engines = self.healthy_replica_engines + [replica_engine]
+        return replica_engine
+
+    def mark_replica_unhealthy(self, replica_engine: SQLAlchemyAsyncEngine) -> None:
+        if replica_engine in self.healthy_replica_engines:
+            loguru.logger.warning(
+                f"Database Replica {replica_engine.url!r} --- Out of rotation!"
+            )
+            self.healthy_replica_engines = [
+                engine
+                for engine in self.healthy_replica_engines
+                if engine is not replica_engine
+            ]
+
+    async def check_replicas(self) -> None:
+        """
+        Ping every replica and rebuild the rotation from the ones that answered in time.
+        """
+        results = await asyncio.gather(
+            *(self._ping(engine) for engine in self.replica_engines)
+        )
+        healthy_replica_engines = [
+            engine
+            for engine, is_alive in zip(self.replica_engines, results)
+            if is_alive
+        ]
+        for engine in healthy_replica_engines:
+            if engine not in self.healthy_replica_engines:
+                loguru.logger.info(
+                    f"Database Replica {engine.url!r} --- Back in rotation!"
+                )
+        for engine in self.healthy_replica_engines:
+            if engine not in healthy_replica_engines:
+                loguru.logger.warning(
+                    f"Database Replica {engine.url!r} --- Out of rotation!"
+                )
+        self.healthy_replica_engines = healthy_replica_engines
+
+    async def load_extensions(self) -> frozenset[str]:
+        """
+        Remember which Postgres extensions are installed, for features that need optional
+        ones (e.g. `pg_trgm` for fuzzy search).
+        """
+        async with self.async_engine.connect() as conn:
+            query = await conn.execute(text("SELECT extname FROM pg_extension"))
+            self.extensions = frozenset(query.scalars().all())
+        return self.extensions
+
+    async def dispose(self) -> None:
+        await self.replica_health_check.stop()
+        for replica_engine in self.replica_engines:
+            await replica_engine.dispose()
+        await self.async_engine.dispose()
+
+    @staticmethod
+    async def _ping(engine: SQLAlchemyAsyncEngine) -> bool:
+        async def select_one() -> None:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.wait_for(
+                select_one(), timeout=settings.DB_REPLICA_HEALTH_CHECK_TIMEOUT
+            )
+        except (OSError, SQLAlchemyError, asyncio.TimeoutError):
+            return False
+        return True
+
 
 async_db: AsyncDatabase = AsyncDatabase()
+
+REGISTRY.register(
+    PoolStatsCollector(pools=lambda: [engine.pool for engine in async_db.engines])
+)
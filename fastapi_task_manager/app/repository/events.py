@@ -1,43 +1,33 @@
 import fastapi
 import loguru
-from sqlalchemy import event
-from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_connection
-from sqlalchemy.ext.asyncio import AsyncConnection
-from sqlalchemy.pool.base import _ConnectionRecord
-
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.manager import settings
+from app.repository.analytics import task_throughput_rollup
+from app.repository.cache import (
+    TASK_CACHE_CHANNEL,
+    evict_task_cache_entries,
+    task_cache,
+)
+from app.repository.changes import TASK_CHANGES_CHANNEL, task_change_feed
 from app.repository.database import async_db
-from app.repository.table import Base
-
+from app.repository.leases import task_lease_reaper
+from app.repository.listener import db_listener
+from app.repository.migrations.runner import migrate_db_schema
+from app.repository.outbox import (
+    TASK_OUTBOX_CHANNEL,
+    task_outbox_purger,
+    task_webhook_dispatcher,
+)
+from app.repository.scheduler import task_due_scheduler
 
-@event.listens_for(target=async_db.async_engine.sync_engine, identifier="connect")
-def inspect_db_server_on_connection(
-    db_api_connection: AsyncAdapt_asyncpg_connection,
-    connection_record: _ConnectionRecord,
-) -> None:
-    loguru.logger.info(
-        f"New DB API Connection --- Conecting  . . .\n {db_api_connection}"
-    )
-    loguru.logger.info(f"Connection Record ---\n {connection_record}")
 
+async def initialize_db_schema(engine: AsyncEngine) -> None:
+    loguru.logger.info("Database Schema Migration --- Checking . . .")
 
-@event.listens_for(target=async_db.async_engine.sync_engine, identifier="close")
-def inspect_db_server_on_close(
-    db_api_connection: AsyncAdapt_asyncpg_connection,
-    connection_record: _ConnectionRecord,
-) -> None:
-    loguru.logger.info(
-        f"Closing DB API Connection --- Closing . . .\n {db_api_connection}"
-    )
-    loguru.logger.info(f"Closed Connection Record ---\n {connection_record}")
-
+    version = await migrate_db_schema(engine=engine)
 
-async def initialize_tb_tables(connection: AsyncConnection) -> None:
-    loguru.logger.info("Database Table Creation --- Initializing . . .")
-
-    await connection.run_sync(Base.metadata.drop_all)
-    await connection.run_sync(Base.metadata.create_all)
-
-    loguru.logger.info("Database Table Creation --- Successfully Initialized!")
+    loguru.logger.info(f"Database Schema Migration --- At Version {version}!")
 
 
 async def initialize_db_connection(backend_app: fastapi.FastAPI) -> None:
@@ -45,15 +35,58 @@ async def initialize_db_connection(backend_app: fastapi.FastAPI) -> None:
 
     backend_app.state.db = async_db
 
-    async with backend_app.state.db.async_engine.begin() as conn:
-        await initialize_tb_tables(connection=conn)
+    await initialize_db_schema(engine=backend_app.state.db.async_engine)
+    await backend_app.state.db.load_extensions()
 
     loguru.logger.info("Database Connection --- Successfully Established!")
 
+    await initialize_db_listener()
+
+    if backend_app.state.db.replica_engines:
+        backend_app.state.db.replica_health_check.start()
+
+    task_throughput_rollup.start()
+    task_lease_reaper.start()
+    task_due_scheduler.start()
+    task_change_feed.periodic.start()
+    task_outbox_purger.start()
+    if settings.TASK_WEBHOOK_URL:
+        task_webhook_dispatcher.start()
+
+
+async def initialize_db_listener() -> None:
+    loguru.logger.info("Database Listener --- Listening . . .")
+
+    db_listener.subscribe(channel=TASK_CACHE_CHANNEL, callback=evict_task_cache_entries)
+    db_listener.subscribe(
+        channel=TASK_OUTBOX_CHANNEL, callback=task_webhook_dispatcher.wake
+    )
+    db_listener.subscribe(
+        channel=TASK_CHANGES_CHANNEL, callback=task_change_feed.publish
+    )
+    db_listener.subscribe(
+        channel=TASK_CHANGES_CHANNEL, callback=task_due_scheduler.observe
+    )
+    db_listener.on_reset(callback=task_cache.clear)
+    db_listener.on_reset(callback=task_change_feed.reset)
+    db_listener.on_reset(callback=task_due_scheduler.periodic.wake)
+    await db_listener.start()
+
+    loguru.logger.info("Database Listener --- Successfully Listening!")
+
 
 async def dispose_db_connection(backend_app: fastapi.FastAPI) -> None:
     loguru.logger.info("Database Connection --- Disposing . . .")
 
-    await backend_app.state.db.async_engine.dispose()
+    await task_throughput_rollup.stop()
+    await task_lease_reaper.stop()
+    await task_due_scheduler.stop()
+    await task_webhook_dispatcher.stop()
+    await task_outbox_purger.stop()
+    await task_change_feed.periodic.stop()
+    task_change_feed.close()
+    await db_listener.stop()
+
+    await backend_app.state.db.dispose()
 
     loguru.logger.info("Database Connection --- Successfully Disposed!")
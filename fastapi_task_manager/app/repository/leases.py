@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.config.manager import settings
+from app.repository.crud.task import TaskCRUDRepository
+from app.repository.database import async_db
+from app.utils.periodic import PeriodicTask, run_in_batches
+
+
+async def requeue_expired_tasks() -> int:
+    """Put every task whose lease expired back to `CREATED` and return how many."""
+    async with SQLAlchemyAsyncSession(bind=async_db.async_engine) as async_session:
+        task_repo = TaskCRUDRepository(async_session=async_session)
+        return await run_in_batches(
+            lambda batch_size: task_repo.requeue_expired_tasks(batch_size=batch_size),
+            batch_size=settings.TASK_LEASE_REAPER_BATCH_SIZE,
+        )
+
+
+task_lease_reaper: PeriodicTask = PeriodicTask(
+    name="task-lease-reaper",
+    interval=settings.TASK_LEASE_REAPER_INTERVAL,
+    callback=requeue_expired_tasks,
+)
@@ -0,0 +1,121 @@
+import asyncio
+import typing
+
+import asyncpg
+import loguru
+
+from app.repository.database import async_db
+
+NotificationCallback = typing.Callable[[str], None]
+ResetCallback = typing.Callable[[], None]
+
+
+class DatabaseListener:
+    """
+    One dedicated asyncpg connection per worker that `LISTEN`s on Postgres channels and fans
+    every notification out to the callbacks subscribed to its channel.
+
+    Notifications sent while the connection is down are lost, so the reset callbacks run as
+    soon as the connection drops and again once it is re-established; a supervisor task pings
+    the connection and reconnects when it is lost or the ping fails.
+    """
+
+    def __init__(self, dsn: str, health_check_interval: float = 10.0):
+        self.dsn = dsn
+        self.health_check_interval = health_check_interval
+        self.connection: asyncpg.Connection | None = None
+        self._callbacks: dict[str, list[NotificationCallback]] = {}
+        self._reset_callbacks: list[ResetCallback] = []
+        self._supervisor: asyncio.Task | None = None
+        self._lost = asyncio.Event()
+
+    def subscribe(self, channel: str, callback: NotificationCallback) -> None:
+        callbacks = self._callbacks.setdefault(channel, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def on_reset(self, callback: ResetCallback) -> None:
+        if callback not in self._reset_callbacks:
+            self._reset_callbacks.append(callback)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.connection is not None and not self.connection.is_closed()
+
+    async def start(self) -> None:
+        self._lost = asyncio.Event()
+        await self._connect()
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(dsn=self.dsn)
+        connection.add_termination_listener(self._on_termination)
+        for channel in self._callbacks:
+            await connection.add_listener(channel, self._dispatch)
+        self.connection = connection
+
+    def _dispatch(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        for callback in self._callbacks.get(channel, ()):
+            callback(payload)
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        self._lost.set()
+        self._reset()
+
+    def _reset(self) -> None:
+        for callback in self._reset_callbacks:
+            callback()
+
+    async def _supervise(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._lost.wait(), timeout=self.health_check_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._lost.clear()
+            try:
+                if not self.is_connected:
+                    raise ConnectionError("Listener connection is closed")
+                await self.connection.execute(
+                    "SELECT 1", timeout=self.health_check_interval
+                )
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                asyncpg.InterfaceError,
+                asyncpg.PostgresError,
+            ) as e:
+                loguru.logger.warning(
+                    f"Database Listener --- Reconnecting after: {e!r}"
+                )
+                if self.connection is not None:
+                    self.connection.terminate()
+                    self.connection = None
+                try:
+                    await self._connect()
+                except (
+                    OSError,
+                    asyncpg.InterfaceError,
+                    asyncpg.PostgresError,
+                ) as reconnect_error:
+                    loguru.logger.error(
+                        f"Database Listener --- Reconnect failed: {reconnect_error!r}"
+                    )
+                    continue
+                self._reset()
+
+
+db_listener: DatabaseListener = DatabaseListener(dsn=str(async_db.postgres_uri))
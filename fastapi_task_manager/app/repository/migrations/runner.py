@@ -0,0 +1,103 @@
+import importlib
+import pkgutil
+import typing
+
+import loguru
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection as SQLAlchemyAsyncConnection,
+    AsyncEngine as SQLAlchemyAsyncEngine,
+)
+
+from app.repository.migrations import versions
+
+SCHEMA_VERSION_TABLE: str = "schema_version"
+# Any constant shared by every worker will do; the value spells "task" in ASCII.
+MIGRATION_LOCK_KEY: int = 0x7461736B
+
+
+class Migration(typing.NamedTuple):
+    version: int
+    name: str
+    upgrade: typing.Callable[[SQLAlchemyAsyncConnection], typing.Awaitable[None]]
+
+
+def load_migrations() -> list[Migration]:
+    """
+    Collect the `vNNNN_<name>` modules of `app.repository.migrations.versions` in
+    version order.
+    """
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        prefix, _, name = module_info.name.partition("_")
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(
+            Migration(version=int(prefix[1:]), name=name, upgrade=module.upgrade)
+        )
+    return sorted(migrations)
+
+
+MIGRATIONS: list[Migration] = load_migrations()
+
+
+async def read_schema_version(connection: SQLAlchemyAsyncConnection) -> int:
+    try:
+        result = await connection.execute(
+            text(f"SELECT max(version) FROM {SCHEMA_VERSION_TABLE}")
+        )
+    except ProgrammingError:
+        return 0
+    return result.scalar() or 0
+
+
+async def migrate_db_schema(
+    engine: SQLAlchemyAsyncEngine, migrations: list[Migration] | None = None
+) -> int:
+    """
+    Bring the schema up to the latest migration and return the resulting version.
+
+    An up-to-date database costs a single `SELECT`, so workers starting together do not
+    queue on the lock. Otherwise the pending migrations run in one transaction under a
+    transaction-level advisory lock: the first worker applies them, the others wait,
+    re-read the version and find nothing left to do.
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    head = migrations[-1].version if migrations else 0
+
+    async with engine.connect() as conn:
+        current = await read_schema_version(connection=conn)
+    if current >= head:
+        return current
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        )
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+                "version INTEGER PRIMARY KEY, "
+                "name VARCHAR NOT NULL, "
+                "applied_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL)"
+            )
+        )
+        current = await read_schema_version(connection=conn)
+
+        for migration in migrations:
+            if migration.version <= current:
+                continue
+            loguru.logger.info(
+                f"Database Migration {migration.version:04d}_{migration.name} --- Applying . . ."
+            )
+            await migration.upgrade(conn)
+            await conn.execute(
+                text(
+                    f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, name) "
+                    "VALUES (:version, :name)"
+                ),
+                {"version": migration.version, "name": migration.name},
+            )
+            current = migration.version
+
+    return current
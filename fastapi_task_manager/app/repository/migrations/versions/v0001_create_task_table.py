@@ -0,0 +1,47 @@
+"""
+Create the `task` table with its status enum and keyset-pagination index.
+
+Written with `IF NOT EXISTS` so databases created by the former `create_all` startup are
+adopted as-is instead of failing on the first migration.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(
+        text(
+            """
+            DO $$
+            BEGIN
+                IF to_regtype('taskstatus') IS NULL THEN
+                    CREATE TYPE taskstatus AS ENUM ('CREATED', 'WORK', 'DONE');
+                END IF;
+            END
+            $$
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS task (
+                uuid UUID NOT NULL,
+                name VARCHAR(255) NOT NULL,
+                description VARCHAR,
+                status taskstatus NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+                updated_at TIMESTAMP WITH TIME ZONE,
+                PRIMARY KEY (uuid),
+                UNIQUE (uuid)
+            )
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_task_created_at_uuid "
+            "ON task (created_at, uuid)"
+        )
+    )
@@ -0,0 +1,26 @@
+"""
+Indexes behind the list filters: `(status, created_at, uuid)` keeps the keyset order for
+one status, `updated_at` serves its range filter and `varchar_pattern_ops` lets a name
+prefix `LIKE` use a btree under any collation.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_task_status_created_at_uuid "
+            "ON task (status, created_at, uuid)"
+        )
+    )
+    await connection.execute(
+        text("CREATE INDEX IF NOT EXISTS ix_task_updated_at ON task (updated_at)")
+    )
+    await connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_task_name_pattern "
+            "ON task (name varchar_pattern_ops)"
+        )
+    )
@@ -0,0 +1,51 @@
+"""
+Full-text search over `task.name` and `task.description`.
+
+`search_vector` is a stored generated column, so Postgres keeps it in step with every write
+without a trigger. Names weigh more than descriptions in the ranking. The `simple`
+configuration neither stems nor drops stop words, which treats Russian and English task
+text alike.
+
+Trigram fuzzy matching on `name` needs the `pg_trgm` contrib extension, which is created
+together with its index only where the server ships it.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(
+        text(
+            """
+            ALTER TABLE task ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+            ) STORED
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_task_search_vector "
+            "ON task USING gin (search_vector)"
+        )
+    )
+    await connection.execute(
+        text(
+            """
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'
+                ) THEN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                    CREATE INDEX IF NOT EXISTS ix_task_name_trgm
+                    ON task USING gin (name gin_trgm_ops);
+                END IF;
+            END
+            $$
+            """
+        )
+    )
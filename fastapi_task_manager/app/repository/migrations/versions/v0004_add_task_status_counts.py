@@ -0,0 +1,100 @@
+"""
+Per-status task counts kept in `task_status_count` by statement-level triggers on `task`.
+
+Every insert, status change and delete adds its delta to the counters inside the writing
+transaction, so the counts are exactly as committed as the tasks. Each statement aggregates
+its transition table once, which keeps bulk inserts at one upsert per status.
+
+Counters are spread over `TASK_STATUS_COUNT_SHARDS` rows per status, picked by backend pid:
+concurrent writers of the same status land on different rows instead of queueing on one row
+lock until commit, and a read sums a fixed number of rows however large `task` grows.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+TASK_STATUS_COUNT_SHARDS = 16
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS task_status_count (
+                status taskstatus NOT NULL,
+                shard SMALLINT NOT NULL,
+                count BIGINT NOT NULL,
+                PRIMARY KEY (status, shard)
+            )
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION task_status_count_apply() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            DECLARE
+                counter_shard SMALLINT := pg_backend_pid() % {TASK_STATUS_COUNT_SHARDS};
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    INSERT INTO task_status_count AS c (status, shard, count)
+                    SELECT status, counter_shard, count(*) FROM new_rows
+                    GROUP BY status ORDER BY status
+                    ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+                ELSIF TG_OP = 'DELETE' THEN
+                    INSERT INTO task_status_count AS c (status, shard, count)
+                    SELECT status, counter_shard, -count(*) FROM old_rows
+                    GROUP BY status ORDER BY status
+                    ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+                ELSE
+                    INSERT INTO task_status_count AS c (status, shard, count)
+                    SELECT change.status, counter_shard, sum(change.delta)
+                    FROM old_rows o JOIN new_rows n USING (uuid),
+                    LATERAL (VALUES (n.status, 1), (o.status, -1)) AS change (status, delta)
+                    WHERE o.status <> n.status
+                    GROUP BY change.status ORDER BY change.status
+                    ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+                END IF;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION task_status_count_reset() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                DELETE FROM task_status_count;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+    )
+    # Creating the triggers locks out writers until this migration commits, so the backfill
+    # below counts exactly the rows the triggers have not seen.
+    for trigger in (
+        "CREATE OR REPLACE TRIGGER task_status_count_insert AFTER INSERT ON task "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION task_status_count_apply()",
+        "CREATE OR REPLACE TRIGGER task_status_count_update AFTER UPDATE ON task "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION task_status_count_apply()",
+        "CREATE OR REPLACE TRIGGER task_status_count_delete AFTER DELETE ON task "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION task_status_count_apply()",
+        "CREATE OR REPLACE TRIGGER task_status_count_truncate AFTER TRUNCATE ON task "
+        "FOR EACH STATEMENT EXECUTE FUNCTION task_status_count_reset()",
+    ):
+        await connection.execute(text(trigger))
+    await connection.execute(text("DELETE FROM task_status_count"))
+    await connection.execute(
+        text(
+            "INSERT INTO task_status_count (status, shard, count) "
+            "SELECT status, 0, count(*) FROM task GROUP BY status"
+        )
+    )
@@ -0,0 +1,108 @@
+"""
+Hourly task throughput: tasks created, tasks completed and time spent in `WORK`.
+
+Statement-level triggers on `task` append one pre-aggregated row per write statement to
+`task_throughput_delta`; nothing is updated in place on the write path, so concurrent writers
+never wait on a shared bucket row. The rollup job folds those deltas into
+`task_throughput_hourly`, which is all the analytics endpoint reads.
+
+`task.status_changed_at` records when the current status was entered, which is what the time
+spent in `WORK` is measured from when a task leaves it. Rows older than this migration have
+no such time and fall back to their last write.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    # Adding the column without a default and setting it afterwards keeps existing rows
+    # NULL instead of rewriting the whole table.
+    await connection.execute(
+        text("ALTER TABLE task ADD COLUMN IF NOT EXISTS status_changed_at TIMESTAMPTZ")
+    )
+    await connection.execute(
+        text("ALTER TABLE task ALTER COLUMN status_changed_at SET DEFAULT now()")
+    )
+    await connection.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION task_status_changed_at_stamp() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                NEW.status_changed_at := now();
+                RETURN NEW;
+            END
+            $$
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE OR REPLACE TRIGGER task_status_changed_at_stamp "
+            "BEFORE UPDATE OF status ON task FOR EACH ROW "
+            "WHEN (OLD.status IS DISTINCT FROM NEW.status) "
+            "EXECUTE FUNCTION task_status_changed_at_stamp()"
+        )
+    )
+
+    # Deltas carry a serial id on top of the hourly columns so the rollup can take them in
+    # insertion order.
+    counters = """
+        created BIGINT NOT NULL,
+        completed BIGINT NOT NULL,
+        in_work_exits BIGINT NOT NULL,
+        in_work_seconds DOUBLE PRECISION NOT NULL
+    """
+    for table in (
+        "task_throughput_delta (id BIGSERIAL PRIMARY KEY, "
+        f"bucket_start TIMESTAMPTZ NOT NULL, {counters})",
+        f"task_throughput_hourly (bucket_start TIMESTAMPTZ PRIMARY KEY, {counters})",
+    ):
+        await connection.execute(text(f"CREATE TABLE IF NOT EXISTS {table}"))
+    await connection.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION task_throughput_record() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    INSERT INTO task_throughput_delta
+                        (bucket_start, created, completed, in_work_exits, in_work_seconds)
+                    SELECT date_trunc('hour', now(), 'UTC'), count(*),
+                           count(*) FILTER (WHERE status = 'DONE'), 0, 0
+                    FROM new_rows
+                    HAVING count(*) > 0;
+                ELSE
+                    INSERT INTO task_throughput_delta
+                        (bucket_start, created, completed, in_work_exits, in_work_seconds)
+                    SELECT date_trunc('hour', now(), 'UTC'), 0,
+                           count(*) FILTER (WHERE n.status = 'DONE'),
+                           count(*) FILTER (WHERE o.status = 'WORK'),
+                           coalesce(sum(extract(epoch FROM now() - coalesce(
+                               o.status_changed_at, o.updated_at, o.created_at
+                           ))) FILTER (WHERE o.status = 'WORK'), 0)
+                    FROM old_rows o JOIN new_rows n USING (uuid)
+                    WHERE o.status <> n.status
+                    HAVING count(*) > 0;
+                END IF;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE OR REPLACE TRIGGER task_throughput_insert AFTER INSERT ON task "
+            "REFERENCING NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION task_throughput_record()"
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE OR REPLACE TRIGGER task_throughput_update AFTER UPDATE ON task "
+            "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION task_throughput_record()"
+        )
+    )
@@ -0,0 +1,82 @@
+"""
+Transactional outbox of task events for the webhook dispatcher.
+
+Statement-level triggers on `task` append a `task.created` row per inserted task and a
+`task.status_changed` row per task whose status a statement changed, in the writing
+transaction: an event exists exactly when its change committed, and the write path sends
+nothing over the network. A `NOTIFY` on `task_outbox` wakes the dispatchers once the
+transaction commits.
+
+A dispatcher claims the rows that are due (`available_at`) and pushes `available_at` out by
+a lease while it delivers them; delivered rows are deleted, failed ones are rescheduled with
+backoff and keep their last error. Rows nobody will deliver, because they used up their
+attempts or no receiver is configured, are purged by the application after a retention.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS task_outbox (
+                id BIGSERIAL PRIMARY KEY,
+                event TEXT NOT NULL,
+                task_uuid UUID NOT NULL,
+                name VARCHAR(255) NOT NULL,
+                status taskstatus NOT NULL,
+                previous_status taskstatus,
+                occurred_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_task_outbox_available_at_id "
+            "ON task_outbox (available_at, id)"
+        )
+    )
+    await connection.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION task_outbox_record() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    INSERT INTO task_outbox (event, task_uuid, name, status)
+                    SELECT 'task.created', uuid, name, status FROM new_rows;
+                ELSE
+                    INSERT INTO task_outbox (event, task_uuid, name, status, previous_status)
+                    SELECT 'task.status_changed', n.uuid, n.name, n.status, o.status
+                    FROM old_rows o JOIN new_rows n USING (uuid)
+                    WHERE o.status <> n.status;
+                END IF;
+                IF FOUND THEN
+                    PERFORM pg_notify('task_outbox', '');
+                END IF;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE OR REPLACE TRIGGER task_outbox_insert AFTER INSERT ON task "
+            "REFERENCING NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION task_outbox_record()"
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE OR REPLACE TRIGGER task_outbox_update AFTER UPDATE ON task "
+            "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION task_outbox_record()"
+        )
+    )
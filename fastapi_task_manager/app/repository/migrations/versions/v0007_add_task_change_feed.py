@@ -0,0 +1,67 @@
+"""
+Task change notifications for the live change feed.
+
+Statement-level triggers on `task` send one `NOTIFY task_changes` per created, updated or
+deleted task, with the task as JSON and an id from `task_change_id_seq`. Notifications are
+delivered once the transaction commits, to every listening worker in commit order, so all
+workers see the same events in the same order and a client can resume from an event id on
+any of them. Nothing is stored: the feed only keeps what its workers hold in memory.
+
+A notification payload is capped at 8000 bytes, so the description sent is cut to the
+1000 characters the API accepts.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(text("CREATE SEQUENCE IF NOT EXISTS task_change_id_seq"))
+    await connection.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION task_change_notify() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    PERFORM pg_notify('task_changes', json_build_object(
+                        'id', nextval('task_change_id_seq'),
+                        'event', 'task.deleted',
+                        'task', json_build_object('uuid', uuid)
+                    )::text)
+                    FROM old_rows;
+                ELSE
+                    PERFORM pg_notify('task_changes', json_build_object(
+                        'id', nextval('task_change_id_seq'),
+                        'event', CASE TG_OP
+                            WHEN 'INSERT' THEN 'task.created' ELSE 'task.updated'
+                        END,
+                        'task', json_build_object(
+                            'uuid', uuid,
+                            'name', name,
+                            'description', left(description, 1000),
+                            'status', status,
+                            'created_at', created_at,
+                            'updated_at', updated_at
+                        )
+                    )::text)
+                    FROM new_rows;
+                END IF;
+                RETURN NULL;
+            END
+            $$
+            """
+        )
+    )
+    for operation, transition_tables in (
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("UPDATE", "NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+    ):
+        await connection.execute(
+            text(
+                f"CREATE OR REPLACE TRIGGER task_change_{operation.lower()} "
+                f"AFTER {operation} ON task REFERENCING {transition_tables} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION task_change_notify()"
+            )
+        )
@@ -0,0 +1,17 @@
+"""
+Partial index on the tasks waiting to be claimed, in claim order. It holds only `CREATED`
+rows, so it stays as small as the backlog however large the table grows; a claimed task
+leaves it on its next vacuum.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_task_pending_created_at_uuid "
+            "ON task (created_at, uuid) WHERE status = 'CREATED'"
+        )
+    )
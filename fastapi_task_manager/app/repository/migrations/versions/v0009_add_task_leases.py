@@ -0,0 +1,77 @@
+"""
+Leases on claimed tasks: the consumer that claimed a task (`owner`) holds it until
+`lease_expires_at` and extends that with heartbeats; the reaper puts tasks whose lease ran
+out back to `CREATED`. `ix_task_lease_expires_at` only holds leased tasks, so the reaper
+finds the expired ones without scanning the table.
+
+Heartbeats update tasks without changing anything the API shows, so the change feed
+trigger now compares old and new rows and skips those, instead of announcing every lease
+extension as `task.updated`. The task payload moves to `task_change_payload()`, shared by
+the insert and update branches.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    await connection.execute(
+        text(
+            "ALTER TABLE task "
+            "ADD COLUMN IF NOT EXISTS owner VARCHAR(255), "
+            "ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ"
+        )
+    )
+    await connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_task_lease_expires_at "
+            "ON task (lease_expires_at) WHERE lease_expires_at IS NOT NULL"
+        )
+    )
+    for statement in (
+        """
+        CREATE OR REPLACE FUNCTION task_change_payload(event TEXT, t task) RETURNS TEXT
+        LANGUAGE sql AS $$
+            SELECT json_build_object(
+                'id', nextval('task_change_id_seq'),
+                'event', event,
+                'task', json_build_object(
+                    'uuid', t.uuid,
+                    'name', t.name,
+                    'description', left(t.description, 1000),
+                    'status', t.status,
+                    'created_at', t.created_at,
+                    'updated_at', t.updated_at
+                )
+            )::text
+        $$
+        """,
+        """
+        CREATE OR REPLACE FUNCTION task_change_notify() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('task_changes', json_build_object(
+                    'id', nextval('task_change_id_seq'),
+                    'event', 'task.deleted',
+                    'task', json_build_object('uuid', uuid)
+                )::text)
+                FROM old_rows;
+            ELSIF TG_OP = 'INSERT' THEN
+                PERFORM pg_notify('task_changes', task_change_payload('task.created', n))
+                FROM new_rows AS n;
+            ELSE
+                PERFORM pg_notify('task_changes', task_change_payload('task.updated', n))
+                FROM new_rows AS n JOIN old_rows AS o USING (uuid)
+                WHERE (o.name, o.description, o.status, o.updated_at)
+                    IS DISTINCT FROM (n.name, n.description, n.status, n.updated_at);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """,
+        "CREATE OR REPLACE TRIGGER task_change_update "
+        "AFTER UPDATE ON task REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION task_change_notify()",
+    ):
+        await connection.execute(text(statement))
@@ -0,0 +1,51 @@
+"""
+Task priority and due dates.
+
+`priority` (higher first) and `due_at` order the queue: claims and the `priority` list
+order read `ix_task_status_priority_due_at` in `(priority DESC, due_at, created_at, uuid)`
+order within one status. It serves the claim scan the `CREATED` partial index of migration
+0008 did, so that index is dropped rather than kept up to date on every write.
+
+`overdue` is set by the due scheduler once `due_at` passes; `ix_task_due_at_pending` holds
+only the tasks it still has to flag, so loading the next due times does not scan the
+table. The change feed payload gains the three columns; every write of them also sets
+`updated_at`, which the update trigger already compares.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def upgrade(connection: AsyncConnection) -> None:
+    for statement in (
+        "ALTER TABLE task "
+        "ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 0, "
+        "ADD COLUMN IF NOT EXISTS due_at TIMESTAMPTZ, "
+        "ADD COLUMN IF NOT EXISTS overdue BOOLEAN NOT NULL DEFAULT false",
+        "CREATE INDEX IF NOT EXISTS ix_task_status_priority_due_at "
+        "ON task (status, priority DESC, due_at, created_at, uuid)",
+        "CREATE INDEX IF NOT EXISTS ix_task_due_at_pending ON task (due_at) "
+        "WHERE due_at IS NOT NULL AND NOT overdue AND status <> 'DONE'",
+        "DROP INDEX IF EXISTS ix_task_pending_created_at_uuid",
+        """
+        CREATE OR REPLACE FUNCTION task_change_payload(event TEXT, t task) RETURNS TEXT
+        LANGUAGE sql AS $$
+            SELECT json_build_object(
+                'id', nextval('task_change_id_seq'),
+                'event', event,
+                'task', json_build_object(
+                    'uuid', t.uuid,
+                    'name', t.name,
+                    'description', left(t.description, 1000),
+                    'status', t.status,
+                    'priority', t.priority,
+                    'due_at', t.due_at,
+                    'overdue', t.overdue,
+                    'created_at', t.created_at,
+                    'updated_at', t.updated_at
+                )
+            )::text
+        $$
+        """,
+    ):
+        await connection.execute(text(statement))
@@ -0,0 +1,154 @@
+import asyncio
+
+import httpx
+import loguru
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.config.manager import settings
+from app.models.db.task import TaskOutboxEvent
+from app.models.schemas.task import TaskEventPayload
+from app.repository.crud.outbox import TaskOutboxCRUDRepository
+from app.repository.database import async_db
+from app.utils.periodic import PeriodicTask, run_in_batches
+
+TASK_OUTBOX_CHANNEL: str = "task_outbox"
+
+
+class TaskWebhookDispatcher:
+    """
+    Deliver the task outbox to `TASK_WEBHOOK_URL`, one `POST` per event.
+
+    Runs every `TASK_OUTBOX_POLL_INTERVAL` seconds and whenever `wake()` is called, which
+    the listener does on the `NOTIFY` of every committed task change. Each run claims due
+    events in batches and sends at most `TASK_WEBHOOK_CONCURRENCY` of them at once over one
+    keep-alive connection pool; events are delivered at least once, in no guaranteed order.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self.transport = transport
+        self.client: httpx.AsyncClient | None = None
+        self._in_flight: asyncio.Semaphore | None = None
+        self.periodic: PeriodicTask = PeriodicTask(
+            name="task-webhook-dispatch",
+            interval=settings.TASK_OUTBOX_POLL_INTERVAL,
+            callback=self.dispatch,
+        )
+
+    def start(self) -> None:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                transport=self.transport,
+                timeout=settings.TASK_WEBHOOK_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.TASK_WEBHOOK_CONCURRENCY,
+                    max_keepalive_connections=settings.TASK_WEBHOOK_CONCURRENCY,
+                ),
+            )
+            self._in_flight = asyncio.Semaphore(settings.TASK_WEBHOOK_CONCURRENCY)
+        self.periodic.start()
+
+    async def stop(self) -> None:
+        await self.periodic.stop()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def wake(self, payload: str = "") -> None:
+        # pylint: disable=unused-argument
+        self.periodic.wake()
+
+    async def dispatch(self) -> int:
+        """
+        Deliver every due event, batch by batch, and return how many were delivered. Failed
+        events are rescheduled with backoff and tried again by a later run.
+        """
+        batch_size = settings.TASK_OUTBOX_BATCH_SIZE
+        delivered = 0
+        async with SQLAlchemyAsyncSession(bind=async_db.async_engine) as async_session:
+            outbox_repo = TaskOutboxCRUDRepository(async_session=async_session)
+            while True:
+                events = await outbox_repo.claim_events(
+                    batch_size=batch_size,
+                    lease_seconds=settings.TASK_OUTBOX_LEASE_SECONDS,
+                    max_attempts=settings.TASK_OUTBOX_MAX_ATTEMPTS,
+                )
+                results = await asyncio.gather(*(self.deliver(e) for e in events))
+
+                failed = {}
+                for event, error in zip(events, results):
+                    if error is not None:
+                        failed[event.id] = error
+                        self._log_failure(event=event, error=error)
+                await outbox_repo.settle_events(
+                    [event.id for event in events if event.id not in failed],
+                    failed,
+                    backoff_seconds=settings.TASK_OUTBOX_BACKOFF_SECONDS,
+                    backoff_max_seconds=settings.TASK_OUTBOX_BACKOFF_MAX_SECONDS,
+                )
+                delivered += len(events) - len(failed)
+                if len(events) < batch_size:
+                    return delivered
+
+    async def deliver(self, event: TaskOutboxEvent) -> str | None:
+        """Send one event and return why it failed, or `None` once the receiver took it."""
+        payload = TaskEventPayload.model_validate(event)
+        async with self._in_flight:
+            try:
+                response = await self.client.post(
+                    settings.TASK_WEBHOOK_URL,
+                    content=payload.model_dump_json(by_alias=True),
+                    headers={
+                        "Content-Type": "application/json",
+                        "Idempotency-Key": str(event.id),
+                    },
+                )
+            except httpx.HTTPError as e:
+                return repr(e)
+        if response.is_success:
+            return None
+        return f"HTTP {response.status_code}: {response.text[:200]}"
+
+    @staticmethod
+    def _log_failure(event: TaskOutboxEvent, error: str) -> None:
+        if event.attempts >= settings.TASK_OUTBOX_MAX_ATTEMPTS:
+            loguru.logger.error(
+                f"Task Webhook --- Giving Up On Event {event.id} "
+                f"After {event.attempts} Attempts: {error}"
+            )
+        else:
+            loguru.logger.warning(
+                f"Task Webhook --- Event {event.id} Failed "
+                f"(Attempt {event.attempts}): {error}"
+            )
+
+
+async def purge_outbox_events() -> int:
+    """
+    Delete the events nobody is going to deliver once `TASK_OUTBOX_RETENTION_SECONDS` have
+    passed since they were last due and return how many.
+
+    Those are the events that used up `TASK_OUTBOX_MAX_ATTEMPTS`, kept until then for
+    inspection, and, while no `TASK_WEBHOOK_URL` is set, every event: the triggers write
+    them regardless, and a receiver configured later gets the ones still kept.
+    """
+    max_attempts = (
+        settings.TASK_OUTBOX_MAX_ATTEMPTS if settings.TASK_WEBHOOK_URL else None
+    )
+    async with SQLAlchemyAsyncSession(bind=async_db.async_engine) as async_session:
+        outbox_repo = TaskOutboxCRUDRepository(async_session=async_session)
+        return await run_in_batches(
+            lambda batch_size: outbox_repo.purge_events(
+                retention_seconds=settings.TASK_OUTBOX_RETENTION_SECONDS,
+                max_attempts=max_attempts,
+                batch_size=batch_size,
+            ),
+            batch_size=settings.TASK_OUTBOX_PURGE_BATCH_SIZE,
+        )
+
+
+task_webhook_dispatcher: TaskWebhookDispatcher = TaskWebhookDispatcher()
+task_outbox_purger: PeriodicTask = PeriodicTask(
+    name="task-outbox-purge",
+    interval=settings.TASK_OUTBOX_PURGE_INTERVAL,
+    callback=purge_outbox_events,
+)
@@ -0,0 +1,151 @@
+import time
+import typing
+
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as SQLAlchemyPoolTimeoutError
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool as SQLAlchemyAsyncAdaptedQueuePool,
+    ConnectionPoolEntry as SQLAlchemyConnectionPoolEntry,
+)
+
+POOL_CHECKOUT_SECONDS: Histogram = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the pool, including opening new ones.",
+    labelnames=("pool",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+POOL_CHECKOUT_TIMEOUTS: Counter = Counter(
+    "db_pool_checkout_timeouts",
+    "Checkouts that gave up after `pool_timeout` with the pool and overflow exhausted.",
+    labelnames=("pool",),
+)
+POOL_CONNECTIONS_OPENED: Counter = Counter(
+    "db_pool_connections_opened",
+    "DBAPI connections opened by the pool.",
+    labelnames=("pool",),
+)
+POOL_CONNECTIONS_CLOSED: Counter = Counter(
+    "db_pool_connections_closed",
+    "DBAPI connections closed by the pool.",
+    labelnames=("pool",),
+)
+POOL_CONNECTION_RECYCLES: Counter = Counter(
+    "db_pool_connection_recycles",
+    "Pooled connections replaced after exceeding `pool_recycle` or being invalidated.",
+    labelnames=("pool",),
+)
+POOL_CONNECTION_INVALIDATIONS: Counter = Counter(
+    "db_pool_connection_invalidations",
+    "Pooled connections invalidated, e.g. after a disconnect.",
+    labelnames=("pool",),
+)
+POOL_CONNECTION_AGE_SECONDS: Histogram = Histogram(
+    "db_pool_connection_age_seconds",
+    "Age of DBAPI connections when the pool closes them.",
+    labelnames=("pool",),
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400),
+)
+
+
+class InstrumentedQueuePool(SQLAlchemyAsyncAdaptedQueuePool):
+    """
+    The asyncio queue pool, timing every checkout and counting the ones that time out,
+    plus the connections it opens, recycles, invalidates and closes. Gauges of the
+    current pool state are read at scrape time by `PoolStatsCollector`.
+    """
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any):
+        super().__init__(*args, **kwargs)
+        # `recreate()` on dispose passes the old pool's listeners on through `_dispatch`.
+        if "_dispatch" not in kwargs:
+            event.listen(self, "connect", self._on_connect)
+            event.listen(self, "close", self._on_close)
+            event.listen(self, "invalidate", self._on_invalidate)
+
+    @property
+    def label(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def _do_get(self) -> SQLAlchemyConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except SQLAlchemyPoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(self.label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(self.label).observe(
+                time.perf_counter() - started_at
+            )
+
+    def _on_connect(
+        self,
+        dbapi_connection: typing.Any,
+        connection_record: SQLAlchemyConnectionPoolEntry,
+    ) -> None:
+        POOL_CONNECTIONS_OPENED.labels(self.label).inc()
+        # A pool entry outlives its DBAPI connections, so a second `connect` on the same
+        # entry means the previous one was recycled or invalidated and got replaced.
+        if connection_record.record_info.get("connected"):
+            POOL_CONNECTION_RECYCLES.labels(self.label).inc()
+        connection_record.record_info["connected"] = True
+
+    def _on_close(
+        self,
+        dbapi_connection: typing.Any,
+        connection_record: SQLAlchemyConnectionPoolEntry,
+    ) -> None:
+        POOL_CONNECTIONS_CLOSED.labels(self.label).inc()
+        POOL_CONNECTION_AGE_SECONDS.labels(self.label).observe(
+            time.time() - connection_record.starttime
+        )
+
+    def _on_invalidate(
+        self,
+        dbapi_connection: typing.Any,
+        connection_record: SQLAlchemyConnectionPoolEntry,
+        exception: BaseException | None,
+    ) -> None:
+        POOL_CONNECTION_INVALIDATIONS.labels(self.label).inc()
+
+
+class PoolStatsCollector(Collector):
+    """
+    Report the live size, checked-out, idle and overflow connections of each pool.
+    `pools` is called on every scrape because `engine.dispose()` swaps the pool object.
+    """
+
+    def __init__(
+        self, pools: typing.Callable[[], typing.Iterable[InstrumentedQueuePool]]
+    ):
+        self.pools = pools
+
+    def collect(self) -> typing.Iterator[GaugeMetricFamily]:
+        gauges = {
+            "size": GaugeMetricFamily(
+                "db_pool_size", "Configured `pool_size`.", labels=("pool",)
+            ),
+            "checkedout": GaugeMetricFamily(
+                "db_pool_checked_out_connections",
+                "Connections currently checked out of the pool.",
+                labels=("pool",),
+            ),
+            "checkedin": GaugeMetricFamily(
+                "db_pool_idle_connections",
+                "Connections idle in the pool.",
+                labels=("pool",),
+            ),
+            "overflow": GaugeMetricFamily(
+                "db_pool_overflow_connections",
+                "Connections open beyond `pool_size`; negative while the pool is "
+                "still filling up.",
+                labels=("pool",),
+            ),
+        }
+        for pool in self.pools():
+            for method, gauge in gauges.items():
+                gauge.add_metric([pool.label], getattr(pool, method)())
+        yield from gauges.values()
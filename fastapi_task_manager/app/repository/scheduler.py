@@ -0,0 +1,199 @@
+import asyncio
+import datetime
+import heapq
+import json
+import uuid
+
+import loguru
+import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.config.manager import settings
+from app.repository.crud.task import TaskCRUDRepository
+from app.repository.database import async_db
+from app.utils.periodic import PeriodicTask
+
+
+# Postgres trims trailing zeros off fractional seconds in JSON, which `fromisoformat` only
+# accepts from Python 3.11 on
+DUE_AT_ADAPTER: pydantic.TypeAdapter[datetime.datetime] = pydantic.TypeAdapter(
+    pydantic.AwareDatetime
+)
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+# The heap, its `_due` index, the horizon and the timer only make sense updated together,
+# so they stay on one object instead of being split to fit pylint's attribute count.
+class TaskDueScheduler:  # pylint: disable=too-many-instance-attributes
+    """
+    Flag tasks overdue as their `due_at` passes, without polling the table for them.
+
+    The due times up to `horizon` seconds ahead sit in a heap with a single timer armed for
+    the earliest one. When it fires, every task due by then is flagged in one batched
+    `UPDATE` and the timer is armed for the next. The heap is loaded from
+    `ix_task_due_at_pending` every `reload_interval` seconds, which also moves the horizon
+    on. In between it follows the `task_changes` notifications, so a task that is created,
+    rescheduled, finished or deleted is added, moved or dropped right away.
+
+    Entries are dropped lazily: `_due` maps each scheduled task to its current due time, and
+    heap entries that no longer match it are skipped when they come up. Every worker runs
+    its own scheduler over the same tasks; the update only flags tasks not flagged yet, so
+    the batches of the workers that come second change nothing.
+    """
+
+    def __init__(self, horizon: float, max_size: int, reload_interval: float):
+        self.horizon = datetime.timedelta(seconds=horizon)
+        self.max_size = max_size
+        self._heap: list[tuple[datetime.datetime, uuid.UUID]] = []
+        self._due: dict[uuid.UUID, datetime.datetime] = {}
+        # every due time up to here is in `_due`; None until the first reload
+        self._until: datetime.datetime | None = None
+        # per running reload, the changes seen while it reads the table, applied on top
+        self._reloads: list[dict[uuid.UUID, datetime.datetime | None]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_due: datetime.datetime | None = None
+        self._flush: asyncio.Task | None = None
+        self.periodic: PeriodicTask = PeriodicTask(
+            name="task-due-reload", interval=reload_interval, callback=self.reload
+        )
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def start(self) -> None:
+        self.periodic.start()
+        self.periodic.wake()
+
+    async def stop(self) -> None:
+        await self.periodic.stop()
+        self._heap.clear()
+        self._due.clear()
+        self._until = None
+        if self._flush is not None:
+            self._flush.cancel()
+            await asyncio.gather(self._flush, return_exceptions=True)
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._timer_due = None
+
+    def observe(self, payload: str) -> None:
+        """Follow a `task_changes` notification: schedule, move or drop its task."""
+        try:
+            task = json.loads(payload)["task"]
+            task_uuid = uuid.UUID(task["uuid"])
+            due_at = task.get("due_at")
+            if due_at is not None and not task["overdue"] and task["status"] != "DONE":
+                due_at = DUE_AT_ADAPTER.validate_python(due_at)
+            else:
+                due_at = None
+        except (ValueError, KeyError, TypeError) as e:
+            loguru.logger.error(f"Task Due Scheduler --- Bad Notification: {e!r}")
+            return
+
+        for changes in self._reloads:
+            changes[task_uuid] = due_at
+        self._schedule(task_uuid, due_at)
+        self._arm()
+
+    async def reload(self) -> None:
+        """Reload the due times of the next `horizon` seconds and re-arm the timer."""
+        until = _utcnow() + self.horizon
+        changes: dict[uuid.UUID, datetime.datetime | None] = {}
+        self._reloads.append(changes)
+        try:
+            async with SQLAlchemyAsyncSession(
+                bind=async_db.async_engine
+            ) as async_session:
+                task_repo = TaskCRUDRepository(async_session=async_session)
+                due_times = await task_repo.read_pending_due_times(
+                    until=until, limit=self.max_size
+                )
+        finally:
+            self._reloads.remove(changes)
+
+        if len(due_times) == self.max_size:
+            # full: the tasks due after the last one read wait for a later reload
+            until = due_times[-1][1]
+        self._until = until
+        self._due = dict(due_times)
+        self._heap = [(due_at, task_uuid) for task_uuid, due_at in due_times]
+        heapq.heapify(self._heap)
+        for task_uuid, due_at in changes.items():
+            self._schedule(task_uuid, due_at)
+        self._arm()
+
+    async def flush(self) -> int:
+        """
+        Flag every task due by now, `TASK_DUE_SCHEDULER_BATCH_SIZE` per statement, and
+        return how many this worker flagged.
+        """
+        flagged = 0
+        async with SQLAlchemyAsyncSession(bind=async_db.async_engine) as async_session:
+            task_repo = TaskCRUDRepository(async_session=async_session)
+            while True:
+                now = _utcnow()
+                batch = []
+                while (
+                    self._heap
+                    and self._heap[0][0] <= now
+                    and len(batch) < settings.TASK_DUE_SCHEDULER_BATCH_SIZE
+                ):
+                    due_at, task_uuid = heapq.heappop(self._heap)
+                    if self._due.get(task_uuid) == due_at:
+                        del self._due[task_uuid]
+                        batch.append(task_uuid)
+                if not batch:
+                    return flagged
+                flagged += len(await task_repo.flag_overdue_tasks(uuids=batch, now=now))
+
+    def _schedule(self, task_uuid: uuid.UUID, due_at: datetime.datetime | None) -> None:
+        if due_at is None or self._until is None or due_at > self._until:
+            self._due.pop(task_uuid, None)
+        elif task_uuid not in self._due and len(self._due) >= self.max_size:
+            # full: leave this task and any due later to the next reload
+            self._until = due_at - datetime.timedelta(microseconds=1)
+        elif self._due.get(task_uuid) != due_at:
+            self._due[task_uuid] = due_at
+            heapq.heappush(self._heap, (due_at, task_uuid))
+
+    def _arm(self) -> None:
+        """Point the timer at the earliest due time, unless a flush is running."""
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        due_at = self._heap[0][0] if self._heap else None
+        if due_at == self._timer_due or (
+            self._flush is not None and not self._flush.done()
+        ):
+            return
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._timer_due = due_at
+        if due_at is not None:
+            delay = max((due_at - _utcnow()).total_seconds(), 0.0)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._fire)
+
+    def _fire(self) -> None:
+        self._timer = self._timer_due = None
+        self._flush = asyncio.create_task(self._run_flush(), name="task-due-flush")
+
+    async def _run_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # the tasks of a failed batch are still pending, so the next reload finds them
+            loguru.logger.exception(f"Task Due Scheduler --- Flush Failed: {e!r}")
+        finally:
+            self._flush = None
+            self._arm()
+
+
+task_due_scheduler: TaskDueScheduler = TaskDueScheduler(
+    horizon=settings.TASK_DUE_SCHEDULER_HORIZON,
+    max_size=settings.TASK_DUE_SCHEDULER_MAX_SIZE,
+    reload_interval=settings.TASK_DUE_SCHEDULER_RELOAD_INTERVAL,
+)
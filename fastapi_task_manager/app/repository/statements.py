@@ -0,0 +1,110 @@
+import typing
+
+from prometheus_client import REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event, util
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine as SQLAlchemyAsyncEngine
+
+CACHE_RESULTS: dict[CacheStats, str] = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+    CacheStats.CACHING_DISABLED: "disabled",
+    CacheStats.NO_CACHE_KEY: "uncacheable",
+    CacheStats.NO_DIALECT_SUPPORT: "unsupported",
+}
+
+
+class CountingLRUCache(util.LRUCache):
+    """
+    The asyncpg adapter's prepared-statement cache, counting into `counts` how many
+    statements had to be prepared and how many prepared ones were reused.
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self, capacity: int, counts: list[int]):
+        super().__init__(capacity)
+        self.counts = counts
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:
+        self.counts[1] += 1
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        self.counts[0] += 1
+        super().__setitem__(key, value)
+
+
+class StatementCacheStats(Collector):
+    """
+    Hits and misses of SQLAlchemy's compiled cache and of the prepared-statement cache of
+    every pooled asyncpg connection, per engine.
+
+    Like `RequestMetrics`, counts live in plain dicts updated from the event loop and only
+    become metric families on scrape, so no lock is taken per query.
+    """
+
+    def __init__(self):
+        self.engines: dict[str, SQLAlchemyAsyncEngine] = {}
+        # (engine name, compiled-cache outcome) -> executions
+        self.compiled: dict[tuple[str, CacheStats], int] = {}
+        # engine name -> [statements prepared, prepared statements reused]
+        self.prepared: dict[str, list[int]] = {}
+
+    def instrument(self, engine: SQLAlchemyAsyncEngine, name: str) -> None:
+        compiled = self.compiled
+        prepared = self.prepared.setdefault(name, [0, 0])
+        self.engines[name] = engine
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute", named=True)
+        def _count_compiled(context, **kwargs) -> None:
+            # pylint: disable=unused-argument
+            key = (name, context.cache_hit)
+            compiled[key] = compiled.get(key, 0) + 1
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _count_prepared(dbapi_connection, connection_record) -> None:
+            # pylint: disable=protected-access,unused-argument
+            cache = dbapi_connection._prepared_statement_cache
+            if cache is not None:
+                dbapi_connection._prepared_statement_cache = CountingLRUCache(
+                    capacity=cache.capacity, counts=prepared
+                )
+
+    def collect(self) -> typing.Iterator[typing.Any]:
+        compiled = CounterMetricFamily(
+            "db_compiled_cache_lookups",
+            "Statement executions by whether their SQL came from SQLAlchemy's compiled cache.",
+            labels=("pool", "result"),
+        )
+        for (name, cache_hit), count in self.compiled.items():
+            compiled.add_metric([name, CACHE_RESULTS.get(cache_hit, "other")], count)
+        yield compiled
+
+        entries = GaugeMetricFamily(
+            "db_compiled_cache_entries",
+            "Statements held in SQLAlchemy's compiled cache (`DB_COMPILED_CACHE_SIZE`).",
+            labels=("pool",),
+        )
+        for name, engine in self.engines.items():
+            # pylint: disable=protected-access
+            compiled_cache = engine.sync_engine._compiled_cache
+            entries.add_metric([name], len(compiled_cache) if compiled_cache else 0)
+        yield entries
+
+        statements = CounterMetricFamily(
+            "db_prepared_statements",
+            "Prepared statements by whether a connection had to prepare them or reused "
+            "one from its cache (`DB_PREPARED_STATEMENT_CACHE_SIZE`).",
+            labels=("pool", "result"),
+        )
+        for name, (prepared_count, reused_count) in self.prepared.items():
+            statements.add_metric([name, "prepared"], prepared_count)
+            statements.add_metric([name, "reused"], reused_count)
+        yield statements
+
+
+statement_cache_stats: StatementCacheStats = StatementCacheStats()
+REGISTRY.register(statement_cache_stats)
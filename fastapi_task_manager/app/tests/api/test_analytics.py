@@ -0,0 +1,131 @@
+import asyncio
+import datetime
+import pytest
+from sqlalchemy import text
+
+from app.repository.analytics import roll_up_task_throughput
+from app.repository.database import async_db
+
+
+async def set_status(async_client, task, status):
+    """Смена статуса задачи"""
+    await async_client.put(f"api/tasks/{task['uuid']}", json={"status": status})
+
+
+async def execute(statement, **params):
+    """Выполнение SQL-запроса в отдельной транзакции"""
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(text(statement), params)
+
+
+def current_hour():
+    """Начало текущего часа в UTC"""
+    return datetime.datetime.now(datetime.timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+
+@pytest.mark.asyncio
+async def test_analytics_hourly_throughput(async_client, create_task):
+    """Тест почасовой статистики: созданные, завершённые и время в работе"""
+    tasks = [await create_task(f"Analytics {i}") for i in range(4)]
+    await create_task("Analytics done at once", status="done")
+    await set_status(async_client, tasks[0], "in_work")
+    await set_status(async_client, tasks[1], "in_work")
+    await execute(
+        "UPDATE task SET status_changed_at = now() - interval '1 hour' "
+        "WHERE status = 'WORK'"
+    )
+    await set_status(async_client, tasks[0], "done")
+    await set_status(async_client, tasks[1], "created")
+    await async_client.put(f"api/tasks/{tasks[2]['uuid']}", json={"name": "Renamed"})
+
+    assert await roll_up_task_throughput() == 9
+
+    response = await async_client.get("api/tasks/analytics", params={"bucket": "hour"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["bucket"] == "hour"
+    assert len(body["items"]) == 24
+    point = body["items"][-1]
+    assert (
+        datetime.datetime.fromisoformat(point["bucketStart"].replace("Z", "+00:00"))
+        == current_hour()
+    )
+    assert point["created"] == 5
+    assert point["completed"] == 2
+    assert point["inWorkExits"] == 2
+    assert 3600 <= point["avgInWorkSeconds"] < 3700
+    assert all(item["created"] == 0 for item in body["items"][:-1])
+
+
+@pytest.mark.asyncio
+async def test_analytics_daily_buckets(async_client):
+    """Тест суммирования часов в дни и заполнения пустых дней нулями"""
+    await execute(
+        "INSERT INTO task_throughput_hourly VALUES "
+        "('2025-03-01 00:00+00', 2, 1, 1, 60), "
+        "('2025-03-01 23:00+00', 3, 0, 1, 120), "
+        "('2025-03-03 05:00+00', 1, 4, 0, 0)"
+    )
+
+    response = await async_client.get(
+        "api/tasks/analytics",
+        params={
+            "bucket": "day",
+            "from": "2025-03-01T12:00:00Z",
+            "to": "2025-03-04T00:00:00Z",
+        },
+    )
+
+    assert response.status_code == 200
+    assert [
+        (item["bucketStart"][:10], item["created"], item["avgInWorkSeconds"])
+        for item in response.json()["items"]
+    ] == [
+        ("2025-03-01", 5, 90.0),
+        ("2025-03-02", 0, None),
+        ("2025-03-03", 1, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rollups_fold_each_delta_once(async_client, create_task):
+    """Тест, что параллельные свёртки не учитывают изменения дважды"""
+    await asyncio.gather(*(create_task(f"Rollup {i}") for i in range(20)))
+
+    folded = await asyncio.gather(*(roll_up_task_throughput() for _ in range(4)))
+
+    assert sum(folded) == 20
+    response = await async_client.get("api/tasks/analytics")
+    assert sum(item["created"] for item in response.json()["items"]) == 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "2025-03-02T00:00:00Z", "to": "2025-03-01T00:00:00Z"},
+        {"from": "2020-01-01T00:00:00Z", "to": "2025-01-01T00:00:00Z"},
+        {"from": "2025-03-01T00:00:00", "to": "2025-03-02T00:00:00"},
+        {"bucket": "week"},
+    ],
+)
+async def test_analytics_invalid_params(async_client, params):
+    """Тест некорректных параметров аналитики"""
+    response = await async_client.get("api/tasks/analytics", params=params)
+
+    assert response.status_code in (400, 422)
+
+
+@pytest.mark.asyncio
+async def test_analytics_do_not_scan_tasks(async_client, create_task, db_statements):
+    """Тест, что аналитика читает только свёрнутые данные"""
+    await create_task("Analytics task")
+    db_statements.clear()
+
+    await async_client.get("api/tasks/analytics", params={"bucket": "day"})
+
+    assert len(db_statements) == 1
+    assert "FROM task_throughput_hourly" in db_statements[0]
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import pytest
+
+from app.repository.changes import EVICTED_FRAME, RESET_FRAME, task_change_feed
+
+
+class ChangeStream:
+    """
+    Запрос к ленте изменений напрямую через ASGI: httpx.ASGITransport отдаёт ответ только
+    целиком, а поток не заканчивается
+    """
+
+    def __init__(self, app, query="", headers=()):
+        self.app = app
+        self.scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/tasks/changes",
+            "query_string": query.encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+            "raw_path": b"/api/tasks/changes",
+            "root_path": "",
+            "scheme": "http",
+            "http_version": "1.1",
+            "asgi": {"version": "3.0"},
+            "server": ("test", 80),
+            "client": ("test", 12345),
+        }
+        self.messages = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.task = None
+        self.start = None
+        self.buffer = b""
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(
+            self.app(self.scope, self.receive, self.messages.put)
+        )
+        self.start = await self.next_message()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, timeout=2)
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def next_message(self):
+        return await asyncio.wait_for(self.messages.get(), timeout=2)
+
+    async def next_frame(self):
+        """Следующий кадр SSE, кроме heartbeat"""
+        while True:
+            while b"\n\n" not in self.buffer:
+                self.buffer += (await self.next_message())["body"]
+            frame, self.buffer = self.buffer.split(b"\n\n", 1)
+            if not frame.startswith(b":"):
+                return frame + b"\n\n"
+
+
+def parse_frame(frame):
+    """Поля кадра SSE, data разобрана из JSON"""
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+@pytest.mark.asyncio
+async def test_stream_pushes_task_changes(async_client, backend_test_app):
+    """Тест событий создания, изменения и удаления задачи в потоке"""
+    async with ChangeStream(backend_test_app) as stream:
+        assert stream.start["status"] == 200
+        assert (b"content-type", b"text/event-stream; charset=utf-8") in stream.start[
+            "headers"
+        ]
+
+        response = await async_client.post(
+            "api/tasks/", json={"name": "Streamed task", "status": "created"}
+        )
+        task = response.json()
+        await async_client.put(f"api/tasks/{task['uuid']}", json={"status": "done"})
+        await async_client.delete(f"api/tasks/{task['uuid']}")
+
+        created = parse_frame(await stream.next_frame())
+        updated = parse_frame(await stream.next_frame())
+        deleted = parse_frame(await stream.next_frame())
+
+    assert created["event"] == "task.created"
+    assert created["data"]["task"] == task
+    assert updated["event"] == "task.updated"
+    assert updated["data"]["task"]["status"] == "done"
+    assert updated["data"]["task"]["updatedAt"] is not None
+    assert deleted["event"] == "task.deleted"
+    assert deleted["data"]["task"] == {"uuid": task["uuid"]}
+    assert int(created["id"]) < int(updated["id"]) < int(deleted["id"])
+    assert created["data"]["id"] == int(created["id"])
+    assert not task_change_feed.subscribers
+
+
+@pytest.mark.asyncio
+async def test_reconnect_resumes_after_last_event_id(async_client, backend_test_app):
+    """Тест продолжения после переподключения с Last-Event-ID или lastEventId"""
+    async with ChangeStream(backend_test_app) as stream:
+        await async_client.post(
+            "api/tasks/", json={"name": "Seen task", "status": "created"}
+        )
+        last_event_id = parse_frame(await stream.next_frame())["id"]
+
+    published = task_change_feed.counters["published"]
+    await async_client.post(
+        "api/tasks/bulk",
+        json=[{"name": f"Missed task {i}", "status": "done"} for i in range(3)],
+    )
+    for _ in range(100):
+        if task_change_feed.counters["published"] == published + 3:
+            break
+        await asyncio.sleep(0.02)
+
+    headers = [("Last-Event-ID", last_event_id)]
+    async with ChangeStream(backend_test_app, headers=headers) as stream:
+        by_header = [parse_frame(await stream.next_frame()) for _ in range(3)]
+    query = f"lastEventId={last_event_id}"
+    async with ChangeStream(backend_test_app, query=query) as stream:
+        by_query = [parse_frame(await stream.next_frame()) for _ in range(3)]
+
+    assert [frame["data"]["task"]["name"] for frame in by_header] == [
+        f"Missed task {i}" for i in range(3)
+    ]
+    assert by_query == by_header
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_does_not_evict_subscriber(async_client, backend_test_app):
+    """Тест, что массовое создание задач доходит до подписчика целиком, без отключения"""
+    evicted = task_change_feed.counters["evicted"]
+    async with ChangeStream(backend_test_app) as stream:
+        response = await async_client.post(
+            "api/tasks/bulk",
+            json=[{"name": f"Bulk task {i}", "status": "created"} for i in range(150)],
+        )
+        assert response.status_code == 201
+        frames = [await stream.next_frame() for _ in range(150)]
+
+    assert EVICTED_FRAME not in frames
+    assert {parse_frame(frame)["data"]["task"]["name"] for frame in frames} == {
+        f"Bulk task {i}" for i in range(150)
+    }
+    assert task_change_feed.counters["evicted"] == evicted
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("async_client")
+async def test_resume_from_unknown_event_resets(backend_test_app):
+    """Тест сброса при продолжении с неизвестного воркеру id"""
+    headers = [("Last-Event-ID", "-1")]
+    async with ChangeStream(backend_test_app, headers=headers) as stream:
+        assert await stream.next_frame() == RESET_FRAME
+
+
+@pytest.mark.asyncio
+async def test_full_worker_rejects_subscriber(async_client, monkeypatch):
+    """Тест отказа 503, когда воркер держит максимум подписчиков"""
+    monkeypatch.setattr(task_change_feed, "max_subscribers", 0)
+
+    response = await async_client.get("api/tasks/changes")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
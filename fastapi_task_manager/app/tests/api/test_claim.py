@@ -0,0 +1,229 @@
+import asyncio
+import datetime
+import uuid
+import pytest
+from sqlalchemy import text
+
+from app.config.manager import settings
+from app.repository.changes import task_change_feed
+from app.repository.database import async_db
+from app.repository.leases import requeue_expired_tasks
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_oldest_pending_tasks(create_task, async_client):
+    """Тест, что claim берёт самые старые новые задачи и переводит их в работу"""
+    first = [await create_task(f"Older task {i}") for i in range(2)]
+    await create_task("Done task", status="done")
+    second = [await create_task(f"Newer task {i}") for i in range(2)]
+
+    response = await async_client.post("api/tasks/claim", params={"n": 3})
+
+    assert response.status_code == 200
+    claimed = response.json()
+    assert [task["uuid"] for task in claimed[:2]] == [task["uuid"] for task in first]
+    assert claimed[2]["uuid"] in {task["uuid"] for task in second}
+    assert claimed == sorted(
+        claimed, key=lambda task: (task["createdAt"], task["uuid"])
+    )
+    assert {task["status"] for task in claimed} == {"in_work"}
+    assert all(task["updatedAt"] for task in claimed)
+
+    read = await async_client.get(f"api/tasks/{claimed[0]['uuid']}")
+    assert read.json()["status"] == "in_work"
+
+
+@pytest.mark.asyncio
+async def test_claim_without_pending_tasks(create_task, async_client):
+    """Тест пустого ответа, когда брать нечего"""
+    await create_task("Work task", status="in_work")
+
+    response = await async_client.post("api/tasks/claim")
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_claim_is_single_statement(create_task, async_client, db_statements):
+    """Тест, что claim выполняется одним запросом к базе"""
+    for i in range(5):
+        await create_task(f"Pending task {i}")
+    db_statements.clear()
+
+    response = await async_client.post("api/tasks/claim", params={"n": 5})
+
+    assert len(response.json()) == 5
+    assert len(db_statements) == 1
+    assert "SKIP LOCKED" in db_statements[0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_take_each_task_once(create_task, async_client):
+    """Тест, что параллельные потребители не получают одну задачу дважды"""
+    for i in range(60):
+        await create_task(f"Pending task {i}")
+
+    responses = await asyncio.gather(
+        *(async_client.post("api/tasks/claim", params={"n": 7}) for _ in range(10))
+    )
+
+    claimed = [task["uuid"] for r in responses for task in r.json()]
+    assert len(claimed) == len(set(claimed)) == 60
+    stats = await async_client.get("api/tasks/stats")
+    assert stats.json()["byStatus"] == {"created": 0, "in_work": 60, "done": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n", [0, 1001, "many"])
+async def test_claim_invalid_count(async_client, n):
+    """Тест валидации количества задач"""
+    response = await async_client.post("api/tasks/claim", params={"n": n})
+
+    assert response.status_code == 422
+
+
+async def expire_leases(uuids):
+    """Перевод аренды задач в прошлое, как у упавшего потребителя"""
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            text(
+                "UPDATE task SET lease_expires_at = now() - interval '1 second' "
+                "WHERE uuid = ANY(:uuids) AND lease_expires_at IS NOT NULL"
+            ),
+            {"uuids": uuids},
+        )
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_tasks_to_owner(create_task, async_client):
+    """Тест, что claim выдаёт задачи в аренду владельцу на заданный срок"""
+    for i in range(2):
+        await create_task(f"Pending task {i}")
+
+    response = await async_client.post(
+        "api/tasks/claim", params={"n": 2, "owner": "worker-1", "leaseSeconds": 30}
+    )
+
+    claimed = response.json()
+    assert {task["owner"] for task in claimed} == {"worker-1"}
+    lease_expires_at = datetime.datetime.fromisoformat(
+        claimed[0]["leaseExpiresAt"].replace("Z", "+00:00")
+    )
+    updated_at = datetime.datetime.fromisoformat(
+        claimed[0]["updatedAt"].replace("Z", "+00:00")
+    )
+    assert lease_expires_at - updated_at == datetime.timedelta(seconds=30)
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_extends_own_leases_in_one_statement(
+    create_task, async_client, db_statements
+):
+    """Тест продления аренды только своих задач одним запросом"""
+    for i in range(4):
+        await create_task(f"Pending task {i}")
+    mine = await async_client.post(
+        "api/tasks/claim", params={"n": 3, "owner": "worker-1", "leaseSeconds": 10}
+    )
+    theirs = await async_client.post(
+        "api/tasks/claim", params={"owner": "worker-2", "leaseSeconds": 10}
+    )
+    mine_uuids = [task["uuid"] for task in mine.json()]
+    db_statements.clear()
+
+    response = await async_client.post(
+        "api/tasks/heartbeat",
+        params={"owner": "worker-1", "leaseSeconds": 600},
+        json=[*mine_uuids, theirs.json()[0]["uuid"], str(uuid.uuid4())],
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(body["extended"]) == sorted(mine_uuids)
+    lease_expires_at = datetime.datetime.fromisoformat(
+        body["leaseExpiresAt"].replace("Z", "+00:00")
+    )
+    assert lease_expires_at > datetime.datetime.now(datetime.timezone.utc) + (
+        datetime.timedelta(seconds=500)
+    )
+    assert len(db_statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_etag_and_change_feed_quiet(create_task, async_client):
+    """Тест, что продление аренды не меняет ETag и не попадает в ленту изменений"""
+    await create_task("Pending task")
+    [task] = (await async_client.post("api/tasks/claim")).json()
+    etag = (await async_client.get(f"api/tasks/{task['uuid']}")).headers["etag"]
+    subscriber = task_change_feed.subscribe()
+
+    try:
+        await async_client.post("api/tasks/heartbeat", json=[task["uuid"]])
+        await create_task("After heartbeat", status="done")
+        for _ in range(100):
+            if subscriber.frames:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        task_change_feed.unsubscribe(subscriber)
+
+    assert [frame.split(b"\n")[1] for frame in subscriber.frames] == [
+        b"event: task.created"
+    ]
+    read = await async_client.get(
+        f"api/tasks/{task['uuid']}", headers={"If-None-Match": etag}
+    )
+    assert read.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_reaper_requeues_expired_tasks_in_batches(
+    create_task, async_client, monkeypatch
+):
+    """Тест возврата задач с истёкшей арендой в очередь пачками"""
+    monkeypatch.setattr(settings, "TASK_LEASE_REAPER_BATCH_SIZE", 2)
+    for i in range(6):
+        await create_task(f"Pending task {i}")
+    claimed = (
+        await async_client.post("api/tasks/claim", params={"n": 6, "owner": "dead"})
+    ).json()
+    expired = [task["uuid"] for task in claimed[:5]]
+    await expire_leases(expired)
+
+    assert await requeue_expired_tasks() == 5
+    assert await requeue_expired_tasks() == 0
+
+    reclaimed = await async_client.post(
+        "api/tasks/claim", params={"n": 10, "owner": "alive"}
+    )
+    assert sorted(task["uuid"] for task in reclaimed.json()) == sorted(expired)
+    heartbeat = await async_client.post(
+        "api/tasks/heartbeat", params={"owner": "dead"}, json=expired
+    )
+    assert heartbeat.json() == {"extended": [], "leaseExpiresAt": None}
+
+
+@pytest.mark.asyncio
+async def test_finishing_task_releases_lease(create_task, async_client):
+    """Тест, что смена статуса из работы снимает аренду и задачу не вернут в очередь"""
+    await create_task("Pending task")
+    [task] = (await async_client.post("api/tasks/claim")).json()
+    await async_client.put(f"api/tasks/{task['uuid']}", json={"status": "done"})
+    await expire_leases([task["uuid"]])
+
+    assert await requeue_expired_tasks() == 0
+    heartbeat = await async_client.post("api/tasks/heartbeat", json=[task["uuid"]])
+    assert heartbeat.json()["extended"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params, body",
+    [({}, []), ({"leaseSeconds": 0}, ["00000000-0000-0000-0000-000000000000"])],
+)
+async def test_heartbeat_invalid_request(async_client, params, body):
+    """Тест валидации запроса продления аренды"""
+    response = await async_client.post("api/tasks/heartbeat", params=params, json=body)
+
+    assert response.status_code == 422
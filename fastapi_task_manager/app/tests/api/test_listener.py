@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+import pytest
+from sqlalchemy import text
+
+from app.repository.cache import TASK_CACHE_CHANNEL, task_cache
+from app.repository.database import async_db
+from app.repository.listener import db_listener
+
+
+async def wait_for(predicate, timeout=2.0):
+    """Ожидание выполнения условия с таймаутом"""
+    for _ in range(int(timeout / 0.02)):
+        if predicate():
+            return True
+        await asyncio.sleep(0.02)
+    return predicate()
+
+
+@pytest.mark.asyncio
+async def test_notification_evicts_cached_task(async_client):
+    """Тест, что NOTIFY из другого воркера удаляет задачу из локального кеша"""
+    task_uuid = uuid.uuid4()
+    task_cache.set(task_uuid, b"{}")
+
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": TASK_CACHE_CHANNEL, "payload": str(task_uuid)},
+        )
+
+    assert await wait_for(lambda: task_cache.get(task_uuid) is None)
+
+
+@pytest.mark.asyncio
+async def test_update_task_publishes_invalidation(async_client, db_statements):
+    """Тест, что обновление задачи публикует NOTIFY тем же запросом"""
+    create_response = await async_client.post(
+        "api/tasks/", json={"name": "notify task", "status": "created"}
+    )
+    task_uuid = create_response.json()["uuid"]
+
+    db_statements.clear()
+    await async_client.put(f"api/tasks/{task_uuid}", json={"status": "done"})
+
+    assert len(db_statements) == 1
+    assert "pg_notify" in db_statements[0]
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_and_resets_cache(async_client):
+    """Тест переподключения слушателя и сброса кеша после обрыва соединения"""
+    task_uuid = uuid.uuid4()
+    task_cache.set(task_uuid, b"{}")
+    listener_pid = db_listener.connection.get_server_pid()
+
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_terminate_backend(:pid)"), {"pid": listener_pid}
+        )
+
+    assert await wait_for(lambda: task_cache.get(task_uuid) is None)
+    assert await wait_for(
+        lambda: db_listener.is_connected
+        and db_listener.connection.get_server_pid() != listener_pid
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bypassed_while_listener_is_down(async_client, monkeypatch):
+    """Тест, что без соединения слушателя задачи читаются из БД, а не из кеша"""
+    create_response = await async_client.post(
+        "api/tasks/", json={"name": "cached name", "status": "created"}
+    )
+    task_uuid = create_response.json()["uuid"]
+    await async_client.get(f"api/tasks/{task_uuid}")
+    # a write of another worker whose notification this worker will not receive
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            text("UPDATE task SET name = 'fresh name' WHERE uuid = :uuid"),
+            {"uuid": task_uuid},
+        )
+    assert (await async_client.get(f"api/tasks/{task_uuid}")).json()["name"] == (
+        "cached name"
+    )
+
+    monkeypatch.setattr(type(db_listener), "is_connected", property(lambda _: False))
+    response = await async_client.get(f"api/tasks/{task_uuid}")
+
+    assert response.json()["name"] == "fresh name"
+    assert task_cache.get(uuid.UUID(task_uuid)).body != response.content
@@ -0,0 +1,202 @@
+import asyncio
+import uuid
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as SQLAlchemyPoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config.manager import settings
+from app.repository.changes import task_change_feed
+from app.repository.database import async_db
+from app.repository.pool import InstrumentedQueuePool
+
+
+def sample(name, pool):
+    """Значение метрики пула из реестра Prometheus"""
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0
+
+
+def create_test_engine(name, **pool_options):
+    """Движок с инструментированным пулом и собственной меткой"""
+    return create_async_engine(
+        async_db.set_async_db_url,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        **pool_options,
+    )
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_pool_metrics(async_client):
+    """Тест эндпоинта /metrics с метриками пула соединений"""
+    checkouts = sample("db_pool_checkout_seconds_count", "primary")
+    await async_client.get("api/tasks/")
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'db_pool_size{pool="primary"}' in response.text
+    assert 'db_pool_checked_out_connections{pool="primary"}' in response.text
+    assert sample("db_pool_checkout_seconds_count", "primary") > checkouts
+
+
+@pytest.mark.asyncio
+async def test_checkout_timeout_is_counted():
+    """Тест счётчика таймаутов при исчерпании пула"""
+    engine = create_test_engine(
+        "timeout-test", pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    async with engine.connect():
+        with pytest.raises(SQLAlchemyPoolTimeoutError):
+            async with engine.connect():
+                pass
+    await engine.dispose()
+
+    assert sample("db_pool_checkout_timeouts_total", "timeout-test") == 1
+    assert sample("db_pool_connections_opened_total", "timeout-test") == 1
+    assert sample("db_pool_connections_closed_total", "timeout-test") == 1
+    assert sample("db_pool_connection_age_seconds_count", "timeout-test") == 1
+
+
+@pytest.mark.asyncio
+async def test_recycled_connection_is_counted():
+    """Тест счётчика пересоздания соединений по pool_recycle"""
+    engine = create_test_engine("recycle-test", pool_size=1, pool_recycle=0)
+    for _ in range(3):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    # pool_recycle=0 retires the pooled connection on every checkout
+    assert sample("db_pool_connection_recycles_total", "recycle-test") == 3
+    assert sample("db_pool_connections_opened_total", "recycle-test") == 4
+
+
+def request_count(route, method, status):
+    """Количество запросов по имени маршрута из реестра Prometheus"""
+    labels = {"route": route, "method": method, "status": status}
+    return REGISTRY.get_sample_value("http_requests_total", labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_requests_are_counted_by_route_name(async_client):
+    """Тест, что метрики запросов помечаются именем маршрута, а не путём с UUID"""
+    route = "tasks:read-task-by-uuid"
+    found = request_count(route, "GET", "200")
+    missing = request_count(route, "GET", "404")
+    create_response = await async_client.post(
+        "api/tasks/", json={"name": "metrics task", "status": "created"}
+    )
+    task_uuid = create_response.json()["uuid"]
+
+    await async_client.get(f"api/tasks/{task_uuid}")
+    await async_client.get("api/tasks/00000000-0000-0000-0000-000000000000")
+
+    assert request_count(route, "GET", "200") == found + 1
+    assert request_count(route, "GET", "404") == missing + 1
+    assert (
+        REGISTRY.get_sample_value(
+            "http_request_duration_seconds_count", {"route": route, "method": "GET"}
+        )
+        >= 2
+    )
+    assert REGISTRY.get_sample_value("http_requests_in_flight", {"method": "GET"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_path_is_counted_as_unmatched(async_client):
+    """Тест, что запросы к неизвестным путям не создают новых меток"""
+    unmatched = request_count("unmatched", "GET", "404")
+
+    await async_client.get(f"api/unknown/{uuid.uuid4()}")
+
+    assert request_count("unmatched", "GET", "404") == unmatched + 1
+
+
+def cache_count(name, pool, result):
+    """Значение счётчика кэша запросов из реестра Prometheus"""
+    return REGISTRY.get_sample_value(name, {"pool": pool, "result": result}) or 0
+
+
+@pytest.mark.asyncio
+async def test_statement_caches_are_counted(async_client):
+    """Тест счётчиков кэша скомпилированных запросов и подготовленных выражений"""
+    await async_client.get("api/tasks/")
+    hits = cache_count("db_compiled_cache_lookups_total", "primary", "hit")
+    reused = cache_count("db_prepared_statements_total", "primary", "reused")
+
+    for _ in range(3):
+        await async_client.get("api/tasks/")
+
+    assert cache_count("db_compiled_cache_lookups_total", "primary", "hit") >= hits + 3
+    assert (
+        cache_count("db_prepared_statements_total", "primary", "reused") >= reused + 3
+    )
+    response = await async_client.get("/metrics")
+    assert 'db_compiled_cache_entries{pool="primary"}' in response.text
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_sizes_follow_settings():
+    """Тест размеров кэшей движка из настроек"""
+    # pylint: disable=protected-access
+    engine = async_db.create_engine(url=async_db.set_async_db_url, name="cache-test")
+    async with engine.connect() as conn:
+        dbapi_connection = (await conn.get_raw_connection()).dbapi_connection
+        prepared_cache = dbapi_connection._prepared_statement_cache
+    await engine.dispose()
+
+    assert (
+        engine.sync_engine._compiled_cache.capacity == settings.DB_COMPILED_CACHE_SIZE
+    )
+    assert prepared_cache.capacity == settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+
+
+def task_cache_count(name, labels=None):
+    """Значение метрики кэша задач из реестра Prometheus"""
+    return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+
+@pytest.mark.asyncio
+async def test_task_cache_is_counted(async_client):
+    """Тест метрик кэша задач: промахи, попадания и число записей"""
+    response = await async_client.post(
+        "api/tasks/", json={"name": "cached task", "status": "created"}
+    )
+    task_uuid = response.json()["uuid"]
+    misses = task_cache_count("task_cache_lookups_total", {"result": "miss"})
+    hits = task_cache_count("task_cache_lookups_total", {"result": "hit"})
+
+    for _ in range(3):
+        await async_client.get(f"api/tasks/{task_uuid}")
+
+    assert (
+        task_cache_count("task_cache_lookups_total", {"result": "miss"}) == misses + 1
+    )
+    assert task_cache_count("task_cache_lookups_total", {"result": "hit"}) == hits + 2
+    assert task_cache_count("task_cache_entries") >= 1
+    assert task_cache_count("task_cache_max_entries") == settings.TASK_CACHE_SIZE
+    response = await async_client.get("/metrics")
+    assert 'task_cache_removals_total{reason="eviction"}' in response.text
+
+
+@pytest.mark.asyncio
+async def test_change_feed_is_counted(async_client):
+    """Тест метрик ленты изменений: опубликованные события и подписчики"""
+    published = REGISTRY.get_sample_value("task_change_events_published_total")
+
+    await async_client.post(
+        "api/tasks/", json={"name": "published task", "status": "created"}
+    )
+    for _ in range(100):
+        if task_change_feed.counters["published"] > published:
+            break
+        await asyncio.sleep(0.02)
+
+    assert REGISTRY.get_sample_value("task_change_events_published_total") > published
+    assert REGISTRY.get_sample_value("task_change_subscribers_evicted_total") == (
+        task_change_feed.counters["evicted"]
+    )
+    assert REGISTRY.get_sample_value("task_change_subscribers") == 0
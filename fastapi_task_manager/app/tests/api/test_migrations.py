@@ -0,0 +1,71 @@
+# pylint:disable=redefined-outer-name
+import asyncio
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.repository.database import async_db
+from app.repository.migrations.runner import (
+    MIGRATIONS,
+    migrate_db_schema,
+    read_schema_version,
+)
+
+SCRATCH_SCHEMA = "migration_test"
+
+
+@pytest_asyncio.fixture
+async def scratch_engine():
+    """Фикстура движка, работающего в отдельной пустой схеме БД"""
+    engine = create_async_engine(
+        async_db.set_async_db_url,
+        connect_args={"server_settings": {"search_path": SCRATCH_SCHEMA}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCRATCH_SCHEMA}"))
+    yield engine
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {SCRATCH_SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_restart_keeps_data(async_client):
+    """Тест, что повторный запуск миграций не удаляет данные"""
+    create_response = await async_client.post(
+        "api/tasks/", json={"name": "persistent task", "status": "created"}
+    )
+    task_uuid = create_response.json()["uuid"]
+
+    version = await migrate_db_schema(engine=async_db.async_engine)
+
+    assert version == MIGRATIONS[-1].version
+    response = await async_client.get(f"api/tasks/{task_uuid}")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_up_to_date_schema_costs_single_select(async_client, db_statements):
+    """Тест, что актуальная схема проверяется одним запросом без блокировки"""
+    await migrate_db_schema(engine=async_db.async_engine)
+
+    assert len(db_statements) == 1
+    assert "pg_advisory" not in db_statements[0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_apply_migrations_once(scratch_engine):
+    """Тест, что одновременно стартующие воркеры применяют миграции ровно один раз"""
+    versions = await asyncio.gather(
+        *(migrate_db_schema(engine=scratch_engine) for _ in range(4))
+    )
+
+    assert versions == [MIGRATIONS[-1].version] * 4
+    async with scratch_engine.connect() as conn:
+        assert await read_schema_version(connection=conn) == MIGRATIONS[-1].version
+        applied = await conn.execute(text("SELECT count(*) FROM schema_version"))
+        assert applied.scalar() == len(MIGRATIONS)
+        tasks = await conn.execute(text("SELECT count(*) FROM task"))
+        assert tasks.scalar() == 0
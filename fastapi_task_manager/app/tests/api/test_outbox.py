@@ -0,0 +1,253 @@
+import asyncio
+import fastapi
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.config.manager import settings
+from app.repository.database import async_db
+from app.repository.outbox import (
+    TaskWebhookDispatcher,
+    purge_outbox_events,
+    task_webhook_dispatcher,
+)
+
+WEBHOOK_URL = "http://receiver/hooks"
+
+
+class Receiver:
+    """Локальный приёмник вебхуков: отвечает статусами из очереди, затем 204"""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.received = []
+        self.app = fastapi.FastAPI()
+        self.app.post("/hooks")(self.hook)
+
+    async def hook(self, request: fastapi.Request):
+        self.received.append((request.headers["idempotency-key"], await request.json()))
+        status_code = self.statuses.pop(0) if self.statuses else 204
+        return fastapi.Response(status_code=status_code)
+
+
+@pytest.fixture
+def webhook_settings(async_client, monkeypatch):
+    """
+    Фикстура с адресом приёмника и задержкой первого повтора 15-30 секунд; задаётся после
+    запуска приложения, чтобы оно не запустило свой диспетчер
+    """
+    # pylint: disable=unused-argument
+    monkeypatch.setattr(settings, "TASK_WEBHOOK_URL", WEBHOOK_URL)
+    monkeypatch.setattr(settings, "TASK_OUTBOX_BACKOFF_SECONDS", 30.0)
+
+
+async def start_dispatcher(receiver):
+    """Запуск диспетчера, доставляющего события в приёмник"""
+    dispatcher = TaskWebhookDispatcher(transport=httpx.ASGITransport(app=receiver.app))
+    dispatcher.start()
+    return dispatcher
+
+
+async def fetch_outbox(columns="event, name, status, previous_status"):
+    """Чтение событий outbox по порядку"""
+    async with async_db.async_engine.connect() as conn:
+        result = await conn.execute(
+            text(f"SELECT {columns} FROM task_outbox ORDER BY id")
+        )
+        return [tuple(row) for row in result]
+
+
+async def execute(statement):
+    """Выполнение SQL-запроса в отдельной транзакции"""
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(text(statement))
+
+
+@pytest.mark.asyncio
+async def test_task_changes_are_written_to_outbox(async_client, create_task):
+    """Тест записи событий создания и смены статуса в outbox"""
+    task = await create_task("Outbox task")
+    await async_client.post(
+        "api/tasks/bulk",
+        json=[{"name": f"Outbox bulk {i}", "status": "done"} for i in range(2)],
+    )
+    await async_client.put(f"api/tasks/{task['uuid']}", json={"status": "in_work"})
+    await async_client.put(f"api/tasks/{task['uuid']}", json={"name": "Renamed"})
+
+    assert await fetch_outbox() == [
+        ("task.created", "Outbox task", "CREATED", None),
+        ("task.created", "Outbox bulk 0", "DONE", None),
+        ("task.created", "Outbox bulk 1", "DONE", None),
+        ("task.status_changed", "Outbox task", "WORK", "CREATED"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_outbox_write_adds_no_round_trip(async_client, db_statements):
+    """Тест, что событие пишется триггером в том же запросе, что и задача"""
+    await async_client.post(
+        "api/tasks/", json={"name": "One statement", "status": "done"}
+    )
+
+    assert len(db_statements) == 1
+    assert len(await fetch_outbox()) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("webhook_settings")
+async def test_dispatcher_delivers_and_deletes_events(async_client, create_task):
+    """Тест доставки событий в приёмник и удаления их из outbox"""
+    task = await create_task("Deliver me")
+    await async_client.put(f"api/tasks/{task['uuid']}", json={"status": "done"})
+    receiver = Receiver()
+    dispatcher = await start_dispatcher(receiver)
+
+    try:
+        assert await dispatcher.dispatch() == 2
+    finally:
+        await dispatcher.stop()
+
+    assert await fetch_outbox() == []
+    assert len(receiver.received) == 2
+    created_key, created = receiver.received[0]
+    changed_key, changed = receiver.received[1]
+    assert created_key == str(created["id"])
+    assert changed_key == str(changed["id"])
+    assert created["event"] == "task.created"
+    assert created["taskUuid"] == task["uuid"]
+    assert created["status"] == "created"
+    assert created["previousStatus"] is None
+    assert changed["event"] == "task.status_changed"
+    assert (changed["status"], changed["previousStatus"]) == ("done", "created")
+    assert "occurredAt" in changed
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("webhook_settings")
+async def test_failed_delivery_is_retried_after_backoff(create_task):
+    """Тест повторной доставки после ошибки приёмника и паузы"""
+    await create_task("Retry me")
+    receiver = Receiver(statuses=[503])
+    dispatcher = await start_dispatcher(receiver)
+
+    try:
+        assert await dispatcher.dispatch() == 0
+        [(attempts, last_error, delay)] = await fetch_outbox(
+            "attempts, last_error, extract(epoch FROM available_at - now())"
+        )
+        assert attempts == 1
+        assert last_error.startswith("HTTP 503")
+        assert 15 <= delay <= 30
+
+        assert await dispatcher.dispatch() == 0
+        await execute("UPDATE task_outbox SET available_at = now()")
+        assert await dispatcher.dispatch() == 1
+    finally:
+        await dispatcher.stop()
+
+    assert len(receiver.received) == 2
+    assert await fetch_outbox() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("webhook_settings")
+async def test_event_is_kept_after_max_attempts(create_task, monkeypatch):
+    """Тест, что событие после исчерпания попыток остаётся в outbox"""
+    monkeypatch.setattr(settings, "TASK_OUTBOX_MAX_ATTEMPTS", 1)
+    await create_task("Give up on me")
+    receiver = Receiver(statuses=[500, 500])
+    dispatcher = await start_dispatcher(receiver)
+
+    try:
+        assert await dispatcher.dispatch() == 0
+        await execute("UPDATE task_outbox SET available_at = now()")
+        assert await dispatcher.dispatch() == 0
+    finally:
+        await dispatcher.stop()
+
+    assert len(receiver.received) == 1
+    assert await fetch_outbox("attempts") == [(1,)]
+
+
+@pytest.mark.asyncio
+async def test_undeliverable_events_are_purged_after_retention(create_task):
+    """Тест, что без адреса вебхуков события удаляются по истечении срока хранения"""
+    for name in ("Old event", "Fresh event"):
+        await create_task(name)
+    await execute(
+        "UPDATE task_outbox SET available_at = now() - interval '2 days' "
+        "WHERE name = 'Old event'"
+    )
+
+    assert settings.TASK_WEBHOOK_URL is None
+    assert await purge_outbox_events() == 1
+    assert await fetch_outbox("name") == [("Fresh event",)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("webhook_settings")
+async def test_only_dead_events_are_purged_with_webhooks(create_task):
+    """Тест, что с вебхуками удаляются только исчерпавшие попытки события"""
+    for name in ("Dead event", "Retried event", "Fresh dead event"):
+        await create_task(name)
+    await execute(
+        f"UPDATE task_outbox SET attempts = {settings.TASK_OUTBOX_MAX_ATTEMPTS} "
+        "WHERE name <> 'Retried event'"
+    )
+    await execute(
+        "UPDATE task_outbox SET available_at = now() - interval '2 days' "
+        "WHERE name <> 'Fresh dead event'"
+    )
+
+    assert await purge_outbox_events() == 1
+    assert await fetch_outbox("name") == [("Retried event",), ("Fresh dead event",)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("webhook_settings")
+async def test_concurrent_dispatchers_deliver_each_event_once(
+    async_client, monkeypatch
+):
+    """Тест, что параллельные диспетчеры не доставляют событие дважды"""
+    monkeypatch.setattr(settings, "TASK_OUTBOX_BATCH_SIZE", 5)
+    await async_client.post(
+        "api/tasks/bulk",
+        json=[{"name": f"Concurrent {i}", "status": "created"} for i in range(40)],
+    )
+    receiver = Receiver()
+    dispatchers = [await start_dispatcher(receiver) for _ in range(4)]
+
+    try:
+        delivered = await asyncio.gather(*(d.dispatch() for d in dispatchers))
+    finally:
+        for dispatcher in dispatchers:
+            await dispatcher.stop()
+
+    assert sum(delivered) == 40
+    keys = [key for key, _ in receiver.received]
+    assert len(keys) == len(set(keys)) == 40
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("webhook_settings")
+async def test_notification_wakes_dispatcher(create_task, monkeypatch):
+    """Тест, что NOTIFY после коммита будит диспетчер, не дожидаясь опроса"""
+    receiver = Receiver()
+    monkeypatch.setattr(
+        task_webhook_dispatcher,
+        "transport",
+        httpx.ASGITransport(app=receiver.app),
+    )
+    task_webhook_dispatcher.start()
+
+    try:
+        await create_task("Wake up")
+        for _ in range(100):
+            if receiver.received:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await task_webhook_dispatcher.stop()
+
+    assert settings.TASK_OUTBOX_POLL_INTERVAL > 2
+    assert [body["name"] for _, body in receiver.received] == ["Wake up"]
@@ -0,0 +1,233 @@
+import asyncio
+import datetime
+import pytest
+
+from app.repository.scheduler import task_due_scheduler
+
+
+def due_in(seconds):
+    """Срок через заданное число секунд, в формате запросов API"""
+    moment = datetime.datetime.now(datetime.timezone.utc)
+    return (moment + datetime.timedelta(seconds=seconds)).isoformat()
+
+
+async def read_overdue(async_client, uuids, expected=True, timeout=5.0):
+    """Ожидание, пока у задач не станет нужный флаг overdue; возвращает задачи"""
+    for _ in range(int(timeout / 0.05)):
+        tasks = [(await async_client.get(f"api/tasks/{u}")).json() for u in uuids]
+        if all(task["overdue"] is expected for task in tasks):
+            break
+        await asyncio.sleep(0.05)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_create_task_with_priority_and_due_at(async_client):
+    """Тест создания задачи с приоритетом и сроком"""
+    due_at = "2030-01-01T12:00:00Z"
+    response = await async_client.post(
+        "api/tasks/",
+        json={
+            "name": "Urgent task",
+            "status": "created",
+            "priority": 7,
+            "dueAt": due_at,
+        },
+    )
+
+    assert response.status_code == 201
+    task = response.json()
+    assert (task["priority"], task["dueAt"], task["overdue"]) == (7, due_at, False)
+    read = await async_client.get(f"api/tasks/{task['uuid']}")
+    assert read.json() == task
+
+    default = await async_client.post(
+        "api/tasks/", json={"name": "Plain task", "status": "created"}
+    )
+    assert (default.json()["priority"], default.json()["dueAt"]) == (0, None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "fields", [{"priority": -1}, {"priority": 1001}, {"dueAt": "2030-01-01T12:00:00"}]
+)
+async def test_create_task_invalid_priority_or_due_at(async_client, fields):
+    """Тест валидации приоритета и срока (срок обязательно с часовым поясом)"""
+    response = await async_client.post(
+        "api/tasks/", json={"name": "Invalid task", "status": "created", **fields}
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_by_priority_pages_in_queue_order(async_client):
+    """Тест постраничного списка по приоритету: приоритет, срок (без срока в конце), создание"""
+    fields = [
+        (0, None),
+        (5, "2030-01-02T00:00:00Z"),
+        (5, None),
+        (9, None),
+        (5, "2030-01-01T00:00:00Z"),
+        (0, "2030-01-01T00:00:00Z"),
+        (5, None),
+    ]
+    created = []
+    for i, (priority, due_at) in enumerate(fields):
+        response = await async_client.post(
+            "api/tasks/",
+            json={
+                "name": f"Queued task {i}",
+                "status": "created",
+                "priority": priority,
+                "dueAt": due_at,
+            },
+        )
+        created.append(response.json())
+
+    names, params = [], {"status": "created", "order": "priority", "limit": 2}
+    while True:
+        page = (await async_client.get("api/tasks/", params=params)).json()
+        names += [task["name"] for task in page["items"]]
+        if page["nextCursor"] is None:
+            break
+        params["cursor"] = page["nextCursor"]
+
+    assert names == [f"Queued task {i}" for i in (3, 4, 1, 2, 6, 5, 0)]
+    created_cursor = (await async_client.get("api/tasks/", params={"limit": 1})).json()
+    wrong_order = await async_client.get(
+        "api/tasks/",
+        params={
+            "status": "created",
+            "order": "priority",
+            "cursor": created_cursor["nextCursor"],
+        },
+    )
+    assert wrong_order.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [[], ["created", "in_work"]])
+async def test_list_by_priority_needs_one_status(async_client, status):
+    """Тест, что порядок по приоритету требует ровно одного статуса в фильтре"""
+    response = await async_client.get(
+        "api/tasks/", params={"order": "priority", "status": status}
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_update_rejects_null_priority(async_client):
+    """Тест, что приоритет нельзя сбросить в null"""
+    response = await async_client.post(
+        "api/tasks/", json={"name": "Prioritized task", "status": "created"}
+    )
+
+    update = await async_client.put(
+        f"api/tasks/{response.json()['uuid']}", json={"priority": None}
+    )
+
+    assert update.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_most_urgent_first(async_client):
+    """Тест, что claim берёт задачи по приоритету, затем по ближайшему сроку"""
+    tasks = {}
+    for name, priority, due_at in [
+        ("Old low task", 0, None),
+        ("High no due task", 5, None),
+        ("High later task", 5, "2030-01-02T00:00:00Z"),
+        ("High sooner task", 5, "2030-01-01T00:00:00Z"),
+    ]:
+        response = await async_client.post(
+            "api/tasks/",
+            json={
+                "name": name,
+                "status": "created",
+                "priority": priority,
+                "dueAt": due_at,
+            },
+        )
+        tasks[name] = response.json()["uuid"]
+
+    response = await async_client.post("api/tasks/claim", params={"n": 3})
+
+    assert [task["uuid"] for task in response.json()] == [
+        tasks["High sooner task"],
+        tasks["High later task"],
+        tasks["High no due task"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_flags_due_tasks_in_one_batch(async_client, db_statements):
+    """Тест, что планировщик помечает наступившие задачи одним запросом в срок"""
+    due_at = due_in(0.5)
+    response = await async_client.post(
+        "api/tasks/bulk",
+        json=[
+            {"name": "Due task 1", "status": "created", "dueAt": due_at},
+            {"name": "Due task 2", "status": "in_work", "dueAt": due_at},
+            {"name": "Due task 3", "status": "created", "dueAt": due_at},
+            {"name": "Done due task", "status": "done", "dueAt": due_at},
+            {"name": "Later task", "status": "created", "dueAt": due_in(600)},
+        ],
+    )
+    uuids = [task["uuid"] for task in response.json()]
+
+    due = await read_overdue(async_client, uuids[:3])
+
+    assert [task["overdue"] for task in due] == [True] * 3
+    assert all(
+        datetime.datetime.fromisoformat(task["updatedAt"].replace("Z", "+00:00"))
+        >= datetime.datetime.fromisoformat(due_at)
+        for task in due
+    )
+    others = [(await async_client.get(f"api/tasks/{u}")).json() for u in uuids[3:]]
+    assert [task["overdue"] for task in others] == [False, False]
+    assert len([s for s in db_statements if "overdue=" in s]) == 1
+
+
+@pytest.mark.asyncio
+async def test_rescheduling_moves_and_clears_overdue(async_client):
+    """Тест переноса срока: раньше — задача помечается, позже — флаг снимается"""
+    response = await async_client.post(
+        "api/tasks/",
+        json={"name": "Moved task", "status": "created", "dueAt": due_in(3600)},
+    )
+    task_uuid = response.json()["uuid"]
+
+    await async_client.put(f"api/tasks/{task_uuid}", json={"dueAt": due_in(0.2)})
+    [flagged] = await read_overdue(async_client, [task_uuid])
+    assert flagged["overdue"] is True
+
+    moved = await async_client.put(
+        f"api/tasks/{task_uuid}", json={"dueAt": due_in(600)}
+    )
+    assert moved.json()["overdue"] is False
+    await asyncio.sleep(0.3)
+    [task] = await read_overdue(async_client, [task_uuid], timeout=0.1)
+    assert task["overdue"] is False
+
+
+@pytest.mark.asyncio
+async def test_reload_picks_up_tasks_beyond_horizon(async_client, monkeypatch):
+    """Тест, что задачи за горизонтом планировщик находит при следующей загрузке"""
+    monkeypatch.setattr(task_due_scheduler, "horizon", datetime.timedelta(0))
+    await task_due_scheduler.reload()
+    response = await async_client.post(
+        "api/tasks/",
+        json={"name": "Far task", "status": "created", "dueAt": due_in(0.2)},
+    )
+    task_uuid = response.json()["uuid"]
+    await asyncio.sleep(0.4)
+
+    assert len(task_due_scheduler) == 0
+    [task] = await read_overdue(async_client, [task_uuid], timeout=0.1)
+    assert task["overdue"] is False
+
+    await task_due_scheduler.reload()
+    [task] = await read_overdue(async_client, [task_uuid])
+    assert task["overdue"] is True
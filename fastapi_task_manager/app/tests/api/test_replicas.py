@@ -0,0 +1,113 @@
+# pylint:disable=redefined-outer-name,no-member
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+
+from app.api.dependencies.session import PRIMARY_PIN_COOKIE
+from app.config.manager import settings
+from app.repository.database import async_db
+from app.repository.listener import db_listener
+
+
+@pytest_asyncio.fixture
+async def replica_statements():
+    """Фикстура реплики (та же БД через отдельный пул) и списка её SQL-запросов"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    replica_engine = async_db.add_replica(str(async_db.postgres_uri))
+    event.listen(replica_engine.sync_engine, "before_cursor_execute", on_execute)
+    yield statements
+    async_db.replica_engines.remove(replica_engine)
+    async_db.mark_replica_unhealthy(replica_engine)
+    await replica_engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def dead_replica():
+    """Фикстура недоступной реплики"""
+    replica_engine = async_db.add_replica(
+        f"postgresql://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@"
+        f"{settings.POSTGRES_HOST}:1/{settings.POSTGRES_DB}"
+    )
+    yield replica_engine
+    async_db.replica_engines.remove(replica_engine)
+    async_db.mark_replica_unhealthy(replica_engine)
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_and_writes_to_primary(
+    async_client, db_statements, replica_statements
+):
+    """Тест, что GET читает с реплики, а запись идёт в основную БД"""
+    await async_client.get("api/tasks/")
+    assert replica_statements
+    assert not db_statements
+
+    replica_statements.clear()
+    response = await async_client.post(
+        "api/tasks/", json={"name": "replica task", "status": "created"}
+    )
+    assert response.status_code == 201
+    assert db_statements
+    assert not replica_statements
+
+
+@pytest.mark.asyncio
+async def test_client_is_pinned_to_primary_after_write(
+    async_client, db_statements, replica_statements
+):
+    """Тест read-your-writes: после записи клиент читает из основной БД"""
+    response = await async_client.post(
+        "api/tasks/", json={"name": "pinned task", "status": "created"}
+    )
+    assert PRIMARY_PIN_COOKIE in response.cookies
+
+    db_statements.clear()
+    response = await async_client.get("api/tasks/")
+
+    assert [task["name"] for task in response.json()["items"]] == ["pinned task"]
+    assert db_statements
+    assert not replica_statements
+
+
+@pytest.mark.asyncio
+async def test_task_cache_miss_reads_replica(
+    create_task, async_client, db_statements, replica_statements, monkeypatch
+):
+    """Тест, что промах кеша задачи читает реплику, а без слушателя NOTIFY — основную БД"""
+    task = await create_task("cached task")
+    async_client.cookies.clear()
+    db_statements.clear()
+
+    response = await async_client.get(f"api/tasks/{task['uuid']}")
+
+    assert response.json()["name"] == "cached task"
+    assert replica_statements
+    assert not db_statements
+
+    replica_statements.clear()
+    monkeypatch.setattr(type(db_listener), "is_connected", property(lambda _: False))
+    response = await async_client.get(f"api/tasks/{task['uuid']}")
+
+    assert response.json()["name"] == "cached task"
+    assert db_statements
+    assert not replica_statements
+
+
+@pytest.mark.asyncio
+async def test_failed_replica_falls_back_to_primary(
+    async_client, db_statements, dead_replica
+):
+    """Тест, что недоступная реплика выводится из ротации и чтение идёт в основную БД"""
+    assert async_db.healthy_replica_engines == [dead_replica]
+
+    await async_db.check_replicas()
+
+    assert not async_db.healthy_replica_engines
+    response = await async_client.get("api/tasks/")
+    assert response.status_code == 200
+    assert db_statements
@@ -0,0 +1,131 @@
+import pytest
+
+from app.config.manager import settings
+from app.repository.database import async_db
+
+
+async def search(async_client, **params):
+    """Поиск задач, возвращает ответ"""
+    return await async_client.get("api/tasks/search", params=params)
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_name_above_description(async_client, create_task):
+    """Тест, что совпадение в названии ранжируется выше совпадения в описании"""
+    await create_task("Buy groceries", description="milk and invoice bread")
+    await create_task("Pay the invoice", description="electricity bill")
+    await create_task("Walk the dog")
+
+    response = await search(async_client, q="invoice")
+
+    assert response.status_code == 200
+    assert [task["name"] for task in response.json()["items"]] == [
+        "Pay the invoice",
+        "Buy groceries",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_web_syntax(async_client, create_task):
+    """Тест синтаксиса веб-поиска: фразы в кавычках и исключение слов"""
+    await create_task("Quarterly report draft")
+    await create_task("Report quarterly numbers")
+    await create_task("Отчёт за квартал", description="годовой report")
+
+    response = await search(async_client, q='"quarterly report"')
+    assert [task["name"] for task in response.json()["items"]] == [
+        "Quarterly report draft"
+    ]
+
+    response = await search(async_client, q="report -quarterly")
+    assert [task["name"] for task in response.json()["items"]] == ["Отчёт за квартал"]
+
+    response = await search(async_client, q="квартал")
+    assert [task["name"] for task in response.json()["items"]] == ["Отчёт за квартал"]
+
+
+@pytest.mark.asyncio
+async def test_search_pagination(async_client, create_task):
+    """Тест постраничной выдачи поиска по курсору без пропусков и повторов"""
+    created = {
+        (await create_task(f"search page {i}", description="page " * i))["uuid"]
+        for i in range(1, 6)
+    }
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "page", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await search(async_client, **params)).json()
+        seen.extend(task["uuid"] for task in page["items"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(created)
+    assert set(seen) == created
+
+
+@pytest.mark.asyncio
+async def test_search_beyond_candidates_is_truncated(
+    async_client, create_task, monkeypatch
+):
+    """Тест, что при совпадениях сверх кандидатов ранжируются самые новые, а ответ помечен"""
+    monkeypatch.setattr(settings, "TASK_SEARCH_CANDIDATES", 3)
+    await create_task("Oldest budget budget budget", description="budget")
+    for name in ("Second budget", "Third budget", "Newest budget"):
+        await create_task(name)
+
+    names, cursor, pages = [], None, []
+    while True:
+        params = {"q": "budget", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = (await search(async_client, **params)).json()
+        pages.append(page["truncated"])
+        names += [task["name"] for task in page["items"]]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert sorted(names) == ["Newest budget", "Second budget", "Third budget"]
+    assert pages == [True, True]
+
+    monkeypatch.setattr(settings, "TASK_SEARCH_CANDIDATES", 4)
+    page = (await search(async_client, q="budget")).json()
+    assert page["items"][0]["name"] == "Oldest budget budget budget"
+    assert len(page["items"]) == 4
+    assert page["truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_search_follows_updates(async_client, create_task):
+    """Тест, что поисковый вектор пересчитывается при обновлении задачи"""
+    task = await create_task("Initial title")
+
+    await async_client.put(f"api/tasks/{task['uuid']}", json={"name": "Renamed task"})
+
+    assert (await search(async_client, q="initial")).json()["items"] == []
+    response = await search(async_client, q="renamed")
+    assert [found["uuid"] for found in response.json()["items"]] == [task["uuid"]]
+
+
+@pytest.mark.asyncio
+async def test_search_invalid_params(async_client):
+    """Тест валидации параметров поиска"""
+    assert (await search(async_client, q="")).status_code == 422
+    assert (await search(async_client, q="x", cursor="bad")).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_fuzzy_search(async_client, create_task):
+    """Тест нечёткого поиска по триграммам (если установлен pg_trgm)"""
+    await create_task("Refactor authentication")
+
+    response = await search(async_client, q="authentcation", fuzzy=True)
+
+    if "pg_trgm" not in async_db.extensions:
+        assert response.status_code == 501
+        pytest.skip("pg_trgm is not available on this server")
+    assert [task["name"] for task in response.json()["items"]] == [
+        "Refactor authentication"
+    ]
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+
+from app.repository.database import async_db
+
+
+async def read_stats(async_client):
+    """Получение сводки по статусам"""
+    response = await async_client.get("api/tasks/stats")
+    assert response.status_code == 200
+    return response.json()
+
+
+async def count_tasks_by_status():
+    """Подсчёт задач по статусам прямым запросом к таблице"""
+    async with async_db.async_engine.connect() as conn:
+        rows = await conn.execute(
+            text("SELECT status, count(*) FROM task GROUP BY status")
+        )
+    return dict(rows.all())
+
+
+@pytest.mark.asyncio
+async def test_stats_empty(async_client):
+    """Тест сводки без задач"""
+    assert await read_stats(async_client) == {
+        "total": 0,
+        "byStatus": {"created": 0, "in_work": 0, "done": 0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_writes(async_client, create_task):
+    """Тест, что счётчики учитывают создание, смену статуса и удаление"""
+    first = await create_task("Stats task 1")
+    second = await create_task("Stats task 2")
+    await async_client.post(
+        "api/tasks/bulk",
+        json=[
+            {"name": f"Stats bulk {i}", "description": None, "status": "done"}
+            for i in range(3)
+        ],
+    )
+    await async_client.put(f"api/tasks/{first['uuid']}", json={"status": "in_work"})
+    await async_client.put(f"api/tasks/{second['uuid']}", json={"name": "Renamed"})
+    await async_client.delete(f"api/tasks/{second['uuid']}")
+
+    assert await read_stats(async_client) == {
+        "total": 4,
+        "byStatus": {"created": 0, "in_work": 1, "done": 3},
+    }
+
+
+@pytest.mark.asyncio
+async def test_stats_match_table_under_concurrent_writes(async_client, create_task):
+    """Тест, что счётчики совпадают с таблицей после параллельных записей"""
+    tasks = await asyncio.gather(
+        *(
+            create_task(f"Concurrent {i}", status)
+            for i, status in enumerate(["created", "in_work", "done"] * 10)
+        )
+    )
+    await asyncio.gather(
+        *(
+            async_client.put(f"api/tasks/{task['uuid']}", json={"status": "done"})
+            for task in tasks[::2]
+        )
+    )
+
+    stats = await read_stats(async_client)
+    expected = await count_tasks_by_status()
+
+    assert stats["byStatus"] == {
+        "created": expected.get("CREATED", 0),
+        "in_work": expected.get("WORK", 0),
+        "done": expected.get("DONE", 0),
+    }
+    assert stats["total"] == 30
+
+
+@pytest.mark.asyncio
+async def test_stats_do_not_scan_tasks(async_client, create_task, db_statements):
+    """Тест, что сводка читает только таблицу счётчиков, а не задачи"""
+    await create_task("Stats task")
+    db_statements.clear()
+
+    await read_stats(async_client)
+
+    queries = [statement for statement in db_statements if "SELECT" in statement]
+    assert len(queries) == 1
+    assert "FROM task_status_count" in queries[0]
+    assert "FROM task " not in queries[0]
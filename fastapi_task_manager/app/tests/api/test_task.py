@@ -1,4 +1,7 @@
 # pylint:disable=redefined-outer-name
+import csv
+import io
+import json
 import uuid
 from datetime import datetime
 import pytest
@@ -56,8 +59,7 @@ async def test_get_tasks_empty(async_client):
     """Тест на получение пустого списка задач"""
     response = await async_client.get("api/tasks/")
     assert response.status_code == 200
-    assert response.json() == []
-    assert isinstance(response.json(), list)
+    assert response.json() == {"items": [], "nextCursor": None}
 
 
 @pytest.mark.asyncio
@@ -70,7 +72,7 @@ async def test_get_tasks_with_data(async_client, test_task_create_data):
     # Получаем список
     response = await async_client.get("api/tasks/")
     assert response.status_code == 200
-    tasks = response.json()
+    tasks = response.json()["items"]
 
     assert isinstance(tasks, list)
     assert len(tasks) >= 1
@@ -80,6 +82,151 @@ async def test_get_tasks_with_data(async_client, test_task_create_data):
     assert "createdAt" in tasks[0]
 
 
+@pytest.mark.asyncio
+async def test_get_tasks_pagination(async_client):
+    """Тест постраничного обхода списка задач по курсору"""
+    created = []
+    for i in range(5):
+        response = await create_test_task(
+            async_client, {"name": f"paged task {i}", "status": "created"}
+        )
+        assert response.status_code == 201
+        created.append(response.json()["uuid"])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await async_client.get("api/tasks/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(task["uuid"] for task in page["items"])
+        pages += 1
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == created
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_filtered_by_status(async_client):
+    """Тест фильтрации списка задач по статусу вместе с курсором"""
+    for i, status in enumerate(["created", "in_work", "in_work", "done", "in_work"]):
+        await create_test_task(async_client, {"name": f"status {i}", "status": status})
+
+    response = await async_client.get(
+        "api/tasks/", params={"status": "in_work", "limit": 2}
+    )
+    first_page = response.json()
+    response = await async_client.get(
+        "api/tasks/",
+        params={"status": "in_work", "limit": 2, "cursor": first_page["nextCursor"]},
+    )
+    second_page = response.json()
+
+    names = [task["name"] for task in first_page["items"] + second_page["items"]]
+    assert names == ["status 1", "status 2", "status 4"]
+    assert second_page["nextCursor"] is None
+
+    response = await async_client.get(
+        "api/tasks/", params=[("status", "created"), ("status", "done")]
+    )
+    assert [task["name"] for task in response.json()["items"]] == [
+        "status 0",
+        "status 3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_filtered_by_dates_and_name_prefix(async_client):
+    """Тест фильтрации по диапазонам дат и префиксу имени"""
+    created = []
+    for name in ["alpha task", "alpha_50% task", "beta task"]:
+        response = await create_test_task(
+            async_client, {"name": name, "status": "created"}
+        )
+        created.append(response.json())
+    await async_client.put(f"api/tasks/{created[2]['uuid']}", json={"status": "done"})
+
+    response = await async_client.get(
+        "api/tasks/",
+        params={
+            "createdAfter": created[1]["createdAt"],
+            "createdBefore": created[2]["createdAt"],
+        },
+    )
+    assert [task["name"] for task in response.json()["items"]] == ["alpha_50% task"]
+
+    response = await async_client.get(
+        "api/tasks/", params={"updatedAfter": created[0]["createdAt"]}
+    )
+    assert [task["name"] for task in response.json()["items"]] == ["beta task"]
+
+    response = await async_client.get("api/tasks/", params={"namePrefix": "alpha"})
+    assert len(response.json()["items"]) == 2
+
+    response = await async_client.get("api/tasks/", params={"namePrefix": "alpha_5"})
+    assert [task["name"] for task in response.json()["items"]] == ["alpha_50% task"]
+
+    response = await async_client.get("api/tasks/", params={"namePrefix": "alpha%"})
+    assert response.json()["items"] == []
+
+    response = await async_client.get("api/tasks/", params={"status": "unknown"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_invalid_cursor(async_client):
+    """Тест на невалидный курсор"""
+    response = await async_client.get("api/tasks/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    response = await async_client.get("api/tasks/", params={"limit": 0})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_ndjson(async_client, test_task_create_data):
+    """Тест потоковой выгрузки задач в NDJSON"""
+    created = []
+    for _ in range(3):
+        response = await create_test_task(async_client, test_task_create_data)
+        created.append(response.json())
+
+    response = await async_client.get("api/tasks/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == created
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_csv(async_client, test_task_create_data):
+    """Тест потоковой выгрузки задач в CSV"""
+    response = await async_client.get("api/tasks/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.text.splitlines() == [
+        "uuid,name,description,status,createdAt,updatedAt,priority,dueAt,overdue"
+    ]
+
+    create_response = await create_test_task(async_client, test_task_create_data)
+    response = await async_client.get("api/tasks/export", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["uuid"] == create_response.json()["uuid"]
+    assert rows[0]["status"] == "created"
+    assert rows[0]["updatedAt"] == ""
+
+
 @pytest.mark.asyncio
 async def test_create_task_success(async_client, test_task_create_data):
     """Тест на успешное создание задачи"""
@@ -111,6 +258,60 @@ async def test_create_task_success(async_client, test_task_create_data):
         assert False, "Invalid datetime format"
 
 
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_rows(async_client):
+    """Тест массового создания задач с возвратом строк"""
+    payload = [
+        {"name": f"bulk task {i}", "description": f"bulk {i}", "status": "created"}
+        for i in range(5)
+    ]
+    response = await async_client.post("api/tasks/bulk", json=payload)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [task["name"] for task in data] == [task["name"] for task in payload]
+    assert all("createdAt" in task for task in data)
+
+    response = await async_client.get("api/tasks/")
+    assert len(response.json()["items"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_uuids(async_client):
+    """Тест массового создания задач с возвратом только UUID"""
+    payload = [{"name": f"bulk task {i}", "status": "in_work"} for i in range(3)]
+    response = await async_client.post(
+        "api/tasks/bulk", params={"returning": "uuids"}, json=payload
+    )
+
+    assert response.status_code == 201
+    task_uuids = response.json()
+    assert len(task_uuids) == 3
+
+    response = await async_client.get(f"api/tasks/{task_uuids[1]}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "bulk task 1"
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_invalid_item(async_client):
+    """Тест массового создания с невалидным элементом"""
+    payload = [
+        {"name": "valid bulk task", "status": "created"},
+        {"name": "", "status": "created"},
+    ]
+    response = await async_client.post("api/tasks/bulk", json=payload)
+
+    assert response.status_code == 422
+    assert [error["loc"][:2] for error in response.json()["detail"]] == [["body", 1]]
+
+    response = await async_client.get("api/tasks/")
+    assert response.json()["items"] == []
+
+    response = await async_client.post("api/tasks/bulk", json=[])
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_create_task_minimal_data(async_client, test_task_minimal_data):
     """Тест на создание задачи с минимальными данными"""
@@ -168,6 +369,191 @@ async def test_get_task_by_id_success(async_client, test_task_create_data):
     assert data["status"] == "created"
 
 
+@pytest.mark.asyncio
+async def test_get_task_by_id_cached(
+    async_client, db_statements, test_task_create_data, test_task_update_data
+):
+    """Тест, что повторное чтение задачи обслуживается из кеша до её изменения"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+
+    first = await async_client.get(f"api/tasks/{task_uuid}")
+    db_statements.clear()
+    second = await async_client.get(f"api/tasks/{task_uuid}")
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert db_statements == []
+
+    await async_client.put(f"api/tasks/{task_uuid}", json=test_task_update_data)
+    response = await async_client.get(f"api/tasks/{task_uuid}")
+    assert response.json()["status"] == "in_work"
+
+
+@pytest.mark.asyncio
+async def test_read_paths_select_response_columns(
+    async_client, db_statements, test_task_create_data
+):
+    """Тест, что чтение задач выбирает только поля ответа, без служебных колонок"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+    db_statements.clear()
+
+    list_response = await async_client.get("api/tasks/")
+    task_response = await async_client.get(f"api/tasks/{task_uuid}")
+
+    assert list_response.json()["items"] == [task_response.json()]
+    assert len(db_statements) == 2
+    for statement in db_statements:
+        assert "status_changed_at" not in statement
+        assert "search_vector" not in statement
+
+
+@pytest.mark.asyncio
+async def test_get_task_by_id_not_modified(async_client, test_task_create_data):
+    """Тест условного GET с If-None-Match"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+    etag = create_response.headers["etag"]
+
+    response = await async_client.get(f"api/tasks/{task_uuid}")
+    assert response.headers["etag"] == etag
+
+    response = await async_client.get(
+        f"api/tasks/{task_uuid}", headers={"If-None-Match": f'"other", W/{etag}'}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    update_response = await async_client.put(
+        f"api/tasks/{task_uuid}", json={"status": "done"}
+    )
+    assert update_response.headers["etag"] != etag
+
+    response = await async_client.get(
+        f"api/tasks/{task_uuid}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] == update_response.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_not_modified(async_client, test_task_create_data):
+    """Тест условного GET списка задач"""
+    await create_test_task(async_client, test_task_create_data)
+    response = await async_client.get("api/tasks/")
+    etag = response.headers["etag"]
+
+    response = await async_client.get("api/tasks/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await create_test_task(async_client, test_task_create_data)
+    response = await async_client.get("api/tasks/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_conditional_update_and_delete(async_client, test_task_create_data):
+    """Тест условных PUT и DELETE с If-Match"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+    etag = create_response.headers["etag"]
+
+    response = await async_client.put(
+        f"api/tasks/{task_uuid}", json={"status": "in_work"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["etag"]
+
+    response = await async_client.put(
+        f"api/tasks/{task_uuid}", json={"status": "done"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 412
+
+    response = await async_client.delete(
+        f"api/tasks/{task_uuid}", headers={"If-Match": etag}
+    )
+    assert response.status_code == 412
+
+    response = await async_client.delete(
+        f"api/tasks/{task_uuid}", headers={"If-Match": new_etag}
+    )
+    assert response.status_code == 204
+
+    response = await async_client.delete(
+        f"api/tasks/{task_uuid}", headers={"If-Match": new_etag}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("version", ["f" * 16, "weak"])
+async def test_conditional_update_rejects_unusable_etag(
+    async_client, test_task_create_data, version
+):
+    """Тест 412 для If-Match со слабым ETag или версией за пределами дат"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+    etag = create_response.headers["etag"]
+    if_match = (
+        f"W/{etag}" if version == "weak" else f'"{uuid.UUID(task_uuid).hex}.{version}"'
+    )
+
+    for response in (
+        await async_client.put(
+            f"api/tasks/{task_uuid}",
+            json={"status": "done"},
+            headers={"If-Match": if_match},
+        ),
+        await async_client.delete(
+            f"api/tasks/{task_uuid}", headers={"If-Match": if_match}
+        ),
+    ):
+        assert response.status_code == 412
+
+
+@pytest.mark.asyncio
+async def test_if_match_star_requires_existing_task(
+    async_client, test_task_create_data
+):
+    """Тест If-Match: *: запись в существующую задачу и 412 для несуществующей"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+    missing_uuid = "00000000-0000-0000-0000-000000000000"
+    headers = {"If-Match": "*"}
+
+    response = await async_client.put(
+        f"api/tasks/{task_uuid}", json={"status": "done"}, headers=headers
+    )
+    assert response.status_code == 200
+    response = await async_client.put(
+        f"api/tasks/{missing_uuid}", json={"status": "done"}, headers=headers
+    )
+    assert response.status_code == 412
+    response = await async_client.delete(f"api/tasks/{missing_uuid}", headers=headers)
+    assert response.status_code == 412
+    response = await async_client.delete(f"api/tasks/{task_uuid}", headers=headers)
+    assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_get_with_if_none_match_star(async_client, test_task_create_data):
+    """Тест 304 на If-None-Match: * для существующей задачи и списка"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+
+    response = await async_client.get(
+        f"api/tasks/{task_uuid}", headers={"If-None-Match": "*"}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == create_response.headers["etag"]
+
+    response = await async_client.get("api/tasks/", headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+
+
 @pytest.mark.asyncio
 async def test_get_task_by_id_not_found(async_client):
     """Тест на получение несуществующей задачи"""
@@ -207,6 +593,27 @@ async def test_update_task_success(
     assert data["createdAt"] == original_created_at
 
 
+@pytest.mark.asyncio
+async def test_write_tasks_single_statement(
+    async_client, db_statements, test_task_create_data, test_task_update_data
+):
+    """Тест, что запись задачи выполняется одним запросом с RETURNING"""
+    create_response = await create_test_task(async_client, test_task_create_data)
+    task_uuid = create_response.json()["uuid"]
+
+    for method, kwargs in (
+        ("PUT", {"json": test_task_update_data}),
+        ("DELETE", {}),
+    ):
+        db_statements.clear()
+        response = await async_client.request(
+            method, f"api/tasks/{task_uuid}", **kwargs
+        )
+        assert response.status_code < 300
+        assert len(db_statements) == 1
+        assert "RETURNING" in db_statements[0]
+
+
 @pytest.mark.asyncio
 async def test_update_task_partial_data(async_client, test_task_create_data):
     """Тест на частичное обновление задачи"""
@@ -0,0 +1,167 @@
+# pylint:disable=redefined-outer-name
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+
+from app.repository.database import async_db
+from app.repository.leases import requeue_expired_tasks
+
+SEEDED_TASKS = 50000
+
+
+@pytest_asyncio.fixture
+async def seeded_tasks(async_client):
+    """Фикстура с большой таблицей задач и собранной статистикой планировщика"""
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            text(
+                """
+                INSERT INTO task (uuid, name, status, created_at, updated_at)
+                SELECT
+                    gen_random_uuid(),
+                    'task ' || n,
+                    CASE
+                        WHEN n % 50 = 0 THEN 'WORK'
+                        WHEN n % 2 = 0 THEN 'DONE'
+                        ELSE 'CREATED'
+                    END::taskstatus,
+                    timestamptz '2024-01-01' + n * interval '1 minute',
+                    CASE WHEN n % 2 = 0
+                        THEN timestamptz '2024-01-01' + n * interval '2 minute'
+                    END
+                FROM generate_series(1, :rows) AS n
+                """
+            ),
+            {"rows": SEEDED_TASKS},
+        )
+    # VACUUM also flushes the GIN pending list, as autovacuum would on a live table
+    async with async_db.async_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE task"))
+    return async_client
+
+
+@pytest_asyncio.fixture
+async def explain_query(seeded_tasks):
+    """Фикстура, возвращающая план запроса, который выполнил маршрут"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, *args):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    engine = async_db.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+
+    async def explain(path, params, method="GET"):
+        statements.clear()
+        response = await seeded_tasks.request(method, path, params=params)
+        assert response.status_code == 200
+        statement, parameters = statements[-1]
+        async with async_db.async_engine.connect() as conn:
+            plan = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            return "\n".join(row[0] for row in plan)
+
+    yield explain
+    event.remove(engine, "before_cursor_execute", on_execute)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params, indexes",
+    [
+        # both indexes lead with status, and either may win for so few tasks in work
+        (
+            {"status": "in_work"},
+            ("ix_task_status_created_at_uuid", "ix_task_status_priority_due_at"),
+        ),
+        (
+            {
+                "createdAfter": "2024-01-10T00:00:00Z",
+                "createdBefore": "2024-01-11T00:00:00Z",
+            },
+            ("ix_task_created_at_uuid",),
+        ),
+        (
+            {
+                "updatedAfter": "2024-01-20T00:00:00Z",
+                "updatedBefore": "2024-01-20T06:00:00Z",
+            },
+            ("ix_task_updated_at",),
+        ),
+        ({"namePrefix": "task 42424"}, ("ix_task_name_pattern",)),
+    ],
+)
+async def test_filtered_list_uses_index(explain_query, params, indexes):
+    """Тест по EXPLAIN, что отфильтрованный список читается по индексу, а не полным сканом"""
+    plan = await explain_query("api/tasks/", params)
+
+    assert any(index in plan for index in indexes)
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.asyncio
+async def test_search_uses_gin_index(explain_query):
+    """Тест по EXPLAIN, что полнотекстовый поиск идёт по GIN-индексу"""
+    plan = await explain_query("api/tasks/search", {"q": "4242"})
+
+    assert "ix_task_search_vector" in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.asyncio
+async def test_claim_uses_queue_index(explain_query):
+    """Тест по EXPLAIN, что claim ищет новые задачи по индексу очереди без сортировки"""
+    plan = await explain_query("api/tasks/claim", {"n": 10}, method="POST")
+
+    assert "ix_task_status_priority_due_at" in plan
+    assert "Sort" not in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.asyncio
+async def test_priority_list_uses_queue_index(explain_query, seeded_tasks):
+    """Тест по EXPLAIN, что список по приоритету со статусом идёт по индексу очереди"""
+    params = {"status": "created", "order": "priority", "limit": 10}
+    first = await explain_query("api/tasks/", params)
+    page = await seeded_tasks.get("api/tasks/", params=params)
+    cursor = page.json()["nextCursor"]
+    second = await explain_query("api/tasks/", {**params, "cursor": cursor})
+
+    for plan in (first, second):
+        assert "ix_task_status_priority_due_at" in plan
+        assert "Sort" not in plan
+        assert "Seq Scan" not in plan
+
+
+@pytest.mark.asyncio
+async def test_lease_reaper_uses_lease_index(seeded_tasks):
+    """Тест по EXPLAIN, что поиск истёкших аренд идёт по индексу, а не полным сканом"""
+    # pylint: disable=unused-argument
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            text(
+                "UPDATE task SET owner = 'worker', "
+                "lease_expires_at = now() + (created_at - timestamptz '2024-02-01') "
+                "WHERE status = 'WORK'"
+            )
+        )
+        await conn.execute(text("ANALYZE task"))
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    engine = async_db.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        assert await requeue_expired_tasks() > 0
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    statement, parameters = next(s for s in statements if "lease_expires_at <" in s[0])
+    async with async_db.async_engine.connect() as conn:
+        plan = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        plan = "\n".join(row[0] for row in plan)
+    assert "ix_task_lease_expires_at" in plan
+    assert "Seq Scan" not in plan
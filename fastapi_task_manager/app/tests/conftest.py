@@ -5,9 +5,12 @@ import fastapi
 import httpx
 import pytest
 import pytest_asyncio
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.main import initialize_backend_application
+from app.repository.database import async_db
+from app.repository.table import Base
 
 
 @pytest.fixture
@@ -22,6 +25,35 @@ def sample_task_data():
     return {"name": "Test Task", "description": "Test Description", "status": "created"}
 
 
+@pytest.fixture
+def create_task(async_client):
+    """Фикстура создания задачи через API; возвращает созданную задачу"""
+
+    async def create(name, status="created", description=None):
+        response = await async_client.post(
+            "api/tasks/",
+            json={"name": name, "description": description, "status": status},
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    return create
+
+
+@pytest.fixture
+def db_statements():
+    """Фикстура со списком SQL-запросов, отправленных в БД во время теста"""
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = async_db.async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", on_execute)
+
+
 @pytest_asyncio.fixture(name="backend_test_app")
 def backend_test_app() -> fastapi.FastAPI:
     """
@@ -36,9 +68,19 @@ async def initialize_backend_test_application(
     backend_test_app: fastapi.FastAPI,
 ) -> fastapi.FastAPI:  # type: ignore
     async with asgi_lifespan.LifespanManager(backend_test_app):
+        await truncate_db_tables()
         yield backend_test_app
 
 
+async def truncate_db_tables() -> None:
+    """
+    Startup migrates the schema without touching data, so every test empties the tables.
+    """
+    table_names = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {table_names}"))
+
+
 @pytest_asyncio.fixture(name="async_client")
 async def async_client(
     initialize_backend_test_application: fastapi.FastAPI,
@@ -0,0 +1,71 @@
+import pytest
+from app.repository.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUTTLCache:
+    """Unit-тесты для LRU+TTL кеша"""
+
+    @pytest.fixture
+    def clock(self):
+        """Фикстура управляемых часов"""
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(self, clock):
+        """Фикстура кеша на две записи"""
+        return LRUTTLCache(max_size=2, ttl=10, clock=clock)
+
+    def test_cache_hit_and_miss(self, cache):
+        """Тест попаданий и промахов"""
+        assert cache.get("a") is None
+        cache.set("a", b"1")
+
+        assert cache.get("a") == b"1"
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_cache_lru_eviction(self, cache):
+        """Тест вытеснения давно неиспользуемой записи"""
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.get("a")
+        cache.set("c", b"3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert cache.stats["evictions"] == 1
+
+    def test_cache_ttl_expiration(self, cache, clock):
+        """Тест устаревания записи по TTL"""
+        cache.set("a", b"1")
+        clock.now = 10
+
+        assert cache.get("a") is None
+        assert cache.stats["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_cache_invalidate(self, cache):
+        """Тест инвалидации и отбрасывания устаревшего значения"""
+        cache.set("a", b"1")
+        epoch = cache.epoch
+        cache.invalidate("a")
+        cache.set("a", b"stale", epoch=epoch)
+
+        assert cache.get("a") is None
+
+    def test_cache_disabled(self):
+        """Тест отключённого кеша"""
+        cache = LRUTTLCache(max_size=0, ttl=10)
+        cache.set("a", b"1")
+
+        assert cache.get("a") is None
+        assert cache.stats["misses"] == 0
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import uuid
+import pytest
+
+from app.repository.changes import (
+    EVICTED_FRAME,
+    HEARTBEAT_FRAME,
+    RESET_FRAME,
+    TaskChangeFeed,
+    format_task_change_frame,
+)
+
+
+def notification(event_id, event="task.updated", status="WORK"):
+    """Полезная нагрузка NOTIFY task_changes, как её отправляет триггер"""
+    task = {"uuid": str(uuid.uuid4())}
+    if event != "task.deleted":
+        task.update(
+            name="Changed task",
+            description=None,
+            status=status,
+            created_at="2026-10-18T10:00:00.5+00:00",
+            updated_at=None,
+        )
+    return json.dumps({"id": event_id, "event": event, "task": task})
+
+
+def data_of(frame):
+    """JSON из строки data кадра SSE"""
+    [line] = [line for line in frame.split(b"\n") if line.startswith(b"data: ")]
+    return json.loads(line[len(b"data: ") :])
+
+
+async def next_chunk(stream):
+    """Следующий кусок потока или None, если поток закончился"""
+    async for chunk in stream:
+        return chunk
+    return None
+
+
+class TestTaskChangeFeed:
+    """Unit-тесты для раздачи изменений задач подписчикам"""
+
+    @pytest.fixture
+    def feed(self):
+        """Фикстура ленты на три события в буфере и два кадра в очереди"""
+        return TaskChangeFeed(buffer_size=3, queue_size=2, max_subscribers=2)
+
+    def test_frame_matches_task_response(self):
+        """Тест кадра события: id, тип и задача в формате ответов API"""
+        event_id, frame = format_task_change_frame(notification(7))
+
+        assert event_id == 7
+        assert frame.startswith(b"id: 7\nevent: task.updated\ndata: ")
+        assert frame.endswith(b"\n\n")
+        data = data_of(frame)
+        assert data["task"]["status"] == "in_work"
+        assert data["task"]["createdAt"] == "2026-10-18T10:00:00.500000Z"
+        assert data["task"]["updatedAt"] is None
+
+    def test_deleted_frame_carries_only_uuid(self):
+        """Тест, что событие удаления содержит только uuid задачи"""
+        _, frame = format_task_change_frame(notification(8, event="task.deleted"))
+
+        assert list(data_of(frame)["task"]) == ["uuid"]
+
+    def test_publish_fans_out_to_every_subscriber(self, feed):
+        """Тест рассылки события всем подписчикам"""
+        first, second = feed.subscribe(), feed.subscribe()
+        feed.publish(notification(1))
+
+        assert len(first.frames) == len(second.frames) == 1
+        assert first.frames[0] is second.frames[0]
+        assert first.ready.is_set()
+        assert feed.is_full
+
+    def test_bad_notification_is_skipped(self, feed):
+        """Тест, что некорректное уведомление не ломает ленту"""
+        subscriber = feed.subscribe()
+        feed.publish("not json")
+        feed.publish(notification(1, status="UNKNOWN"))
+
+        assert not subscriber.frames
+        assert feed.counters["published"] == 0
+
+    def test_slow_subscriber_is_evicted(self, feed):
+        """Тест отключения подписчика, переполнившего очередь"""
+        slow = feed.subscribe()
+        for event_id in range(1, 4):
+            feed.publish(notification(event_id))
+        feed.publish(notification(4))
+
+        assert list(slow.frames) == [EVICTED_FRAME]
+        assert slow.closed
+        assert feed.counters["evicted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_burst_is_queued_as_one_chunk(self, feed):
+        """Тест, что пачка уведомлений одного запроса занимает в очереди один кусок"""
+        subscriber = feed.subscribe()
+        for event_id in range(1, 151):
+            feed.publish(notification(event_id))
+        assert not subscriber.frames
+
+        await asyncio.sleep(0)
+        [chunk] = subscriber.frames
+        assert chunk.count(b"event: task.updated\n") == 150
+        assert not subscriber.closed
+
+        for event_id in range(151, 153):
+            feed.publish(notification(event_id))
+            await asyncio.sleep(0)
+        assert list(subscriber.frames) == [EVICTED_FRAME]
+
+    def test_resume_replays_events_after_id(self, feed):
+        """Тест продолжения с id: повтор событий после него одним кадром"""
+        for event_id in (10, 11, 12, 13):
+            feed.publish(notification(event_id))
+
+        subscriber = feed.subscribe(last_event_id=11)
+        [replay] = subscriber.frames
+        assert replay.startswith(b"id: 12\n")
+        assert b"id: 13\n" in replay
+        assert not feed.subscribe(last_event_id=13).frames
+
+    def test_resume_from_unknown_id_resets(self, feed):
+        """Тест сброса при продолжении с вытесненного из буфера id"""
+        for event_id in (10, 11, 12, 13):
+            feed.publish(notification(event_id))
+
+        assert list(feed.subscribe(last_event_id=10).frames) == [RESET_FRAME]
+
+    def test_reset_clears_buffer(self, feed):
+        """Тест сброса после потери уведомлений"""
+        feed.publish(notification(1))
+        subscriber = feed.subscribe()
+        feed.reset()
+
+        assert list(subscriber.frames) == [RESET_FRAME]
+        assert list(feed.subscribe(last_event_id=1).frames) == [RESET_FRAME]
+
+    @pytest.mark.asyncio
+    async def test_stream_subscribes_until_closed(self, feed):
+        """Тест потока: подписка при старте, отдача кадров, отписка после закрытия"""
+        stream = feed.stream()
+        assert not feed.subscribers
+
+        first = asyncio.ensure_future(next_chunk(stream))
+        await asyncio.sleep(0)
+        assert len(feed.subscribers) == 1
+        await feed.heartbeat()
+        assert await first == HEARTBEAT_FRAME
+
+        last = asyncio.ensure_future(next_chunk(stream))
+        await asyncio.sleep(0)
+        feed.close()
+        assert await last is None
+        assert not feed.subscribers
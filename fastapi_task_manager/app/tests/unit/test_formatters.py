@@ -0,0 +1,79 @@
+import datetime
+import uuid
+import pytest
+from app.utils.formatters.cursor_formatter import (
+    format_cursor_from_queue_key,
+    format_cursor_from_task_key,
+    format_queue_key_from_cursor,
+    format_task_key_from_cursor,
+)
+from app.utils.formatters.etag_formatter import (
+    format_etags_from_header,
+    format_task_etag,
+    format_task_versions_from_etags,
+)
+
+
+class TestCursorFormatter:
+    """Unit-тесты для курсоров пагинации"""
+
+    def test_cursor_round_trip(self):
+        """Тест кодирования и декодирования курсора"""
+        created_at = datetime.datetime(
+            2025, 1, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc
+        )
+        task_uuid = uuid.uuid4()
+
+        cursor = format_cursor_from_task_key(created_at, task_uuid)
+
+        assert "=" not in cursor
+        assert format_task_key_from_cursor(cursor) == (created_at, task_uuid)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "WyJ4IiwieSJd"])
+    def test_cursor_invalid(self, cursor):
+        """Тест невалидного курсора"""
+        with pytest.raises(ValueError):
+            format_task_key_from_cursor(cursor)
+
+    @pytest.mark.parametrize(
+        "due_at", [None, datetime.datetime(2025, 1, 2, tzinfo=datetime.timezone.utc)]
+    )
+    def test_queue_cursor_round_trip(self, due_at):
+        """Тест курсора порядка очереди, со сроком и без"""
+        created_at = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        key = (7, due_at, created_at, uuid.uuid4())
+
+        assert format_queue_key_from_cursor(format_cursor_from_queue_key(*key)) == key
+
+    def test_queue_cursor_rejects_created_cursor(self):
+        """Тест, что курсор порядка по созданию не подходит для порядка очереди"""
+        cursor = format_cursor_from_task_key(datetime.datetime.now(), uuid.uuid4())
+
+        with pytest.raises(ValueError):
+            format_queue_key_from_cursor(cursor)
+
+
+class TestETagFormatter:
+    """Unit-тесты для ETag задач"""
+
+    def test_task_etag_version_round_trip(self):
+        """Тест извлечения версии задачи из ETag"""
+        task_uuid = uuid.uuid4()
+        created_at = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        updated_at = created_at + datetime.timedelta(seconds=1, microseconds=7)
+
+        etag = format_task_etag(task_uuid, created_at, updated_at)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag != format_task_etag(task_uuid, created_at, None)
+        assert format_task_versions_from_etags(task_uuid, [etag]) == [updated_at]
+        assert not format_task_versions_from_etags(uuid.uuid4(), [etag])
+        assert not format_task_versions_from_etags(task_uuid, ['"garbage"'])
+        oversized = f'"{task_uuid.hex}.{"f" * 16}"'
+        assert not format_task_versions_from_etags(task_uuid, [oversized])
+
+    def test_etags_from_header(self):
+        """Тест разбора заголовков If-None-Match / If-Match"""
+        assert format_etags_from_header(None) == set()
+        assert format_etags_from_header('"a", W/"b" ,*') == {'"a"', '"b"', "*"}
+        assert format_etags_from_header('"a", W/"b"', strong=True) == {'"a"'}
@@ -3,8 +3,8 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repository.crud.task import TaskCRUDRepository
-from app.models.schemas.task import TaskCreate, TaskUpdate
-from app.models.db.task import Task, TaskStatus
+from app.models.schemas.task import TaskBulkReturning, TaskCreate, TaskUpdate
+from app.models.db.task import TaskStatus
 from app.utils.exceptions.database import EntityDoesNotExist
 
 
@@ -16,6 +16,7 @@ class TestTaskCRUDRepository:
         """Фикстура мок-сессии"""
         session = AsyncMock(spec=AsyncSession)
         session.execute = AsyncMock()
+        session.scalars = AsyncMock()
         session.commit = AsyncMock()
         session.refresh = AsyncMock()
         return session
@@ -31,39 +32,61 @@ class TestTaskCRUDRepository:
         task_create = TaskCreate(
             name="Test Task", description="Test Description", status=TaskStatus.CREATED
         )
+        mock_task = MagicMock()
+        mock_session.scalars.return_value = MagicMock()
+        mock_session.scalars.return_value.one.return_value = mock_task
 
         result = await task_repo.create_task(task_create)
 
-        assert isinstance(result, Task)
-        mock_session.add.assert_called_once()
+        assert result == mock_task
+        mock_session.scalars.assert_called_once()
+        mock_session.add.assert_not_called()
+        mock_session.commit.assert_called_once()
+        mock_session.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_tasks_uuids(self, task_repo, mock_session):
+        """Тест массового создания задач без RETURNING"""
+        tasks_create = [
+            TaskCreate(name=f"Test Task {i}", status=TaskStatus.CREATED)
+            for i in range(3)
+        ]
+
+        result = await task_repo.create_tasks(
+            tasks_create, returning=TaskBulkReturning.UUIDS
+        )
+
+        assert len(result) == 3
+        assert all(isinstance(task_uuid, uuid.UUID) for task_uuid in result)
+        mock_session.execute.assert_called_once()
+        inserted = mock_session.execute.call_args.args[1]
+        assert [row["uuid"] for row in inserted] == result
         mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_read_tasks(self, task_repo, mock_session):
         """Тест чтения всех задач"""
-        mock_task = MagicMock()
+        task_uuid = uuid.uuid4()
         mock_session.execute.return_value = MagicMock()
-        mock_session.execute.return_value.scalars.return_value.all.return_value = [
-            mock_task
-        ]
+        mock_session.execute.return_value.keys.return_value = ["uuid", "name"]
+        mock_session.execute.return_value.all.return_value = [(task_uuid, "Task")]
 
         results = await task_repo.read_tasks()
 
-        assert len(results) == 1
+        assert results == [{"uuid": task_uuid, "name": "Task"}]
         mock_session.execute.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_read_task_by_uuid_found(self, task_repo, mock_session):
         """Тест чтения существующей задачи"""
         task_uuid = uuid.uuid4()
-        mock_task = MagicMock()
         mock_session.execute.return_value = MagicMock()
-        mock_session.execute.return_value.scalar.return_value = mock_task
+        mock_session.execute.return_value.keys.return_value = ["uuid", "name"]
+        mock_session.execute.return_value.all.return_value = [(task_uuid, "Task")]
 
         result = await task_repo.read_task_by_uuid(task_uuid)
 
-        assert result == mock_task
+        assert result == {"uuid": task_uuid, "name": "Task"}
         mock_session.execute.assert_called_once()
 
     @pytest.mark.asyncio
@@ -71,7 +94,7 @@ class TestTaskCRUDRepository:
         """Тест чтения несуществующей задачи"""
         task_uuid = uuid.uuid4()
         mock_session.execute.return_value = MagicMock()
-        mock_session.execute.return_value.scalar.return_value = None
+        mock_session.execute.return_value.all.return_value = []
 
         with pytest.raises(EntityDoesNotExist):
             await task_repo.read_task_by_uuid(task_uuid)
@@ -81,27 +104,49 @@ class TestTaskCRUDRepository:
         """Тест обновления задачи"""
         task_uuid = uuid.uuid4()
         mock_task = MagicMock()
-        mock_session.execute.return_value = MagicMock()
-        mock_session.execute.return_value.scalar.return_value = mock_task
+        mock_session.scalars.return_value = MagicMock()
+        mock_session.scalars.return_value.one_or_none.return_value = mock_task
 
         task_update = TaskUpdate(name="Updated Name")
         result = await task_repo.update_task_by_uuid(task_uuid, task_update)
 
         assert result == mock_task
-        mock_session.execute.assert_called()
+        mock_session.scalars.assert_called_once()
+        mock_session.execute.assert_not_called()
         mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once()
+        mock_session.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_task_by_uuid_not_found(self, task_repo, mock_session):
+        """Тест обновления несуществующей задачи"""
+        mock_session.scalars.return_value = MagicMock()
+        mock_session.scalars.return_value.one_or_none.return_value = None
+
+        with pytest.raises(EntityDoesNotExist):
+            await task_repo.update_task_by_uuid(uuid.uuid4(), TaskUpdate(name="Name"))
+
+        mock_session.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_delete_task_by_uuid(self, task_repo, mock_session):
         """Тест удаления задачи"""
         task_uuid = uuid.uuid4()
-        mock_task = MagicMock()
         mock_session.execute.return_value = MagicMock()
-        mock_session.execute.return_value.scalar.return_value = mock_task
+        mock_session.execute.return_value.scalar.return_value = task_uuid
 
         result = await task_repo.delete_task_by_uuid(task_uuid)
 
         assert "successfully deleted" in result
-        mock_session.execute.assert_called()
+        mock_session.execute.assert_called_once()
         mock_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_task_by_uuid_not_found(self, task_repo, mock_session):
+        """Тест удаления несуществующей задачи"""
+        mock_session.execute.return_value = MagicMock()
+        mock_session.execute.return_value.scalar.return_value = None
+
+        with pytest.raises(EntityDoesNotExist):
+            await task_repo.delete_task_by_uuid(uuid.uuid4())
+
+        mock_session.commit.assert_not_called()
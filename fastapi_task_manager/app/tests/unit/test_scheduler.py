@@ -0,0 +1,64 @@
+import datetime
+import json
+import uuid
+import pytest
+import pytest_asyncio
+
+from app.repository.scheduler import TaskDueScheduler
+
+
+def notification(task_uuid, due_at, status="CREATED", overdue=False):
+    """Полезная нагрузка NOTIFY task_changes с полями, которые читает планировщик"""
+    task = {
+        "uuid": str(task_uuid),
+        "status": status,
+        "overdue": overdue,
+        "due_at": due_at,
+    }
+    return json.dumps({"id": 1, "event": "task.updated", "task": task})
+
+
+class TestTaskDueScheduler:
+    """Unit-тесты для планировщика сроков задач"""
+
+    @pytest_asyncio.fixture
+    async def scheduler(self):
+        """Фикстура планировщика с горизонтом до 2031 года, без загрузки из базы"""
+        scheduler = TaskDueScheduler(horizon=3600, max_size=10, reload_interval=60)
+        # pylint: disable=protected-access
+        scheduler._until = datetime.datetime(2031, 1, 1, tzinfo=datetime.timezone.utc)
+        yield scheduler
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "due_at, expected",
+        [
+            ("2030-01-01T12:00:00.12345+00:00", 123450),
+            ("2030-01-01T15:00:00.5+03:00", 500000),
+            ("2030-01-01T12:00:00+00:00", 0),
+        ],
+    )
+    async def test_observe_parses_postgres_timestamps(
+        self, scheduler, due_at, expected
+    ):
+        """Тест разбора сроков в формате JSON Postgres (дробная часть без нулей в конце)"""
+        task_uuid = uuid.uuid4()
+
+        scheduler.observe(notification(task_uuid, due_at))
+
+        # pylint: disable=protected-access
+        assert scheduler._due[task_uuid] == datetime.datetime(
+            2030, 1, 1, 12, 0, 0, expected, tzinfo=datetime.timezone.utc
+        )
+
+    @pytest.mark.asyncio
+    async def test_observe_drops_done_and_skips_bad_notifications(self, scheduler):
+        """Тест снятия завершённой задачи и пропуска некорректного срока"""
+        task_uuid = uuid.uuid4()
+        scheduler.observe(notification(task_uuid, "2030-01-01T12:00:00+00:00"))
+
+        scheduler.observe(notification(task_uuid, "2030-01-01T12:00:00+00:00", "DONE"))
+        scheduler.observe(notification(uuid.uuid4(), "2030-01-01T12:00:00"))
+
+        assert len(scheduler) == 0
@@ -1,9 +1,12 @@
+import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 import pytest
 from pydantic import ValidationError
+from fastapi.responses import ORJSONResponse
 from app.models.schemas.task import TaskCreate, TaskUpdate, TaskResponse
 from app.models.db.task import TaskStatus
+from app.utils.formatters.datetime_formatter import format_datetime_into_isoformat
 
 
 class TestTaskSchemas:
@@ -81,3 +84,42 @@ class TestTaskSchemas:
         assert response.status == TaskStatus.CREATED
         assert response.created_at == created_at
         assert response.updated_at is None
+
+    @pytest.mark.parametrize(
+        "created_at",
+        [
+            datetime(2025, 1, 1, tzinfo=timezone.utc),
+            datetime(2025, 1, 1, 12, 30, 15, 120000, tzinfo=timezone.utc),
+        ],
+    )
+    def test_task_response_json_compatible(self, created_at):
+        """Тест побайтовой совместимости JSON с прежним форматом дат"""
+        task_data = {
+            "uuid": uuid.uuid4(),
+            "name": 'Задача №1 "quoted"',
+            "description": None,
+            "status": TaskStatus.WORK,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        legacy = json.dumps(
+            {
+                "uuid": str(task_data["uuid"]),
+                "name": task_data["name"],
+                "description": None,
+                "status": "in_work",
+                "createdAt": format_datetime_into_isoformat(created_at),
+                "updatedAt": format_datetime_into_isoformat(created_at),
+                "priority": 0,
+                "dueAt": None,
+                "overdue": False,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+
+        response = TaskResponse(**task_data)
+
+        assert response.model_dump_json(by_alias=True).encode() == legacy
+        content = response.model_dump(mode="json", by_alias=True)
+        assert ORJSONResponse(content=content).body == legacy
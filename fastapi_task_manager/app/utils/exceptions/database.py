@@ -2,3 +2,9 @@ class EntityDoesNotExist(Exception):
     """
     Throw an exception when the data does not exist in the database.
     """
+
+
+class EntityVersionMismatch(Exception):
+    """
+    Throw an exception when a conditional write targets a version of the data that is no longer current.
+    """
@@ -0,0 +1,93 @@
+import base64
+import datetime
+import json
+import typing
+import uuid
+
+
+def _encode_cursor(values: list[typing.Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> typing.Any:
+    return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+
+def format_cursor_from_task_key(
+    created_at: datetime.datetime, task_uuid: uuid.UUID
+) -> str:
+    """
+    Pack the `(created_at, uuid)` keyset position of a task into an opaque url-safe cursor.
+    """
+    return _encode_cursor([created_at.isoformat(), str(task_uuid)])
+
+
+def format_task_key_from_cursor(cursor: str) -> tuple[datetime.datetime, uuid.UUID]:
+    """
+    Unpack a cursor built by `format_cursor_from_task_key`, raise `ValueError` if it is malformed.
+    """
+    try:
+        created_at, task_uuid = _decode_cursor(cursor)
+        return datetime.datetime.fromisoformat(created_at), uuid.UUID(task_uuid)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor - {cursor}") from e
+
+
+def format_cursor_from_search_key(rank: float, task_uuid: uuid.UUID) -> str:
+    """
+    Pack the `(rank, uuid)` position of a search hit into an opaque url-safe cursor; the
+    rank survives the JSON round trip exactly, so the next page resumes right after it.
+    """
+    return _encode_cursor([rank, str(task_uuid)])
+
+
+def format_search_key_from_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """
+    Unpack a cursor built by `format_cursor_from_search_key`, raise `ValueError` if it is malformed.
+    """
+    try:
+        rank, task_uuid = _decode_cursor(cursor)
+        return float(rank), uuid.UUID(task_uuid)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor - {cursor}") from e
+
+
+def format_cursor_from_queue_key(
+    priority: int,
+    due_at: datetime.datetime | None,
+    created_at: datetime.datetime,
+    task_uuid: uuid.UUID,
+) -> str:
+    """
+    Pack the `(priority, due_at, created_at, uuid)` queue position of a task into an opaque
+    url-safe cursor.
+    """
+    return _encode_cursor(
+        [
+            priority,
+            due_at.isoformat() if due_at is not None else None,
+            created_at.isoformat(),
+            str(task_uuid),
+        ]
+    )
+
+
+def format_queue_key_from_cursor(
+    cursor: str,
+) -> tuple[int, datetime.datetime | None, datetime.datetime, uuid.UUID]:
+    """
+    Unpack a cursor built by `format_cursor_from_queue_key`, raise `ValueError` if it is malformed.
+    """
+    try:
+        priority, due_at, created_at, task_uuid = _decode_cursor(cursor)
+        if not isinstance(priority, int):
+            raise TypeError(priority)
+        return (
+            priority,
+            datetime.datetime.fromisoformat(due_at) if due_at is not None else None,
+            datetime.datetime.fromisoformat(created_at),
+            uuid.UUID(task_uuid),
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor - {cursor}") from e
@@ -0,0 +1,60 @@
+import datetime
+import hashlib
+import typing
+import uuid
+
+EPOCH: datetime.datetime = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND: datetime.timedelta = datetime.timedelta(microseconds=1)
+
+
+def format_task_etag(
+    task_uuid: uuid.UUID,
+    created_at: datetime.datetime,
+    updated_at: datetime.datetime | None,
+) -> str:
+    """
+    Strong ETag of a task: its uuid plus the microsecond of its last write, so the version can
+    be read back from an `If-Match` header and checked inside the write statement itself.
+    """
+    version = ((updated_at or created_at) - EPOCH) // MICROSECOND
+    return f'"{task_uuid.hex}.{version:x}"'
+
+
+def format_collection_etag(etags: typing.Iterable[str], *extra: str | None) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for value in (*etags, *extra):
+        digest.update(f"{value},".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def format_etags_from_header(header: str | None, strong: bool = False) -> set[str]:
+    """
+    Parse `If-None-Match` / `If-Match` into a set of ETags. Weak `W/` prefixes are dropped,
+    or with `strong` (`If-Match` compares strongly) weak tags are left out altogether.
+    """
+    if not header:
+        return set()
+    etags = (etag.strip() for etag in header.split(","))
+    if strong:
+        return {etag for etag in etags if etag and not etag.startswith("W/")}
+    return {etag.removeprefix("W/") for etag in etags if etag}
+
+
+def format_task_versions_from_etags(
+    task_uuid: uuid.UUID, etags: typing.Iterable[str]
+) -> list[datetime.datetime]:
+    """
+    Versions of `task_uuid` named by ETags built with `format_task_etag`; ETags of other tasks
+    or in a foreign format match no version.
+    """
+    versions = []
+    for etag in etags:
+        etag_uuid, _, version = etag.strip('"').partition(".")
+        if etag_uuid != task_uuid.hex:
+            continue
+        try:
+            versions.append(EPOCH + int(version, 16) * MICROSECOND)
+        except (ValueError, OverflowError):
+            # not hex, or a version no datetime can hold: it names no write of the task
+            continue
+    return versions
@@ -0,0 +1,30 @@
+import csv
+import io
+import typing
+
+from app.models.schemas.task import TaskResponse
+
+TASK_CSV_HEADER: tuple[str, ...] = tuple(
+    field.alias or name for name, field in TaskResponse.model_fields.items()
+)
+
+
+def format_tasks_into_ndjson(tasks: typing.Iterable[typing.Any]) -> bytes:
+    return b"".join(
+        TaskResponse.model_validate(task).model_dump_json(by_alias=True).encode()
+        + b"\n"
+        for task in tasks
+    )
+
+
+def format_tasks_into_csv(
+    tasks: typing.Iterable[typing.Any], header: bool = False
+) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(TASK_CSV_HEADER)
+    for task in tasks:
+        row = TaskResponse.model_validate(task).model_dump(mode="json", by_alias=True)
+        writer.writerow(row[column] for column in TASK_CSV_HEADER)
+    return buffer.getvalue().encode()
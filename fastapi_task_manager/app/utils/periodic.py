@@ -0,0 +1,71 @@
+import asyncio
+import typing
+
+import loguru
+
+
+async def run_in_batches(
+    batch: typing.Callable[[int], typing.Awaitable[int]], batch_size: int
+) -> int:
+    """
+    Call `batch(batch_size)`, which handles up to `batch_size` rows in a transaction of its
+    own and returns how many, until it comes up short; return the total.
+    """
+    total = 0
+    while True:
+        handled = await batch(batch_size)
+        total += handled
+        if handled < batch_size:
+            return total
+
+
+class PeriodicTask:
+    """
+    Run `callback` every `interval` seconds in the background of the event loop, from
+    `start()` until `stop()`; `wake()` runs it without waiting for the interval to end. A
+    failing run is logged and does not stop the schedule.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        callback: typing.Callable[[], typing.Awaitable[typing.Any]],
+    ):
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.is_running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    def wake(self) -> None:
+        """Run the callback now, or right after the current run if one is in progress."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.callback()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                loguru.logger.exception(f"Periodic Task {self.name} --- Failed: {e!r}")
@@ -0,0 +1,495 @@
+"""
+Throughput, tail latency, errors, CPU and memory of the Django and FastAPI backends.
+
+Replays the same weighted mix of create, list, get, update and delete requests (`--mix`)
+against each running service in turn, with `--concurrency` clients for `--duration`
+seconds, and prints both side by side. Each service is sent its own payloads: Django takes
+HTTP basic auth (`--django-user`, `--django-password`), the author's user id and the
+`CRTE`/`WORK`/`DONE` statuses, FastAPI no auth and `created`/`in_work`/`done`. Gets,
+updates and deletes go to tasks created by the run itself, `--prefill` of them up front;
+they are deleted again at the end unless `--keep` is given. Note that the Django list
+returns every task of the user, the FastAPI one the first page.
+
+CPU time and resident memory are read from `/proc` (Linux only) for the processes
+listening on the service's port and their children - the autoreloader of `runserver`, the
+workers of `uvicorn --workers` - or for `--django-pid` / `--fastapi-pid`. With the
+services in docker, pass the pids of the containers' server processes as seen from the host.
+
+    python -m benchmarks.backends --mix create=1,list=2,get=5,update=1,delete=1 \\
+        --django-url http://127.0.0.1:8000 --django-user admin --django-password admin \\
+        --fastapi-url http://127.0.0.1:8001 --concurrency 32 --duration 30
+"""
+
+import abc
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import typing
+import urllib.parse
+
+import httpx
+
+from benchmarks.latency import format_number, percentiles
+
+OPERATIONS = ("create", "list", "get", "update", "delete")
+
+
+class Backend(abc.ABC):
+    """The requests of one operation against one service, in the payloads it expects."""
+
+    name: str
+    tasks_path: str
+    statuses: tuple[str, ...]
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def client(self, concurrency: int) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.url,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=concurrency),
+        )
+
+    def task_path(self, task_uuid: str) -> str:
+        return f"{self.tasks_path}{task_uuid}"
+
+    def task_payload(self, rng: random.Random) -> dict[str, typing.Any]:
+        return {
+            "name": f"load {rng.random()}",
+            "description": "generated by benchmarks.backends",
+            "status": rng.choice(self.statuses),
+        }
+
+    @abc.abstractmethod
+    def created_uuid(self, response: httpx.Response) -> str:
+        """The uuid of the task a successful create response is about."""
+
+    async def create(
+        self, client: httpx.AsyncClient, rng: random.Random
+    ) -> httpx.Response:
+        return await client.post(self.tasks_path, json=self.task_payload(rng))
+
+    async def list(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get(self.tasks_path)
+
+    async def get(self, client: httpx.AsyncClient, task_uuid: str) -> httpx.Response:
+        return await client.get(self.task_path(task_uuid))
+
+    async def update(
+        self, client: httpx.AsyncClient, rng: random.Random, task_uuid: str
+    ) -> httpx.Response:
+        return await client.put(self.task_path(task_uuid), json=self.task_payload(rng))
+
+    async def delete(self, client: httpx.AsyncClient, task_uuid: str) -> httpx.Response:
+        return await client.delete(self.task_path(task_uuid))
+
+
+class DjangoBackend(Backend):
+    name = "django"
+    tasks_path = "/api/v1/tasks/"
+    statuses = ("CRTE", "WORK", "DONE")
+
+    def __init__(self, url: str, *, user: str, password: str, author: int):
+        super().__init__(url)
+        self.auth = httpx.BasicAuth(user, password)
+        self.author = author
+
+    def client(self, concurrency: int) -> httpx.AsyncClient:
+        client = super().client(concurrency)
+        client.auth = self.auth
+        return client
+
+    def task_path(self, task_uuid: str) -> str:
+        return f"{self.tasks_path}{task_uuid}/"
+
+    def task_payload(self, rng: random.Random) -> dict[str, typing.Any]:
+        return {**super().task_payload(rng), "author": self.author}
+
+    def created_uuid(self, response: httpx.Response) -> str:
+        return response.json()["task"]["uuid"]
+
+
+class FastAPIBackend(Backend):
+    name = "fastapi"
+    tasks_path = "/api/tasks/"
+    statuses = ("created", "in_work", "done")
+
+    def created_uuid(self, response: httpx.Response) -> str:
+        return response.json()["uuid"]
+
+
+class ProcessSampler:
+    """
+    CPU time and resident memory of a set of processes and their children, from `/proc`.
+    Children are looked up again on every sample, so restarted workers are followed.
+    """
+
+    def __init__(self, pids: list[int], interval: float = 0.5):
+        self.pids = pids
+        self.interval = interval
+        self.rss: list[int] = []
+        self.cpu_ticks: dict[int, int] = {}
+
+    def processes(self) -> list[int]:
+        children: dict[int, list[int]] = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    parent = int(read_proc_stat(int(entry))[1])
+                except OSError:
+                    continue
+                children.setdefault(parent, []).append(int(entry))
+
+        processes, pending = set(), list(self.pids)
+        while pending:
+            pid = pending.pop()
+            if pid not in processes:
+                processes.add(pid)
+                pending.extend(children.get(pid, ()))
+        return sorted(processes)
+
+    def sample(self) -> None:
+        rss = 0
+        for pid in self.processes():
+            try:
+                stat = read_proc_stat(pid)
+                with open(f"/proc/{pid}/statm", encoding="ascii") as statm:
+                    rss += int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except OSError:
+                continue
+            # utime and stime, cumulative per process; a process that exits takes its
+            # ticks along, so the last ones seen are kept.
+            self.cpu_ticks[pid] = int(stat[11]) + int(stat[12])
+        self.rss.append(rss)
+
+    async def watch(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def cpu_seconds(self) -> float:
+        return sum(self.cpu_ticks.values()) / os.sysconf("SC_CLK_TCK")
+
+
+def read_proc_stat(pid: int) -> list[str]:
+    """The fields of `/proc/<pid>/stat` after the command name, starting with the state."""
+    with open(f"/proc/{pid}/stat", encoding="ascii", errors="replace") as stat:
+        return stat.read().rsplit(")", 1)[1].split()
+
+
+def find_listening_pids(url: str) -> list[int]:
+    """The processes holding a socket that listens on the port of `url`."""
+    parsed = urllib.parse.urlsplit(url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    inodes = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table, encoding="ascii") as sockets:
+                next(sockets)
+                for line in sockets:
+                    fields = line.split()
+                    # state 0A is LISTEN
+                    if (
+                        fields[3] == "0A"
+                        and int(fields[1].rsplit(":", 1)[1], 16) == port
+                    ):
+                        inodes.add(f"socket:[{fields[9]}]")
+        except OSError:
+            continue
+
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            descriptors = os.listdir(f"/proc/{entry}/fd")
+            if any(
+                os.readlink(f"/proc/{entry}/fd/{fd}") in inodes for fd in descriptors
+            ):
+                pids.append(int(entry))
+        except OSError:
+            continue
+    return pids
+
+
+class LoadRun:
+    """Clients replaying the mix against one backend, and what they measured."""
+
+    def __init__(
+        self,
+        backend: Backend,
+        client: httpx.AsyncClient,
+        mix: dict[str, int],
+    ):
+        self.backend = backend
+        self.client = client
+        # operations and their weights, as `random.choices` takes them
+        self.mix: tuple[list[str], list[int]] = (list(mix), list(mix.values()))
+        self.uuids: list[str] = []
+        self.deleted: set[str] = set()
+        self.latencies: dict[str, list[float]] = {op: [] for op in OPERATIONS}
+        self.errors: dict[str, int] = dict.fromkeys(OPERATIONS, 0)
+
+    async def send(
+        self, operation: str, rng: random.Random
+    ) -> tuple[str, httpx.Response | None, str | None]:
+        if operation != "list" and operation != "create" and not self.uuids:
+            operation = "create"
+        task_uuid = None
+        if operation == "create":
+            response = await self.backend.create(self.client, rng)
+            if response.status_code == 201:
+                self.uuids.append(self.backend.created_uuid(response))
+        elif operation == "list":
+            response = await self.backend.list(self.client)
+        elif operation == "delete":
+            index = rng.randrange(len(self.uuids))
+            self.uuids[index], self.uuids[-1] = self.uuids[-1], self.uuids[index]
+            task_uuid = self.uuids.pop()
+            self.deleted.add(task_uuid)
+            response = await self.backend.delete(self.client, task_uuid)
+        else:
+            task_uuid = rng.choice(self.uuids)
+            if operation == "get":
+                response = await self.backend.get(self.client, task_uuid)
+            else:
+                response = await self.backend.update(self.client, rng, task_uuid)
+        return operation, response, task_uuid
+
+    async def replay(self, deadline: float, rng: random.Random, record: bool) -> None:
+        while time.perf_counter() < deadline:
+            operation = rng.choices(*self.mix)[0]
+            started = time.perf_counter()
+            try:
+                operation, response, task_uuid = await self.send(operation, rng)
+                failed = response.status_code >= 400 and not (
+                    # another client deleted the task in the meantime
+                    response.status_code == 404
+                    and task_uuid in self.deleted
+                    and operation != "delete"
+                )
+            except httpx.HTTPError:
+                failed = True
+            if record:
+                self.latencies[operation].append((time.perf_counter() - started) * 1000)
+                self.errors[operation] += failed
+
+    async def prefill(self, tasks: int, rng: random.Random) -> None:
+        for _ in range(tasks):
+            await self.send("create", rng)
+
+    async def clean_up(self) -> None:
+        """Delete the tasks left over, best effort: failures are not retried."""
+        while self.uuids:
+            await asyncio.gather(
+                *(
+                    self.backend.delete(self.client, self.uuids.pop())
+                    for _ in range(min(len(self.uuids), 32))
+                ),
+                return_exceptions=True,
+            )
+
+
+async def run_backend(
+    backend: Backend, pids: list[int], args: argparse.Namespace
+) -> dict[str, typing.Any]:
+    async with backend.client(args.concurrency) as client:
+        load = LoadRun(backend=backend, client=client, mix=args.mix)
+        probe = await backend.list(client)
+        if probe.status_code >= 400:
+            raise SystemExit(
+                f"{backend.name}: GET {backend.tasks_path} answered {probe.status_code}"
+            )
+
+        await load.prefill(args.prefill, random.Random(args.seed))
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(
+            *(
+                load.replay(warmup_deadline, random.Random(args.seed + i), record=False)
+                for i in range(args.concurrency)
+            )
+        )
+
+        sampler, watcher, cpu_before = None, None, 0.0
+        if pids:
+            sampler = ProcessSampler(pids)
+            sampler.sample()
+            cpu_before = sampler.cpu_seconds()
+            watcher = asyncio.create_task(sampler.watch())
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                load.replay(deadline, random.Random(args.seed + 1000 + i), record=True)
+                for i in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        if watcher:
+            watcher.cancel()
+            sampler.sample()
+
+        if not args.keep:
+            await load.clean_up()
+
+    operations = {
+        operation: {
+            "requests": len(latencies),
+            "errors": load.errors[operation],
+            "rps": len(latencies) / elapsed,
+            **percentiles(latencies),
+        }
+        for operation, latencies in load.latencies.items()
+        if latencies
+    }
+    everything = [latency for op in load.latencies.values() for latency in op]
+    requests = len(everything)
+    result: dict[str, typing.Any] = {
+        "url": backend.url,
+        "pids": pids,
+        "total": {
+            "requests": requests,
+            "errors": sum(load.errors.values()),
+            "rps": requests / elapsed,
+            **percentiles(everything),
+        },
+        "operations": operations,
+        "cpu_percent": None,
+        "cpu_ms_per_request": None,
+        "rss_mib_mean": None,
+        "rss_mib_peak": None,
+    }
+    if sampler and sampler.rss:
+        cpu = sampler.cpu_seconds() - cpu_before
+        result.update(
+            cpu_percent=cpu / elapsed * 100,
+            cpu_ms_per_request=cpu / requests * 1000 if requests else None,
+            rss_mib_mean=sum(sampler.rss) / len(sampler.rss) / 2**20,
+            rss_mib_peak=max(sampler.rss) / 2**20,
+        )
+    return result
+
+
+def print_report(results: dict[str, dict[str, typing.Any]]) -> None:
+    width = 54
+    print(f"{'':<12}" + "".join(f"{name:>{width}}" for name in results))
+    print(
+        f"{'operation':<12}"
+        + f"{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'errors':>8}" * len(results)
+    )
+    for operation in ("total", *OPERATIONS):
+        cells = ""
+        for result in results.values():
+            stats = result["operations"].get(operation, result["total"])
+            if operation != "total" and operation not in result["operations"]:
+                cells += f"{'-':>{width}}"
+                continue
+            error_rate = stats["errors"] / stats["requests"] if stats["requests"] else 0
+            cells += (
+                f"{stats['requests']:>10}{stats['rps']:>9.1f}"
+                f"{format_number(stats['p50_ms']):>9}{format_number(stats['p95_ms']):>9}"
+                f"{format_number(stats['p99_ms']):>9}{error_rate:>8.1%}"
+            )
+        print(f"{operation:<12}{cells}")
+
+    print()
+    for label, key in (
+        ("CPU %", "cpu_percent"),
+        ("CPU ms/req", "cpu_ms_per_request"),
+        ("RSS MiB", "rss_mib_mean"),
+        ("RSS MiB max", "rss_mib_peak"),
+    ):
+        print(
+            f"{label:<12}"
+            + "".join(f"{format_number(r[key]):>{width}}" for r in results.values())
+        )
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        operation, _, weight = part.partition("=")
+        if operation not in OPERATIONS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"expected {'=N,'.join(OPERATIONS)}=N weights, got {part!r}"
+            )
+        mix[operation] = int(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("at least one weight must be positive")
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--django-url")
+    parser.add_argument("--django-user")
+    parser.add_argument("--django-password")
+    parser.add_argument(
+        "--django-author", type=int, default=1, help="user id of --django-user"
+    )
+    parser.add_argument("--django-pid", type=int, action="append")
+    parser.add_argument("--fastapi-url")
+    parser.add_argument("--fastapi-pid", type=int, action="append")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix("create=1,list=2,get=5,update=1,delete=1"),
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--prefill", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="keep the created tasks")
+    args = parser.parse_args()
+
+    backends: list[tuple[Backend, list[int]]] = []
+    if args.django_url:
+        if not (args.django_user and args.django_password):
+            parser.error("--django-url needs --django-user and --django-password")
+        backends.append(
+            (
+                DjangoBackend(
+                    args.django_url,
+                    user=args.django_user,
+                    password=args.django_password,
+                    author=args.django_author,
+                ),
+                args.django_pid or find_listening_pids(args.django_url),
+            )
+        )
+    if args.fastapi_url:
+        backends.append(
+            (
+                FastAPIBackend(args.fastapi_url),
+                args.fastapi_pid or find_listening_pids(args.fastapi_url),
+            )
+        )
+    if not backends:
+        parser.error("give --django-url, --fastapi-url or both")
+
+    results = {}
+    for backend, pids in backends:
+        if not pids:
+            print(
+                f"{backend.name}: server process not found, CPU and memory not measured"
+            )
+        print(
+            f"{backend.name}: {args.duration:.0f}s at {args.concurrency} clients . . ."
+        )
+        results[backend.name] = asyncio.run(run_backend(backend, pids, args))
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump({"mix": args.mix, "results": results}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
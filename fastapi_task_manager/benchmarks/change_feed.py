@@ -0,0 +1,139 @@
+"""
+Memory per idle change feed subscriber and fan-out latency of one task change.
+
+Opens `--subscribers` streams on `/api/tasks/changes` of the app running in-process (each
+a full request through the middleware and `StreamingResponse`, without sockets), reports
+the Python memory they hold, then creates `--changes` tasks one at a time and times each
+from the `POST` until the last subscriber got its frame:
+
+    python -m benchmarks.change_feed --subscribers 10000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import asgi_lifespan
+import httpx
+import sqlalchemy
+from starlette.types import Message
+
+from app.main import initialize_backend_application
+from app.models.db.task import Task, TaskOutboxEvent
+from app.repository.changes import task_change_feed
+from app.repository.database import async_db
+from benchmarks.latency import format_number, percentiles
+
+SEED_PREFIX = "bench changes"
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/tasks/changes",
+    "raw_path": b"/api/tasks/changes",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [],
+    "server": ("benchmark", 80),
+    "client": ("benchmark", 12345),
+}
+
+
+class Subscribers:
+    """Idle streams that note when each got the frame of the change being waited for."""
+
+    def __init__(self, backend_app) -> None:
+        self.backend_app = backend_app
+        self.requests: list[asyncio.Task] = []
+        self.disconnected = asyncio.Event()
+        self.waiting = 0
+        self.all_received = asyncio.Event()
+
+    async def open(self, count: int) -> None:
+        for _ in range(count):
+            self.requests.append(
+                asyncio.create_task(
+                    self.backend_app(dict(SCOPE), self.receive, self.send)
+                )
+            )
+        while len(task_change_feed.subscribers) < len(self.requests):
+            await asyncio.sleep(0.01)
+
+    async def receive(self) -> Message:
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.body" and b"\nevent: " in message["body"]:
+            self.waiting -= 1
+            if not self.waiting:
+                self.all_received.set()
+
+    def expect(self) -> None:
+        self.waiting = len(self.requests)
+        self.all_received.clear()
+
+    async def close(self) -> None:
+        self.disconnected.set()
+        await asyncio.gather(*self.requests, return_exceptions=True)
+
+
+async def run(subscribers: int, changes: int) -> None:
+    backend_app = initialize_backend_application()
+    try:
+        async with asgi_lifespan.LifespanManager(backend_app):
+            streams = Subscribers(backend_app)
+            tracemalloc.start()
+            before, _ = tracemalloc.get_traced_memory()
+            await streams.open(subscribers)
+            held, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{subscribers:,} idle subscribers: "
+                f"{(held - before) / subscribers / 1024:.1f} KiB each"
+            )
+
+            latencies = []
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=backend_app),
+                base_url="http://benchmark",
+            ) as client:
+                for n in range(changes):
+                    streams.expect()
+                    started = time.perf_counter()
+                    await client.post(
+                        "/api/tasks/",
+                        json={"name": f"{SEED_PREFIX} {n}", "status": "created"},
+                    )
+                    await asyncio.wait_for(streams.all_received.wait(), timeout=30)
+                    latencies.append((time.perf_counter() - started) * 1000)
+            await streams.close()
+
+            cuts = percentiles(latencies)
+            print(
+                "POST to last subscriber, ms: "
+                + ", ".join(f"{k[:3]} {format_number(v)}" for k, v in cuts.items())
+            )
+            print(f"evicted: {task_change_feed.counters['evicted']}")
+    finally:
+        async with async_db.async_engine.begin() as conn:
+            for model in (Task, TaskOutboxEvent):
+                await conn.execute(
+                    sqlalchemy.delete(model).where(model.name.startswith(SEED_PREFIX))
+                )
+        await async_db.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--changes", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(subscribers=args.subscribers, changes=args.changes))
+
+
+if __name__ == "__main__":
+    main()
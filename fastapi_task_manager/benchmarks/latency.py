@@ -0,0 +1,15 @@
+"""Latency percentiles and number formatting shared by the load benchmarks."""
+
+import statistics
+
+
+def percentiles(latencies: list[float]) -> dict[str, float | None]:
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        return {"p50_ms": cuts[49], "p95_ms": cuts[94], "p99_ms": cuts[98]}
+    latency = latencies[0] if latencies else None
+    return {"p50_ms": latency, "p95_ms": latency, "p99_ms": latency}
+
+
+def format_number(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}"
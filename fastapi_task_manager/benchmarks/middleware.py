@@ -0,0 +1,70 @@
+"""
+Per-request overhead of `RequestMetricsMiddleware`.
+
+The same minimal ASGI endpoint is driven directly, bare and wrapped in the middleware, so
+the difference is the cost of the metrics alone (no routing, I/O or serialization):
+
+    python -m benchmarks.middleware --requests 200000
+"""
+
+import argparse
+import asyncio
+import time
+import types
+
+from starlette.types import Message, Receive, Scope, Send
+
+from app.api.middleware.metrics import RequestMetricsMiddleware
+
+ROUTE = types.SimpleNamespace(name="tasks:read-task-by-uuid")
+START: Message = {"type": "http.response.start", "status": 200, "headers": []}
+BODY: Message = {"type": "http.response.body", "body": b"{}"}
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    scope["route"] = ROUTE
+    await send(START)
+    await send(BODY)
+
+
+async def receive_request() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def discard_response(message: Message) -> None:
+    pass
+
+
+async def drive(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/tasks/"}
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive_request, discard_response)
+    return time.perf_counter() - started
+
+
+async def run(requests: int, repeat: int) -> None:
+    apps = {"bare": endpoint, "metrics": RequestMetricsMiddleware(app=endpoint)}
+    timings = {}
+    print(f"{'app':<10}{'µs/request':>14}")
+    for name, app in apps.items():
+        await drive(app, requests=1000)
+        best = float("inf")
+        for _ in range(repeat):
+            best = min(best, await drive(app, requests=requests))
+        timings[name] = best / requests * 1e6
+        print(f"{name:<10}{timings[name]:>14.2f}")
+
+    print(f"overhead: {timings['metrics'] - timings['bare']:.2f} µs/request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(requests=args.requests, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()
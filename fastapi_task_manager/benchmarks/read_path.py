@@ -0,0 +1,123 @@
+"""
+Rows/sec and memory of the task list read path, ORM entities vs Core rows.
+
+Each page is read through an ORM session and turned into the `TaskListResponse` JSON the
+endpoint sends: "orm" selects `Task` entities (identity map, instance state,
+`from_attributes` validation), "core" is `TaskCRUDRepository.read_tasks` (exact columns,
+plain dicts). Memory is traced for one page: what its rows hold on to while the response
+is built, and the peak of the whole read and render:
+
+    python -m benchmarks.read_path --rows 100000 --page 1000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import typing
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.db.task import Task, TaskOutboxEvent
+from app.models.schemas.task import TaskListResponse
+from app.repository.crud.task import TaskCRUDRepository
+from app.repository.database import async_db
+
+ReadPage = typing.Callable[[AsyncSession, int], typing.Awaitable[typing.Sequence]]
+
+
+async def read_orm_page(session: AsyncSession, page: int) -> typing.Sequence:
+    query = await session.execute(
+        sqlalchemy.select(Task).order_by(Task.created_at, Task.uuid).limit(page)
+    )
+    tasks = query.scalars().all()
+    # A request session starts out empty; keep the identity map from growing across pages.
+    session.expunge_all()
+    return tasks
+
+
+async def read_core_page(session: AsyncSession, page: int) -> typing.Sequence:
+    return await TaskCRUDRepository(async_session=session).read_tasks(limit=page)
+
+
+READ_PATHS: dict[str, ReadPage] = {"orm": read_orm_page, "core": read_core_page}
+
+
+async def render_page(session: AsyncSession, read_page: ReadPage, page: int) -> bytes:
+    tasks = await read_page(session, page)
+    return TaskListResponse(items=tasks).model_dump_json(by_alias=True).encode()
+
+
+async def seed(rows: int) -> None:
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            sqlalchemy.text(
+                """
+                INSERT INTO task (uuid, name, description, status, created_at)
+                SELECT gen_random_uuid(), 'bench read ' || n,
+                       CASE WHEN n % 3 = 0 THEN 'description ' || n END,
+                       (ARRAY['CREATED', 'WORK', 'DONE'])[n % 3 + 1]::taskstatus,
+                       timestamptz '2000-01-01' + n * interval '1 second'
+                FROM generate_series(1, :rows) AS n
+                """
+            ),
+            {"rows": rows},
+        )
+
+
+async def run(rows: int, page: int, pages: int, repeat: int) -> None:
+    await seed(rows=rows)
+    print(
+        f"{'path':<8}{'rows/sec':>12}{'µs/row':>10}{'rows KiB/page':>16}"
+        f"{'peak KiB/page':>16}"
+    )
+    try:
+        async with AsyncSession(bind=async_db.async_engine) as session:
+            for name, read_page in READ_PATHS.items():
+                for _ in range(5):
+                    await render_page(session, read_page, page)
+
+                best = float("inf")
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    for _ in range(pages):
+                        await render_page(session, read_page, page)
+                    best = min(best, time.perf_counter() - started)
+
+                tracemalloc.start()
+                tasks = await read_page(session, page)
+                held, _ = tracemalloc.get_traced_memory()
+                TaskListResponse(items=tasks).model_dump_json(by_alias=True)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del tasks
+
+                rows_per_sec = page * pages / best
+                print(
+                    f"{name:<8}{rows_per_sec:>12,.0f}{1e6 / rows_per_sec:>10.2f}"
+                    f"{held / 1024:>16,.0f}{peak / 1024:>16,.0f}"
+                )
+    finally:
+        async with async_db.async_engine.begin() as conn:
+            for model in (Task, TaskOutboxEvent):
+                await conn.execute(
+                    sqlalchemy.delete(model).where(model.name.startswith("bench read "))
+                )
+        await async_db.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(
+        run(rows=args.rows, page=args.page, pages=args.pages, repeat=args.repeat)
+    )
+
+
+if __name__ == "__main__":
+    main()
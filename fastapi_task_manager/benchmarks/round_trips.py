@@ -0,0 +1,95 @@
+"""
+Count database round trips per request for the task routes.
+
+Every SQL statement, `BEGIN`, `COMMIT` and `ROLLBACK` sent on the primary or a replica
+engine is one round trip to Postgres. The app runs in-process against the database configured in `.env`:
+
+    python -m benchmarks.round_trips --requests 100
+"""
+
+import argparse
+import asyncio
+import collections
+import typing
+
+import asgi_lifespan
+import httpx
+from sqlalchemy import event
+
+from app.main import initialize_backend_application
+from app.repository.database import async_db
+
+ROUND_TRIP_EVENTS = ("before_cursor_execute", "begin", "commit", "rollback")
+
+
+class RoundTripCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        self.engines = [engine.sync_engine for engine in async_db.engines]
+
+    def _on_round_trip(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "RoundTripCounter":
+        for engine in self.engines:
+            for identifier in ROUND_TRIP_EVENTS:
+                event.listen(engine, identifier, self._on_round_trip)
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        for engine in self.engines:
+            for identifier in ROUND_TRIP_EVENTS:
+                event.remove(engine, identifier, self._on_round_trip)
+
+
+async def measure(client: httpx.AsyncClient, requests: int) -> dict[str, float]:
+    totals: dict[str, int] = collections.defaultdict(int)
+
+    async def call(
+        route: str, method: str, url: str, **kwargs: typing.Any
+    ) -> httpx.Response:
+        with RoundTripCounter() as counter:
+            response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        totals[route] += counter.count
+        return response
+
+    for i in range(requests):
+        created = await call(
+            "POST /api/tasks/",
+            "POST",
+            "/api/tasks/",
+            json={"name": f"task {i}", "status": "created"},
+        )
+        task_uuid = created.json()["uuid"]
+        await call("GET /api/tasks/{uuid}", "GET", f"/api/tasks/{task_uuid}")
+        await call(
+            "PUT /api/tasks/{uuid}",
+            "PUT",
+            f"/api/tasks/{task_uuid}",
+            json={"status": "in_work"},
+        )
+        await call("DELETE /api/tasks/{uuid}", "DELETE", f"/api/tasks/{task_uuid}")
+
+    return {route: total / requests for route, total in totals.items()}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    backend_app = initialize_backend_application()
+    async with asgi_lifespan.LifespanManager(backend_app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=backend_app), base_url="http://benchmark"
+        ) as client:
+            results = await measure(client=client, requests=args.requests)
+
+    print(f"{'route':<28}{'round trips / request':>24}")
+    for route, round_trips in results.items():
+        print(f"{route:<28}{round_trips:>24.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
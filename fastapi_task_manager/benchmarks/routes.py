@@ -0,0 +1,498 @@
+"""
+Requests/sec, latency percentiles and DB round trips of every task route under load.
+
+Seeds `--tasks` tasks (1000, 100000, 1000000, ...) into the database configured in `.env`,
+which should be a throwaway local Postgres - `docker compose up db` starts the one the app
+is developed against - then drives each route in `app/api/routers/task.py` with
+`--concurrency` clients for `--duration` seconds. Read scenarios run first, on the seeded
+table only; the write scenarios then create, claim, heartbeat, update and delete tasks.
+
+By default the app runs in-process and round trips are counted as in
+`benchmarks.round_trips`, including the few sent by background jobs meanwhile; client and
+app share one event loop, so the numbers are for comparing revisions on the same machine,
+not for capacity planning. `--url` drives a server started separately instead (round trips
+are then not counted). The export scenario buffers whole responses and is held to two
+clients.
+
+Results are written to `--output` as JSON; given a `--baseline` saved by an earlier run,
+every scenario is compared with it and the exit status is 1 if any got slower by more than
+`--threshold` or needs more round trips:
+
+    python -m benchmarks.routes --tasks 100000 --concurrency 32 --output baseline.json
+    python -m benchmarks.routes --tasks 100000 --concurrency 32 --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import typing
+
+import asgi_lifespan
+import httpx
+from sqlalchemy import text
+
+from app.api.routers.task import router
+from app.main import initialize_backend_application
+from app.repository.database import async_db
+from app.utils.formatters.cursor_formatter import format_cursor_from_task_key
+from benchmarks.latency import format_number, percentiles
+from benchmarks.round_trips import RoundTripCounter
+from benchmarks.search import COMMON_WORDS
+
+TASKS = "/api/tasks"
+STREAMING_ROUTES = {"tasks:stream-task-changes"}
+SEED_PREFIX = "bench routes"
+
+SEED_TASKS = text(
+    f"""
+    INSERT INTO task (uuid, name, description, status, created_at, priority, due_at)
+    SELECT gen_random_uuid(),
+        '{SEED_PREFIX} ' || (ARRAY{list(COMMON_WORDS)})[1 + n % 6] || ' ' || n,
+        CASE WHEN n % 2 = 0
+            THEN (ARRAY{list(COMMON_WORDS)})[1 + (n / 7) % 6] || ' ' || substr(md5(n::text), 1, 8)
+        END,
+        (ARRAY['CREATED', 'WORK', 'DONE'])[1 + n % 3]::taskstatus,
+        now() - n * interval '1 second',
+        n % 10,
+        CASE WHEN n % 3 = 0 THEN now() + n * interval '1 minute' END
+    FROM generate_series(1, :rows) AS n
+    """
+)
+SAMPLE_TASKS = text(
+    f"SELECT uuid, created_at FROM task WHERE name LIKE '{SEED_PREFIX} %' "
+    "ORDER BY random() LIMIT :sample"
+)
+DELETE_TASKS = [
+    text(f"DELETE FROM {table} WHERE name LIKE '{SEED_PREFIX} %'")
+    for table in ("task", "task_outbox")
+]
+
+
+class Workload:
+    """
+    One request of each scenario, on a random seeded task or one created by an earlier
+    write scenario. A request returns `None` when its scenario has nothing left to do.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        sample: list[tuple[typing.Any, datetime.datetime]],
+        bulk_size: int,
+    ):
+        self.client = client
+        self.sample = sample
+        self.bulk_size = bulk_size
+        self.created: list[str] = []
+        self.claimed: list[str] = []
+
+    def _uuid(self, rng: random.Random) -> typing.Any:
+        return rng.choice(self.sample)[0]
+
+    async def read_tasks(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(f"{TASKS}/", params={"limit": 50})
+
+    async def read_tasks_after_cursor(self, rng: random.Random) -> httpx.Response:
+        task_uuid, created_at = rng.choice(self.sample)
+        return await self.client.get(
+            f"{TASKS}/",
+            params={
+                "limit": 50,
+                "cursor": format_cursor_from_task_key(created_at, task_uuid),
+            },
+        )
+
+    async def read_tasks_filtered(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(
+            f"{TASKS}/",
+            params={
+                "limit": 50,
+                "status": rng.choice(["created", "in_work", "done"]),
+                "namePrefix": f"{SEED_PREFIX} {rng.choice(COMMON_WORDS)}",
+            },
+        )
+
+    async def read_tasks_by_priority(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(
+            f"{TASKS}/",
+            params={
+                "limit": 50,
+                "status": rng.choice(["created", "in_work", "done"]),
+                "order": "priority",
+            },
+        )
+
+    async def search_tasks(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(
+            f"{TASKS}/search", params={"q": rng.choice(COMMON_WORDS), "limit": 20}
+        )
+
+    async def export_tasks(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(f"{TASKS}/export")
+
+    async def read_task_stats(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(f"{TASKS}/stats")
+
+    async def read_task_analytics(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(
+            f"{TASKS}/analytics", params={"bucket": rng.choice(["hour", "day"])}
+        )
+
+    async def read_task_by_uuid(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(f"{TASKS}/{self._uuid(rng)}")
+
+    async def create_task(self, rng: random.Random) -> httpx.Response:
+        response = await self.client.post(
+            f"{TASKS}/",
+            json={"name": f"{SEED_PREFIX} new {rng.random()}", "status": "created"},
+        )
+        if response.status_code == 201:
+            self.created.append(response.json()["uuid"])
+        return response
+
+    async def create_tasks_bulk(self, rng: random.Random) -> httpx.Response:
+        response = await self.client.post(
+            f"{TASKS}/bulk",
+            params={"returning": "uuids"},
+            json=[
+                {"name": f"{SEED_PREFIX} bulk {rng.random()}", "status": "created"}
+                for _ in range(self.bulk_size)
+            ],
+        )
+        if response.status_code == 201:
+            self.created.extend(response.json())
+        return response
+
+    async def claim_tasks(self, rng: random.Random) -> httpx.Response:
+        response = await self.client.post(
+            f"{TASKS}/claim", params={"n": 10, "owner": SEED_PREFIX}
+        )
+        if response.status_code == 200:
+            self.claimed.extend(task["uuid"] for task in response.json())
+        return response
+
+    async def extend_task_leases(self, rng: random.Random) -> httpx.Response | None:
+        if not self.claimed:
+            return None
+        # each request takes the next 100 claimed tasks, so concurrent heartbeats hold
+        # disjoint tasks, as consumers heartbeating their own tasks do
+        leased, self.claimed = self.claimed[:100], self.claimed[100:]
+        self.claimed.extend(leased)
+        return await self.client.post(
+            f"{TASKS}/heartbeat", params={"owner": SEED_PREFIX}, json=leased
+        )
+
+    async def update_task(self, rng: random.Random) -> httpx.Response:
+        return await self.client.put(
+            f"{TASKS}/{self._uuid(rng)}",
+            json={"status": rng.choice(["created", "in_work", "done"])},
+        )
+
+    async def delete_task(self, rng: random.Random) -> httpx.Response | None:
+        if not self.created:
+            return None
+        return await self.client.delete(f"{TASKS}/{self.created.pop()}")
+
+
+Request = typing.Callable[
+    [Workload, random.Random], typing.Awaitable[httpx.Response | None]
+]
+
+# scenario -> (route name, request, most clients it runs with)
+SCENARIOS: dict[str, tuple[str, Request, int | None]] = {
+    "read-tasks": ("tasks:read-tasks", Workload.read_tasks, None),
+    "read-tasks-cursor": ("tasks:read-tasks", Workload.read_tasks_after_cursor, None),
+    "read-tasks-filtered": ("tasks:read-tasks", Workload.read_tasks_filtered, None),
+    "read-tasks-priority": ("tasks:read-tasks", Workload.read_tasks_by_priority, None),
+    "search-tasks": ("tasks:search-tasks", Workload.search_tasks, None),
+    "export-tasks": ("tasks:export-tasks", Workload.export_tasks, 2),
+    "read-task-stats": ("tasks:read-task-stats", Workload.read_task_stats, None),
+    "read-task-analytics": (
+        "tasks:read-task-analytics",
+        Workload.read_task_analytics,
+        None,
+    ),
+    "read-task-by-uuid": ("tasks:read-task-by-uuid", Workload.read_task_by_uuid, None),
+    "create-task": ("tasks:create-task", Workload.create_task, None),
+    "create-tasks-bulk": ("tasks:create-tasks-bulk", Workload.create_tasks_bulk, None),
+    "claim-tasks": ("tasks:claim-tasks", Workload.claim_tasks, None),
+    "extend-task-leases": (
+        "tasks:extend-task-leases",
+        Workload.extend_task_leases,
+        None,
+    ),
+    "update-task": ("tasks:update-task-by-uuid", Workload.update_task, None),
+    "delete-task": ("tasks:delete-task-by-uuid", Workload.delete_task, None),
+}
+
+
+async def drive(
+    workload: Workload,
+    request: Request,
+    *,
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> tuple[list[float], int, float]:
+    """Latencies in ms and errors of `concurrency` clients sending `request` back to back."""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(rng: random.Random) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await request(workload, rng)
+            if response is None:
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(random.Random(seed + i)) for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_scenario(
+    workload: Workload,
+    request: Request,
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    count_round_trips: bool,
+    seed: int,
+) -> dict[str, typing.Any]:
+    await drive(
+        workload, request, concurrency=concurrency, duration=warmup, seed=seed + 1000
+    )
+    round_trips = None
+    if count_round_trips:
+        with RoundTripCounter() as counter:
+            latencies, errors, elapsed = await drive(
+                workload, request, concurrency=concurrency, duration=duration, seed=seed
+            )
+        round_trips = counter.count / len(latencies) if latencies else None
+    else:
+        latencies, errors, elapsed = await drive(
+            workload, request, concurrency=concurrency, duration=duration, seed=seed
+        )
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        **percentiles(latencies),
+        "round_trips": round_trips,
+    }
+
+
+async def seed_tasks(
+    tasks: int, sample: int
+) -> list[tuple[typing.Any, datetime.datetime]]:
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(SEED_TASKS, {"rows": tasks})
+    async with async_db.async_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE task"))
+        rows = await conn.execute(SAMPLE_TASKS, {"sample": sample})
+        return [tuple(row) for row in rows]
+
+
+async def describe_run(args: argparse.Namespace) -> dict[str, typing.Any]:
+    async with async_db.async_engine.connect() as conn:
+        server_version = await conn.scalar(text("SHOW server_version"))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "postgres": server_version,
+        "target": args.url or "in-process",
+        "tasks": args.tasks,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "bulk_size": args.bulk_size,
+        "seed": args.seed,
+    }
+
+
+async def run_scenarios(
+    client: httpx.AsyncClient, args: argparse.Namespace
+) -> dict[str, typing.Any]:
+    print(f"seeding {args.tasks:,} tasks . . .")
+    sample = await seed_tasks(tasks=args.tasks, sample=args.sample)
+    workload = Workload(client=client, sample=sample, bulk_size=args.bulk_size)
+    results: dict[str, typing.Any] = {}
+    print(
+        f"{'scenario':<22}{'requests':>10}{'errors':>8}{'req/s':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'round trips':>13}"
+    )
+    for scenario in args.scenarios:
+        route, request, most_clients = SCENARIOS[scenario]
+        result = await run_scenario(
+            workload,
+            request,
+            concurrency=min(args.concurrency, most_clients or args.concurrency),
+            duration=args.duration,
+            warmup=args.warmup,
+            count_round_trips=args.url is None,
+            seed=args.seed,
+        )
+        results[scenario] = {"route": route, **result}
+        print(
+            f"{scenario:<22}{result['requests']:>10}{result['errors']:>8}"
+            f"{result['rps']:>10.1f}{format_number(result['p50_ms']):>9}"
+            f"{format_number(result['p95_ms']):>9}{format_number(result['p99_ms']):>9}"
+            f"{format_number(result['round_trips']):>13}"
+        )
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, typing.Any]:
+    try:
+        if args.url:
+            async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+                scenarios = await run_scenarios(client, args)
+        else:
+            backend_app = initialize_backend_application()
+            async with asgi_lifespan.LifespanManager(backend_app):
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=backend_app),
+                    base_url="http://benchmark",
+                    timeout=None,
+                ) as client:
+                    scenarios = await run_scenarios(client, args)
+        return {"run": await describe_run(args), "scenarios": scenarios}
+    finally:
+        if not args.keep:
+            async with async_db.async_engine.begin() as conn:
+                for statement in DELETE_TASKS:
+                    await conn.execute(statement)
+        await async_db.dispose()
+
+
+def compare(
+    results: dict[str, typing.Any], baseline: dict[str, typing.Any], threshold: float
+) -> list[str]:
+    """Print every scenario next to its baseline and return the ones that regressed."""
+    for key in ("tasks", "concurrency", "duration", "target"):
+        if results["run"][key] != baseline["run"][key]:
+            print(
+                f"warning: {key} is {results['run'][key]}, "
+                f"the baseline ran with {baseline['run'][key]}"
+            )
+
+    regressed = []
+    print(
+        f"\n{'scenario':<22}{'req/s':>10}{'baseline':>10}{'change':>9}"
+        f"{'p95 ms':>9}{'baseline':>10}{'change':>9}{'round trips':>13}{'baseline':>10}"
+    )
+    for scenario, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(scenario)
+        if base is None:
+            print(f"{scenario:<22}{'not in baseline':>30}")
+            continue
+
+        rps_change = result["rps"] / base["rps"] - 1 if base["rps"] else None
+        p95_change = (
+            result["p95_ms"] / base["p95_ms"] - 1
+            if result["p95_ms"] and base["p95_ms"]
+            else None
+        )
+        more_round_trips = (
+            result["round_trips"] is not None
+            and base["round_trips"] is not None
+            and result["round_trips"] > base["round_trips"] + 0.01
+        )
+        slower = (rps_change is not None and rps_change < -threshold) or (
+            p95_change is not None and p95_change > threshold
+        )
+        if slower or more_round_trips:
+            regressed.append(scenario)
+
+        print(
+            f"{scenario:<22}{result['rps']:>10.1f}{base['rps']:>10.1f}"
+            f"{format_change(rps_change):>9}{format_number(result['p95_ms']):>9}"
+            f"{format_number(base['p95_ms']):>10}{format_change(p95_change):>9}"
+            f"{format_number(result['round_trips']):>13}"
+            f"{format_number(base['round_trips']):>10}"
+            f"{'  REGRESSED' if scenario in regressed else ''}"
+        )
+    return regressed
+
+
+def format_change(change: float | None) -> str:
+    return "-" if change is None else f"{change:+.1%}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--bulk-size", type=int, default=100)
+    parser.add_argument(
+        "--sample", type=int, default=10000, help="seeded tasks to read and update"
+    )
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        action="append",
+        choices=SCENARIOS,
+        help="run only these scenarios (repeatable), all by default",
+    )
+    parser.add_argument(
+        "--url", help="drive a running server instead of the app in-process"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by `--output`")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative drop in req/s or rise in p95 counted as a regression",
+    )
+    parser.add_argument("--keep", action="store_true", help="keep the seeded tasks")
+    args = parser.parse_args()
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    uncovered = {route.name for route in router.routes} - {
+        route for route, _, _ in SCENARIOS.values()
+    }
+    # never-ending responses; see `benchmarks.change_feed`
+    uncovered -= STREAMING_ROUTES
+    if uncovered:
+        print(f"warning: no scenario for {', '.join(sorted(uncovered))}")
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            regressed = compare(results, json.load(baseline), threshold=args.threshold)
+        if regressed:
+            print(f"\nregressed: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Latency of `TaskCRUDRepository.search_tasks` on a large table.
+
+Seeds `--rows` tasks (names and descriptions of random words plus a small vocabulary of
+common ones) into the database configured in `.env`, brings the statistics and the GIN
+pending list up to date, then times the first search page for rare words, common words
+and phrases. The seeded rows are deleted afterwards unless `--keep` is given:
+
+    python -m benchmarks.search --rows 1000000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
+from app.repository.crud.task import TaskCRUDRepository
+from app.repository.database import async_db
+from app.repository.migrations.runner import migrate_db_schema
+
+COMMON_WORDS = ("deploy", "review", "invoice", "meeting", "release", "customer")
+SEED_PREFIX = "bench"
+
+SEED_TASKS = text(
+    f"""
+    INSERT INTO task (uuid, name, description, status, created_at)
+    SELECT
+        gen_random_uuid(),
+        '{SEED_PREFIX} ' || (ARRAY{list(COMMON_WORDS)})[1 + n % 6] || ' ' || substr(md5(n::text), 1, 6),
+        substr(md5((n + 1)::text), 1, 8) || ' ' || substr(md5((n + 2)::text), 1, 8)
+            || ' ' || (ARRAY{list(COMMON_WORDS)})[1 + (n / 7) % 6] || ' ' || substr(md5((n + 3)::text), 1, 8),
+        'CREATED',
+        now() - n * interval '1 second'
+    FROM generate_series(1, :rows) AS n
+    """
+)
+
+
+async def seed(rows: int) -> None:
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(SEED_TASKS, {"rows": rows})
+    async with async_db.async_engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE task"))
+
+
+async def time_search(query: str, fuzzy: bool, repeat: int) -> list[float]:
+    timings = []
+    async with SQLAlchemyAsyncSession(bind=async_db.async_engine) as async_session:
+        task_repo = TaskCRUDRepository(async_session=async_session)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await task_repo.search_tasks(query=query, limit=101, fuzzy=fuzzy)
+            timings.append((time.perf_counter() - started) * 1000)
+            await async_session.rollback()
+    return timings
+
+
+async def run(rows: int, repeat: int, keep: bool) -> None:
+    await migrate_db_schema(engine=async_db.async_engine)
+    await async_db.load_extensions()
+    print(f"seeding {rows:,} tasks . . .")
+    await seed(rows=rows)
+
+    # the random word in the name of seeded task 4242
+    rare = hashlib.md5(b"4242").hexdigest()[:6]
+    queries = {
+        "rare word": (rare, False),
+        "rare phrase": (f'"{COMMON_WORDS[4242 % 6]} {rare}"', False),
+        "common word": (COMMON_WORDS[0], False),
+        "two common words": (f"{COMMON_WORDS[0]} {COMMON_WORDS[1]}", False),
+    }
+    if "pg_trgm" in async_db.extensions:
+        queries["fuzzy typo"] = (rare[:-1] + "x", True)
+
+    try:
+        print(f"{'query':<20}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, (query, fuzzy) in queries.items():
+            timings = sorted(await time_search(query, fuzzy=fuzzy, repeat=repeat))
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{name:<20}{statistics.median(timings):>10.2f}{p95:>10.2f}")
+    finally:
+        if not keep:
+            async with async_db.async_engine.begin() as conn:
+                for table in ("task", "task_outbox"):
+                    await conn.execute(
+                        text(f"DELETE FROM {table} WHERE name LIKE :prefix"),
+                        {"prefix": f"{SEED_PREFIX} %"},
+                    )
+        await async_db.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(rows=args.rows, repeat=args.repeat, keep=args.keep))
+
+
+if __name__ == "__main__":
+    main()
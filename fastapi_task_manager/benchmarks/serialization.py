@@ -0,0 +1,84 @@
+"""
+Rows/sec of the task list response serialization, legacy vs current.
+
+"legacy" is the former `@field_serializer("*")` schema rendered by the stdlib-json
+`JSONResponse`; "current" is the native pydantic-core schema rendered by `ORJSONResponse`.
+Both go through the same validate -> dump -> render steps FastAPI runs for a `response_model`:
+
+    python -m benchmarks.serialization --rows 10000
+"""
+
+import argparse
+import datetime
+import time
+import typing
+import uuid
+
+import pydantic
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.models.db.task import Task, TaskStatus
+from app.models.schemas.task import TaskResponse
+from app.utils.formatters.datetime_formatter import format_datetime_into_isoformat
+
+
+class LegacyTaskResponse(TaskResponse):
+    @pydantic.field_serializer("*", when_used="unless-none")
+    def serialize_datetime_fields(self, value, info):
+        if isinstance(value, datetime.datetime):
+            return format_datetime_into_isoformat(value)
+        return value
+
+
+def build_tasks(rows: int) -> list[Task]:
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return [
+        Task(
+            uuid=uuid.uuid4(),
+            name=f"task №{i}",
+            description=None if i % 3 else f"description {i}",
+            status=list(TaskStatus)[i % 3],
+            created_at=now - datetime.timedelta(seconds=i, microseconds=i),
+            updated_at=None if i % 2 else now,
+        )
+        for i in range(rows)
+    ]
+
+
+def render(
+    adapter: pydantic.TypeAdapter,
+    response_class: typing.Type[JSONResponse],
+    tasks: list[Task],
+) -> bytes:
+    validated = adapter.validate_python(tasks, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json", by_alias=True)
+    return response_class(content=content).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = build_tasks(rows=args.rows)
+    paths = {
+        "legacy": (pydantic.TypeAdapter(list[LegacyTaskResponse]), JSONResponse),
+        "current": (pydantic.TypeAdapter(list[TaskResponse]), ORJSONResponse),
+    }
+
+    bodies = {}
+    print(f"{'path':<10}{'rows/sec':>14}")
+    for name, (adapter, response_class) in paths.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            bodies[name] = render(adapter, response_class, tasks)
+            best = min(best, time.perf_counter() - started)
+        print(f"{name:<10}{args.rows / best:>14,.0f}")
+
+    print(f"byte-for-byte identical: {bodies['legacy'] == bodies['current']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Client CPU per hot read with and without the statement caches.
+
+The `read-task-by-uuid` and first `read-tasks` queries are run through a session against
+a seeded task, as a statement built once (`READ_TASK_BY_UUID`, `READ_TASK_PAGE`) and as a
+`select()` rebuilt per call, on connections that keep prepared statements and on ones that
+prepare every statement anew:
+
+    python -m benchmarks.statement_cache --calls 5000
+"""
+
+import argparse
+import asyncio
+import time
+import typing
+import uuid
+
+import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.db.task import Task, TaskStatus
+from app.repository.crud.task import (
+    READ_TASK_BY_UUID,
+    READ_TASK_PAGE,
+    TASK_ROW_COLUMNS,
+    TASK_TABLE,
+)
+from app.repository.database import async_db
+
+Query = typing.Callable[[AsyncSession, uuid.UUID], typing.Awaitable[typing.Any]]
+
+
+async def prebuilt_by_uuid(session: AsyncSession, task_uuid: uuid.UUID) -> typing.Any:
+    query = await session.execute(READ_TASK_BY_UUID, {"task_uuid": task_uuid})
+    return query.all()
+
+
+async def rebuilt_by_uuid(session: AsyncSession, task_uuid: uuid.UUID) -> typing.Any:
+    query = await session.execute(
+        sqlalchemy.select(*TASK_ROW_COLUMNS).where(TASK_TABLE.c.uuid == task_uuid)
+    )
+    return query.all()
+
+
+async def prebuilt_page(session: AsyncSession, task_uuid: uuid.UUID) -> typing.Any:
+    query = await session.execute(READ_TASK_PAGE, {"limit": 10})
+    return query.all()
+
+
+async def rebuilt_page(session: AsyncSession, task_uuid: uuid.UUID) -> typing.Any:
+    query = await session.execute(
+        sqlalchemy.select(*TASK_ROW_COLUMNS)
+        .order_by(TASK_TABLE.c.created_at, TASK_TABLE.c.uuid)
+        .limit(10)
+    )
+    return query.all()
+
+
+QUERIES: dict[str, Query] = {
+    "by-uuid prebuilt": prebuilt_by_uuid,
+    "by-uuid rebuilt": rebuilt_by_uuid,
+    "page prebuilt": prebuilt_page,
+    "page rebuilt": rebuilt_page,
+}
+
+
+async def time_query(
+    session: AsyncSession, query: Query, task_uuid: uuid.UUID, calls: int
+) -> tuple[float, float]:
+    """Best-of CPU and wall time per call, in µs."""
+    for _ in range(200):
+        await query(session, task_uuid)
+    started_cpu, started_wall = time.process_time(), time.perf_counter()
+    for _ in range(calls):
+        await query(session, task_uuid)
+    return (
+        (time.process_time() - started_cpu) / calls * 1e6,
+        (time.perf_counter() - started_wall) / calls * 1e6,
+    )
+
+
+async def run(calls: int, repeat: int) -> None:
+    task_uuid = uuid.uuid4()
+    async with async_db.async_engine.begin() as conn:
+        await conn.execute(
+            sqlalchemy.insert(Task).values(
+                uuid=task_uuid, name="bench statement cache", status=TaskStatus.CREATED
+            )
+        )
+
+    print(f"{'query':<20}{'prepared cache':>16}{'CPU µs/call':>14}{'wall µs/call':>14}")
+    try:
+        for cache_size in (100, 0):
+            engine = create_async_engine(
+                async_db.set_async_db_url,
+                connect_args={"prepared_statement_cache_size": cache_size},
+            )
+            async with AsyncSession(bind=engine) as session:
+                for name, query in QUERIES.items():
+                    timings = [
+                        await time_query(session, query, task_uuid, calls)
+                        for _ in range(repeat)
+                    ]
+                    cpu = min(timing[0] for timing in timings)
+                    wall = min(timing[1] for timing in timings)
+                    print(f"{name:<20}{cache_size:>16}{cpu:>14.1f}{wall:>14.1f}")
+            await engine.dispose()
+    finally:
+        async with async_db.async_engine.begin() as conn:
+            await conn.execute(sqlalchemy.delete(Task).where(Task.uuid == task_uuid))
+        await async_db.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(calls=args.calls, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()